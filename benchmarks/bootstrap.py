@@ -0,0 +1,160 @@
+"""
+Compare the startup of the integration with and without the REST bootstrap.
+
+A local aiohttp server stands in for the evcc REST API /api/state. The
+retained MQTT messages of the same state are fed into
+EvccApiClient.message_received one loop iteration apart, as the broker
+delivers them. The report contains the time from the start of the config
+entry setup until every entity showed its final state, and the state writes
+caused by the retained messages.
+
+Run with ``python -m benchmarks.bootstrap --loadpoints 3``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, callback
+
+from custom_components.evcc.api import LOADPOINT_FIELDS, SITE_FIELDS
+from custom_components.evcc.const import CONF_REST_URL
+
+from .common import TOPIC, Message
+from .harness import add_evcc_entry, async_offline_home_assistant
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Seconds to wait for the last coalesced update after the retained messages.
+SETTLE_TIME = 1.0
+
+
+def generate_state(
+    loadpoints: int, seed: int = 1
+) -> tuple[dict[str, Any], list[Message]]:
+    """Return an /api/state response and the retained messages of the state."""
+    rng = random.Random(seed)  # noqa: S311
+    state: dict[str, Any] = {"loadpoints": []}
+    messages = []
+    for index in range(1, loadpoints + 1):
+        loadpoint: dict[str, Any] = {}
+        for suffix, (_, convert) in LOADPOINT_FIELDS.items():
+            if convert is str:
+                payload = "pv" if suffix == "mode" else f"Load point {index}"
+            elif convert is float:
+                payload = f"{rng.uniform(0, 100):.1f}"
+            elif convert is int:
+                payload = str(rng.choice((1, 3)))
+            else:
+                payload = rng.choice(("true", "false"))
+            messages.append(Message(f"{TOPIC}/loadpoints/{index}/{suffix}", payload))
+            key, _, phase = suffix.partition("/")
+            value = payload if convert is str else convert(payload)
+            if phase:
+                loadpoint.setdefault(key, []).append(value)
+            else:
+                loadpoint[key] = value
+        state["loadpoints"].append(loadpoint)
+    for suffix in SITE_FIELDS:
+        payload = f"{rng.uniform(0, 10000):.1f}"
+        messages.append(Message(f"{TOPIC}/site/{suffix}", payload))
+        state[suffix] = float(payload)
+    return state, messages
+
+
+async def async_start_server(state: dict[str, Any]) -> tuple[web.AppRunner, str]:
+    """Serve state on /api/state of a local port, return the base URL."""
+
+    async def handle_state(_: web.Request) -> web.Response:
+        return web.json_response(state)
+
+    app = web.Application()
+    app.router.add_get("/api/state", handle_state)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def async_startup(
+    messages: Sequence[Message], rest_url: str | None
+) -> tuple[float, int]:
+    """Return the milliseconds until ready and the writes of retained messages."""
+    async with async_offline_home_assistant() as hass:
+        # Timestamps of the state writes and the number of valid states.
+        writes: list[tuple[float, int]] = []
+        valid: set[str] = set()
+
+        @callback
+        def state_changed(event: Event) -> None:
+            new_state = event.data["new_state"]
+            entity_id = event.data["entity_id"]
+            if new_state is None or new_state.state in (
+                STATE_UNKNOWN,
+                STATE_UNAVAILABLE,
+            ):
+                valid.discard(entity_id)
+            else:
+                valid.add(entity_id)
+            writes.append((time.perf_counter(), len(valid)))
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+        entry = add_evcc_entry(
+            hass, options={CONF_REST_URL: rest_url} if rest_url else None
+        )
+        start = time.perf_counter()
+        await hass.config_entries.async_setup(entry.entry_id)
+        setup_writes = len(writes)
+        client = entry.runtime_data.client
+        for message in messages:
+            client.message_received(message)
+            await asyncio.sleep(0)
+        await asyncio.sleep(SETTLE_TIME)
+        await hass.async_block_till_done()
+        ready = next(at for at, count in writes if count == len(valid))
+        retained_writes = len(writes) - setup_writes
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    return (ready - start) * 1000, retained_writes
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    state, messages = generate_state(args.loadpoints)
+    runner, url = await async_start_server(state)
+    try:
+        for name, rest_url in (("mqtt only", None), ("rest", url)):
+            results = [
+                await async_startup(messages, rest_url) for _ in range(args.runs)
+            ]
+            ready = sorted(result[0] for result in results)[len(results) // 2]
+            print(  # noqa: T201
+                f"{name:>9}: ready after {ready:7.1f} ms, "
+                f"{results[-1][1]:4d} state writes from {len(messages)} "
+                "retained messages"
+            )
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--loadpoints", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=3, help="median of the runs")
+    args = parser.parse_args()
+    asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    main()
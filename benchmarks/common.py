@@ -0,0 +1,75 @@
+"""Shared helpers for the evcc benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import NamedTuple
+
+TOPIC = "evcc"
+
+LOADPOINT_SUFFIXES = (
+    "chargedEnergy",
+    "chargePower",
+    "title",
+    "chargeTotalImport",
+    "chargeDuration",
+    "chargeRemainingDuration",
+    "chargeRemainingEnergy",
+    "vehicleSoc",
+    "vehicleLimitSoc",
+    "vehicleRange",
+    "phasesActive",
+    "chargeCurrents/l1",
+    "chargeCurrents/l2",
+    "chargeCurrents/l3",
+)
+
+# Topics evcc publishes that the integration does not consume.
+IGNORED_SUFFIXES = (
+    "site/siteTitle",
+    "site/tariffGrid",
+    "site/greenShareHome",
+    "site/gridEnergy",
+    "loadpoints/1/pvAction",
+    "loadpoints/1/planActive",
+    "loadpoints/1/smartCostActive",
+)
+
+
+class Message(NamedTuple):
+    """Stand-in for the MQTT ReceiveMessage, only the fields we read."""
+
+    topic: str
+    payload: str
+    timestamp: float = 0.0
+
+
+def _payload(suffix: str, rng: random.Random) -> str:
+    if suffix == "title":
+        return "Garage"
+    if suffix == "phasesActive":
+        return str(rng.choice((1, 3)))
+    return f"{rng.uniform(0, 11000):.1f}"
+
+
+def generate_messages(
+    count: int,
+    loadpoints: int = 3,
+    ignored_share: float = 0.3,
+    topic: str = TOPIC,
+    seed: int = 1,
+) -> list[Message]:
+    """Generate a reproducible mix of evcc messages."""
+    rng = random.Random(seed)  # noqa: S311
+    messages = []
+    for _ in range(count):
+        if rng.random() < ignored_share:
+            suffix = rng.choice(IGNORED_SUFFIXES)
+            messages.append(Message(f"{topic}/{suffix}", "1"))
+            continue
+        suffix = rng.choice(LOADPOINT_SUFFIXES)
+        index = rng.randint(1, loadpoints)
+        messages.append(
+            Message(f"{topic}/loadpoints/{index}/{suffix}", _payload(suffix, rng))
+        )
+    return messages
@@ -0,0 +1,132 @@
+"""
+Feed random topic and payload streams to EvccApiClient and check its bounds.
+
+A misbehaving publisher or a typo must neither grow the client without
+limit nor raise in the MQTT callback. The stream mixes the messages of a
+few live load points, which publish all the time and are known before the
+stream starts like after a restart, with random load point
+and vehicle identifiers, non-numeric and oversized identifiers, unknown
+levels and suffixes and random payloads. The simulated clock advances with
+--rate, so silent identifiers become stale and get evicted on the way.
+
+After every batch the script checks that no exception escaped
+message_received, that the registries stay within the registry size, that
+the live load points were never evicted, that every cached route targets a
+registered load point or vehicle, and that the objects tracked by the
+garbage collector stopped growing after the warm-up. It reports the time
+per message of every batch, which has to stay flat.
+
+Exits with status 1 if a check failed.
+
+Run with ``python -m benchmarks.fuzz --messages 2000000 --seed 1``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import random
+import sys
+import time
+from statistics import median
+
+from custom_components.evcc.api import EvccApiClient
+from tests.common import (
+    LIVE_LOADPOINTS,
+    TOPIC,
+    Message,
+    check_bounds,
+    generate_batch,
+)
+
+# Batches before the sizes have to be stable.
+WARMUP_BATCHES = 2
+
+
+def main() -> None:  # noqa: PLR0915
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--batch", type=int, default=100_000, help="messages")
+    parser.add_argument("--rate", type=float, default=500, help="simulated msg/s")
+    parser.add_argument("--registry-size", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=2.0,
+        help="slowest batch per median batch after the warm-up",
+    )
+    args = parser.parse_args()
+    # Every invalid payload is logged as a warning.
+    logging.getLogger("custom_components.evcc.api").setLevel(logging.ERROR)
+
+    rng = random.Random(args.seed)  # noqa: S311
+    client = EvccApiClient(TOPIC)
+    client.registry_size = args.registry_size
+    evictions = 0
+
+    def removed(_: int) -> None:
+        nonlocal evictions
+        evictions += 1
+
+    client.removed_loadpoint_callback = removed
+    client.removed_vehicle_callback = removed
+    for loadpoint_id in LIVE_LOADPOINTS:
+        client.message_received(
+            Message(f"{TOPIC}/loadpoints/{loadpoint_id}/title", "Garage")
+        )
+    errors: list[str] = []
+    escaped = 0
+    timings: list[float] = []
+    warm_objects: int | None = None
+    print("batch  ns/msg  loadpoints  vehicles  routes  evictions  objects")  # noqa: T201
+    for batch, start in enumerate(range(0, args.messages, args.batch)):
+        messages = generate_batch(
+            rng, min(args.batch, args.messages - start), start, args.rate
+        )
+        begin = time.perf_counter()
+        for message in messages:
+            try:
+                client.message_received(message)
+            except Exception as exception:  # noqa: BLE001
+                escaped += 1
+                if escaped == 1:
+                    errors.append(f"{message.topic[:60]!r} raised {exception!r}")
+        timings.append((time.perf_counter() - begin) / len(messages) * 1e9)
+        # The coordinator does this after every flush.
+        client.pop_changes()
+        del messages
+        gc.collect()
+        objects = len(gc.get_objects())
+        errors.extend(
+            f"batch {batch}: {error}"
+            for error in check_bounds(client, args.registry_size)
+        )
+        print(  # noqa: T201
+            f"{batch:>5}  {timings[-1]:6.0f}  {len(client.loadpoints):>10}  "
+            f"{len(client.vehicles):>8}  {len(client.routes):>6}  "
+            f"{evictions:>9}  {objects:>7}"
+        )
+        if batch + 1 == WARMUP_BATCHES:
+            warm_objects = objects
+        elif warm_objects is not None and objects > warm_objects * 1.01:
+            errors.append(f"batch {batch}: {objects} objects")
+    if escaped:
+        errors.append(f"{escaped} exceptions escaped message_received")
+    measured = timings[WARMUP_BATCHES:]
+    if measured and max(measured) > args.max_ratio * median(measured):
+        errors.append(
+            f"slowest batch {max(measured):.0f} ns/msg, median {median(measured):.0f}"
+        )
+    for error in errors:
+        print(error, file=sys.stderr)  # noqa: T201
+    print("FAILED" if errors else "OK")  # noqa: T201
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Run the evcc integration in an offline Home Assistant instance."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, patch
+
+from homeassistant import loader
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.evcc.const import CONF_TOPIC, DOMAIN
+
+from .common import TOPIC
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.evcc.data import EvccConfigEntry
+
+
+@contextmanager
+def stub_mqtt() -> Iterator[None]:
+    """
+    Replace the MQTT plumbing with no-ops.
+
+    Messages are fed straight into EvccApiClient.message_received instead.
+    """
+    with (
+        patch(
+            "homeassistant.components.mqtt.async_wait_for_mqtt_client",
+            AsyncMock(return_value=True),
+        ),
+        patch(
+            "custom_components.evcc.subscriptions.async_prepare_subscribe_topics",
+            lambda _hass, _sub_state, topics: topics,
+        ),
+        patch(
+            "custom_components.evcc.subscriptions.async_subscribe_topics",
+            AsyncMock(),
+        ),
+    ):
+        yield
+
+
+@asynccontextmanager
+async def async_offline_home_assistant() -> AsyncIterator[HomeAssistant]:
+    """Yield a Home Assistant instance with the MQTT plumbing stubbed out."""
+    with stub_mqtt():
+        async with async_test_home_assistant() as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            hass.config.components.add("mqtt")
+            yield hass
+
+
+def add_evcc_entry(
+    hass: HomeAssistant, topic: str = TOPIC, options: dict[str, Any] | None = None
+) -> EvccConfigEntry:
+    """Add an evcc config entry, it is not set up yet."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_TOPIC: topic}, options=options or {}
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@asynccontextmanager
+async def async_evcc_home_assistant(
+    topic: str = TOPIC, options: dict[str, Any] | None = None
+) -> AsyncIterator[tuple[HomeAssistant, EvccConfigEntry]]:
+    """Yield a Home Assistant instance with a loaded evcc config entry."""
+    async with async_offline_home_assistant() as hass:
+        entry = add_evcc_entry(hass, topic, options)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield hass, entry
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
@@ -0,0 +1,125 @@
+"""
+Compare the per-message overhead of the async and the queued MQTT ingest.
+
+Before, the router and EvccApiClient.message_received were coroutines: Home
+Assistant started an eager task for every message and the client notified
+the coordinator after every changed message. Now both are callbacks, the
+message is only queued and EvccApiClient.drain applies the queue once per
+event loop iteration and notifies the coordinator once.
+
+The MQTT client hands over the messages of one socket read within a single
+loop iteration. The benchmark feeds the same messages at 100, 1,000 and
+10,000 msg/s as reads every 10 ms, without waiting between the reads, and
+reports the time per message and the coordinator notifications.
+
+Run with ``python -m benchmarks.ingest --seconds 60``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.util.async_ import create_eager_task
+
+from custom_components.evcc.api import EvccApiClient
+
+from .common import TOPIC, generate_messages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .common import Message
+
+# Seconds between the socket reads of the MQTT client.
+READ_INTERVAL = 0.01
+
+
+def _async_ingest(
+    client: EvccApiClient, loop: asyncio.AbstractEventLoop
+) -> Callable[[Message], None]:
+    """Return the ingest before the queue, a task per message."""
+
+    async def message_received(msg: Message) -> None:
+        if client.apply_message(msg) and client.update_callback is not None:
+            client.update_callback()
+
+    async def route(msg: Message) -> None:
+        await message_received(msg)
+
+    def ingest(msg: Message) -> None:
+        create_eager_task(route(msg), loop=loop)
+
+    return ingest
+
+
+def _queued_ingest(
+    client: EvccApiClient, loop: asyncio.AbstractEventLoop
+) -> Callable[[Message], None]:
+    """Return the queued ingest, as set up by the integration."""
+    client.schedule_drain = partial(loop.call_soon, client.drain)
+    return client.message_received
+
+
+async def _async_run(
+    ingest_factory: Callable[
+        [EvccApiClient, asyncio.AbstractEventLoop], Callable[[Message], None]
+    ],
+    reads: list[list[Message]],
+) -> tuple[float, int]:
+    """Return the seconds to ingest all reads and the notifications."""
+    client = EvccApiClient(TOPIC)
+    notifications = 0
+
+    def update_callback() -> None:
+        nonlocal notifications
+        notifications += 1
+
+    client.update_callback = update_callback
+    ingest = ingest_factory(client, asyncio.get_running_loop())
+    start = time.perf_counter()
+    for read in reads:
+        for message in read:
+            ingest(message)
+        await asyncio.sleep(0)
+    return time.perf_counter() - start, notifications
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    for rate in args.rates:
+        per_read = max(1, round(rate * READ_INTERVAL))
+        count = rate * args.seconds
+        messages = generate_messages(count)
+        reads = [
+            messages[index : index + per_read] for index in range(0, count, per_read)
+        ]
+        for name, ingest_factory in (
+            ("async", _async_ingest),
+            ("queued", _queued_ingest),
+        ):
+            elapsed, notifications = await _async_run(ingest_factory, reads)
+            print(  # noqa: T201
+                f"{rate:>6} msg/s, {name:>6}: "
+                f"{elapsed / count * 1e9:6.0f} ns/msg, "
+                f"{notifications:>7} notifications"
+            )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rates", type=int, nargs="+", default=[100, 1000, 10000], help="msg/s"
+    )
+    parser.add_argument("--seconds", type=int, default=60, help="simulated time")
+    args = parser.parse_args()
+    asyncio.run(_async_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compare per-entry MQTT subscriptions with the shared EvccMqttRouter.
+
+Home Assistant matches every received message against all wildcard
+subscriptions, and caches the result per topic until any subscription
+changes. The benchmark replays the same messages for 1, 5 and 20 evcc
+instances through that matching and the message callbacks, once with a
+cold cache as after a subscription change and once with a warm cache.
+
+Run with ``python -m benchmarks.instances``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.mqtt.client import _matcher_for_topic
+
+from custom_components.evcc.api import LOADPOINT_TOPICS, SITE_TOPICS, EvccApiClient
+from custom_components.evcc.const import LOADPOINT_DISCOVERY_TOPIC
+from custom_components.evcc.subscriptions import EvccMqttRouter
+
+from .common import generate_messages
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    from .common import Message
+
+# The patterns subscribed with all sensors enabled.
+PATTERNS = (
+    LOADPOINT_DISCOVERY_TOPIC,
+    *(f"loadpoints/+/{suffix}" for suffix in LOADPOINT_TOPICS.values()),
+    *(f"site/{suffix}" for suffix in SITE_TOPICS.values()),
+)
+
+type Subscriptions = list[tuple[Callable[[str], bool], Callable[[Any], None]]]
+
+
+def _per_entry(clients: dict[str, EvccApiClient]) -> Subscriptions:
+    """Subscribe every pattern for every config entry, as before the router."""
+    return [
+        (_matcher_for_topic(f"{topic}/{pattern}"), client.message_received)
+        for topic, client in clients.items()
+        for pattern in set(PATTERNS)
+    ]
+
+
+class _NoHass:
+    """Drops the subscription updates the router schedules."""
+
+    def async_create_task(self, coro: Coroutine, **_: Any) -> None:
+        coro.close()
+
+
+def _shared(clients: dict[str, EvccApiClient]) -> Subscriptions:
+    """Subscribe through the shared router."""
+    router = EvccMqttRouter(_NoHass())  # type: ignore[arg-type]
+    for topic, client in clients.items():
+        router.async_register(topic, client.message_received)
+        for pattern in PATTERNS:
+            router.async_acquire(topic, pattern)
+    return [
+        (_matcher_for_topic(topic), msg_callback)
+        for topic, msg_callback in router.subscription_topics().values()
+    ]
+
+
+async def _run(
+    subscriptions: Subscriptions, messages: list[Message], *, cached: bool
+) -> float:
+    """Return the seconds to match and dispatch all messages."""
+    cache: dict[str, list[Callable[[Any], None]]] = {}
+    if cached:
+        for msg in messages:
+            cache[msg.topic] = [
+                msg_callback
+                for matcher, msg_callback in subscriptions
+                if matcher(msg.topic)
+            ]
+    start = time.perf_counter()
+    for msg in messages:
+        matching = cache.get(msg.topic)
+        if matching is None:
+            matching = [
+                msg_callback
+                for matcher, msg_callback in subscriptions
+                if matcher(msg.topic)
+            ]
+        for msg_callback in matching:
+            msg_callback(msg)
+    return time.perf_counter() - start
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    for instances in args.instances:
+        topics = [f"evcc{index}" for index in range(instances)]
+        messages = [
+            message
+            for batch in zip(
+                *(
+                    generate_messages(args.messages // instances, topic=topic)
+                    for topic in topics
+                ),
+                strict=True,
+            )
+            for message in batch
+        ]
+        for name, subscribe in (("per entry", _per_entry), ("router", _shared)):
+            subscriptions = subscribe({topic: EvccApiClient(topic) for topic in topics})
+            cold = await _run(subscriptions, messages, cached=False)
+            warm = await _run(subscriptions, messages, cached=True)
+            print(  # noqa: T201
+                f"{instances:>3} instances, {name:>9}: "
+                f"{len(subscriptions):>4} subscriptions, "
+                f"cold {cold / len(messages) * 1e9:8.0f} ns/msg, "
+                f"warm {warm / len(messages) * 1e9:6.0f} ns/msg"
+            )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--instances", type=int, nargs="+", default=[1, 5, 20])
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
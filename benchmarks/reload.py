@@ -0,0 +1,111 @@
+"""
+Check that changing the options does not leak MQTT callbacks.
+
+The options of a config entry are changed repeatedly: most changes are
+applied in place, toggling the instrumentation reloads the entry. After
+each change the report lists the message callbacks registered with the
+MQTT router and the cost of dispatching a message through the subscribed
+callback, both have to stay constant.
+
+Run with ``python -m benchmarks.reload --reloads 20``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from custom_components.evcc.const import (
+    CONF_COALESCE_WINDOW,
+    CONF_INSTRUMENTATION,
+    DEFAULT_COALESCE_WINDOW,
+)
+from custom_components.evcc.subscriptions import async_get_router
+
+from .common import TOPIC, Message
+from .harness import async_evcc_home_assistant
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.evcc.data import EvccConfigEntry
+
+# Changes of the options after which the entry is reloaded.
+RELOAD_EVERY = 5
+
+
+async def _async_dispatch_cost(
+    hass: HomeAssistant, entry: EvccConfigEntry, messages: int
+) -> tuple[float, int]:
+    """Return us/msg through the subscribed callback and the messages received."""
+    router = async_get_router(hass)
+    topic = f"{TOPIC}/loadpoints/1/chargePower"
+    msg_callback = next(
+        msg_callback
+        for subscribed, msg_callback in router.subscription_topics().values()
+        if subscribed.endswith("/loadpoints/+/chargePower")
+    )
+    client = entry.runtime_data.client
+    received = client.received_messages
+    start = time.perf_counter()
+    for index in range(messages):
+        msg_callback(Message(topic, str(index)))
+    # Apply the queued messages.
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    return elapsed / messages * 1e6, client.received_messages - received
+
+
+async def _async_main(args: argparse.Namespace) -> bool:
+    async with async_evcc_home_assistant() as (hass, entry):
+        client = entry.runtime_data.client
+        client.message_received(Message(f"{TOPIC}/loadpoints/1/title", "x"))
+        await asyncio.sleep(DEFAULT_COALESCE_WINDOW * 2)
+        await hass.async_block_till_done()
+        router = async_get_router(hass)
+        rows = []
+        for change in range(args.reloads + 1):
+            if change:
+                options = dict(entry.options)
+                if change % RELOAD_EVERY == 0:
+                    options[CONF_INSTRUMENTATION] = not options.get(
+                        CONF_INSTRUMENTATION, False
+                    )
+                else:
+                    options[CONF_COALESCE_WINDOW] = (
+                        DEFAULT_COALESCE_WINDOW + (change % 2) * 0.05
+                    )
+                hass.config_entries.async_update_entry(entry, options=options)
+                await hass.async_block_till_done()
+                await hass.async_block_till_done()
+            cost, received = await _async_dispatch_cost(hass, entry, args.messages)
+            rows.append((change, router.callback_count, cost, received))
+            print(  # noqa: T201
+                f"change {change:3d}: {router.callback_count} callbacks, "
+                f"{cost:6.2f} us/msg, {received} of {args.messages} received"
+            )
+    leaked = any(
+        callbacks != rows[0][1] or received != args.messages
+        for _, callbacks, _, received in rows
+    )
+    if leaked:
+        print("message callbacks leaked")  # noqa: T201
+    return not leaked
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--reloads", type=int, default=20, help="option changes")
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_async_main(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
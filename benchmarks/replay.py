@@ -0,0 +1,226 @@
+"""
+Replay an evcc MQTT trace through the integration and report throughput.
+
+Messages are fed into EvccApiClient.message_received of a config entry
+running in an offline Home Assistant instance, with the MQTT plumbing
+stubbed out. The report contains the message rate, the latency from a
+message to the state write of the sensor bound to its topic, and the peak
+memory.
+
+Run with ``python -m benchmarks.replay [TRACE] --speed 10``. Without a
+trace file a synthetic one is generated. A speed of 0 replays flat-out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, callback
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.evcc.api import LOADPOINT_TOPICS
+from custom_components.evcc.sensor import ENTITY_DESCRIPTIONS
+
+from .common import TOPIC
+from .harness import async_evcc_home_assistant
+from .trace import generate_trace, read_trace
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.evcc.data import EvccConfigEntry
+
+    from .trace import TraceMessage
+
+# Messages fed between two yields to the event loop when replaying flat-out.
+FLAT_OUT_BATCH = 100
+
+
+@dataclass
+class ReplayReport:
+    """Result of a replay."""
+
+    messages: int
+    elapsed: float
+    cpu_time: float
+    latencies: list[float]
+    peak_memory: int
+    duplicate_share: float | None = None
+
+    def percentile(self, percent: int) -> float:
+        """Return a latency percentile in milliseconds."""
+        if len(self.latencies) < 2:
+            return self.latencies[0] * 1000 if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100)[percent - 1] * 1000
+
+    def __str__(self) -> str:
+        """Format the report."""
+        return (
+            f"messages:      {self.messages}\n"
+            f"throughput:    {self.messages / self.elapsed:,.0f} msg/s\n"
+            f"cpu time:      {self.cpu_time / self.messages * 1e6:.1f} us/msg\n"
+            f"state writes:  {len(self.latencies)} messages reached a state\n"
+            f"latency p50:   {self.percentile(50):.1f} ms\n"
+            f"latency p99:   {self.percentile(99):.1f} ms\n"
+            f"peak memory:   {self.peak_memory / 1024 / 1024:.1f} MiB\n"
+            f"duplicates:    {(self.duplicate_share or 0) * 100:.1f} % skipped"
+        )
+
+
+def _sensor_topics(hass: HomeAssistant, entry: EvccConfigEntry) -> dict[str, str]:
+    """Map the sensor entity ids of the entry to the topic they display."""
+    fields = {
+        description.key: description.field
+        for description in ENTITY_DESCRIPTIONS
+        if description.field in LOADPOINT_TOPICS
+    }
+    prefix = f"{entry.entry_id}_lp_"
+    topics = {}
+    for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id):
+        loadpoint_id, _, key = entity.unique_id.removeprefix(prefix).partition("_")
+        if key in fields:
+            topics[entity.entity_id] = (
+                f"{TOPIC}/loadpoints/{loadpoint_id}/{LOADPOINT_TOPICS[fields[key]]}"
+            )
+    return topics
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    entry: EvccConfigEntry,
+    messages: Sequence[TraceMessage],
+    speed: float,
+) -> ReplayReport:
+    """Replay messages at the given speed, 0 replays flat-out."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    # Receive times of the changes not yet written to a state, per topic.
+    pending: dict[str, list[float]] = {}
+    latencies: list[float] = []
+    sensor_topics: dict[str, str] = {}
+
+    sensor_suffixes = {
+        LOADPOINT_TOPICS[description.field]
+        for description in ENTITY_DESCRIPTIONS
+        if description.field in LOADPOINT_TOPICS
+    }
+    loadpoint_prefix = f"{TOPIC}/loadpoints/"
+    # Receive times of the queued messages, they are applied in order.
+    receive_times: deque[float] = deque()
+    apply_message = client.apply_message
+
+    def track_change(message: TraceMessage) -> bool:
+        received = receive_times.popleft()
+        changed = apply_message(message)
+        if (
+            changed
+            and message.topic.startswith(loadpoint_prefix)
+            and message.topic.split("/", 3)[3] in sensor_suffixes
+        ):
+            pending.setdefault(message.topic, []).append(received)
+        return changed
+
+    client.apply_message = track_change
+
+    @callback
+    def state_changed(event: Event) -> None:
+        now = time.perf_counter()
+        entity_id = event.data["entity_id"]
+        if entity_id not in sensor_topics:
+            sensor_topics.update(_sensor_topics(hass, entry))
+        topic = sensor_topics.get(entity_id)
+        if topic is not None:
+            latencies.extend(now - received for received in pending.pop(topic, ()))
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+
+    counters = (client.received_messages, client.duplicate_messages)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for index, message in enumerate(messages):
+        if speed:
+            delay = start + message.timestamp / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif index % FLAT_OUT_BATCH == 0:
+            await asyncio.sleep(0)
+        receive_times.append(time.perf_counter())
+        client.message_received(message)
+    # Apply the last batch.
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start
+    # Let the last coalescing window flush to the entities.
+    await asyncio.sleep(coordinator.coalesce_window)
+    await hass.async_block_till_done()
+
+    unsub()
+    client.apply_message = apply_message
+    if tracemalloc.is_tracing():
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    else:
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    received = client.received_messages - counters[0]
+    return ReplayReport(
+        len(messages),
+        elapsed,
+        cpu_time,
+        latencies,
+        peak_memory,
+        (client.duplicate_messages - counters[1]) / received if received else None,
+    )
+
+
+async def _async_main(args: argparse.Namespace) -> ReplayReport:
+    if args.trace:
+        messages = list(read_trace(args.trace))
+    else:
+        messages = list(generate_trace(args.duration, args.loadpoints))
+    if args.tracemalloc:
+        tracemalloc.start()
+    async with async_evcc_home_assistant() as (hass, entry):
+        return await async_replay(hass, entry, messages, args.speed)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("trace", nargs="?", help="trace file, see benchmarks.trace")
+    parser.add_argument("--speed", type=float, default=0, help="0 is flat-out")
+    parser.add_argument("--duration", type=float, default=3600)
+    parser.add_argument("--loadpoints", type=int, default=3)
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="measure peak Python memory"
+    )
+    parser.add_argument("--min-throughput", type=float, help="msg/s, fail below")
+    parser.add_argument("--max-p99", type=float, help="ms, fail above")
+    args = parser.parse_args()
+
+    report = asyncio.run(_async_main(args))
+    print(report)  # noqa: T201
+    failed = False
+    if args.min_throughput and report.messages / report.elapsed < args.min_throughput:
+        print("throughput below --min-throughput")  # noqa: T201
+        failed = True
+    if args.max_p99 and report.percentile(99) > args.max_p99:
+        print("p99 latency above --max-p99")  # noqa: T201
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
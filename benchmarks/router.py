@@ -0,0 +1,134 @@
+"""
+Compare the topic routing table with the former if/elif chain.
+
+Run with ``python -m benchmarks.router``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from custom_components.evcc.api import EvccApiClient, LoadPoint, Vehicle
+
+from .common import TOPIC, generate_messages
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from .common import Message
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LegacyEvccApiClient:
+    """The message handler as it was before the routing table."""
+
+    def __init__(self) -> None:
+        """Create the legacy client."""
+        self.loadpoints: dict[int, LoadPoint] = {}
+        self.vehicles: dict[int, Vehicle] = {}
+
+    async def message_received(self, msg: Message) -> None:  # noqa: PLR0912
+        """Handle evcc mqtt messages."""
+        _LOGGER.debug("New message: %s=%s", msg.topic, msg.payload)
+        parts = msg.topic.split("/")
+        if len(parts) > 3:
+            if parts[1] == "loadpoints":
+                identifier = int(parts[2])
+                loadpoint = self.loadpoints.get(identifier)
+                if loadpoint is None:
+                    loadpoint = LoadPoint()
+                    self.loadpoints[identifier] = loadpoint
+                if parts[3] == "chargedEnergy":
+                    loadpoint.chargedEnergy = float(msg.payload)
+                elif parts[3] == "chargePower":
+                    loadpoint.chargePower = float(msg.payload)
+                elif parts[3] == "title":
+                    loadpoint.title = str(msg.payload)
+                elif parts[3] == "chargeTotalImport":
+                    loadpoint.totalChargedEnergy = float(msg.payload)
+                elif parts[3] == "chargeDuration":
+                    loadpoint.chargeDuration = float(msg.payload)
+                elif parts[3] == "chargeRemainingDuration":
+                    loadpoint.chargeRemainingDuration = float(msg.payload)
+                elif parts[3] == "chargeRemainingEnergy":
+                    loadpoint.chargeRemainingEnergy = float(msg.payload)
+                elif parts[3] == "vehicleSoc":
+                    loadpoint.vehicleSoc = float(msg.payload)
+                elif parts[3] == "vehicleLimitSoc":
+                    loadpoint.vehicleLimitSoc = float(msg.payload)
+                elif parts[3] == "vehicleRange":
+                    loadpoint.vehicleRange = float(msg.payload)
+                elif parts[3] == "phasesActive":
+                    loadpoint.phasesActive = int(msg.payload)
+                elif parts[3] == "chargeCurrents" and len(parts) > 4:
+                    if parts[4] == "l1":
+                        loadpoint.currentPhase1 = float(msg.payload)
+                    elif parts[4] == "l2":
+                        loadpoint.currentPhase2 = float(msg.payload)
+                    elif parts[4] == "l3":
+                        loadpoint.currentPhase3 = float(msg.payload)
+            elif parts[1] == "vehicle":
+                identifier = int(parts[2])
+                vehicle = self.vehicles.get(identifier)
+                if vehicle is None:
+                    vehicle = Vehicle()
+                    self.vehicles[identifier] = vehicle
+                if parts[3] == "title":
+                    vehicle.title = str(msg.payload)
+                elif parts[3] == "capacity":
+                    vehicle.capacity = float(msg.payload)
+
+
+async def _async_run(
+    handler: Callable[[Message], Awaitable[None]], messages: list[Message]
+) -> float:
+    """Return the seconds to await the coroutine handler for all messages."""
+    start = time.perf_counter()
+    for msg in messages:
+        await handler(msg)
+    return time.perf_counter() - start
+
+
+def _run(handler: Callable[[Message], bool], messages: list[Message]) -> float:
+    """Return the seconds to call the handler for all messages."""
+    start = time.perf_counter()
+    for msg in messages:
+        handler(msg)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = generate_messages(args.messages)
+    results = {
+        "if/elif chain": min(
+            asyncio.run(_async_run(LegacyEvccApiClient().message_received, messages))
+            for _ in range(args.repeat)
+        ),
+        # The routing without the queue, which benchmarks.ingest compares.
+        "routing table": min(
+            _run(EvccApiClient(TOPIC).apply_message, messages)
+            for _ in range(args.repeat)
+        ),
+    }
+    for name, best in results.items():
+        print(  # noqa: T201
+            f"{name:>14}: {best / len(messages) * 1e9:8.1f} ns/msg "
+            f"({len(messages) / best:,.0f} msg/s)"
+        )
+    speedup = results["if/elif chain"] / results["routing table"]
+    print(f"{'speedup':>14}: {speedup:.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
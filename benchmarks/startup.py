@@ -0,0 +1,144 @@
+"""
+Measure the import and config entry setup time of the integration.
+
+Every measurement runs in a fresh interpreter, so the module imports are
+paid like at Home Assistant startup. The modules Home Assistant loads
+before any integration, core, helpers, MQTT and the sensor component, are
+imported first and not counted.
+
+The report lists the import time of the integration, of its platforms and
+of the modules it defers, and the wall time of async_setup_entry for a site
+without load points, once with all platforms forwarded up front as before
+and once lazily. The time until the entities of the first discovered load
+point exist shows what the lazy forwarding postpones.
+
+Run with ``python -m benchmarks.startup --runs 5``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Any
+
+# Imported by Home Assistant before the integration is set up.
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.mqtt",
+    "homeassistant.components.sensor",
+)
+
+MODULES = (
+    "custom_components.evcc",
+    "custom_components.evcc.sensor",
+    "custom_components.evcc.binary_sensor",
+    "custom_components.evcc.number",
+    "custom_components.evcc.select",
+    "custom_components.evcc.switch",
+    # Deferred until the recorder is loaded.
+    "custom_components.evcc.energy",
+)
+
+SCENARIOS = ("import", "eager", "lazy")
+
+
+def _measure_imports() -> dict[str, Any]:
+    """Return the milliseconds to import each of MODULES."""
+    for module in PRELOADED:
+        importlib.import_module(module)
+    results = {}
+    for module in MODULES:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        results[module] = (time.perf_counter() - start) * 1000
+    return results
+
+
+async def _async_measure_setup(*, eager: bool) -> dict[str, Any]:
+    """Return the setup and first load point milliseconds and the platforms."""
+    from unittest.mock import patch
+
+    from custom_components import evcc
+
+    from .common import TOPIC, Message
+    from .harness import add_evcc_entry, async_offline_home_assistant
+
+    platforms = [*evcc.PLATFORMS, *evcc.LOADPOINT_PLATFORMS] if eager else None
+    with patch.object(evcc, "PLATFORMS", platforms or evcc.PLATFORMS):
+        async with async_offline_home_assistant() as hass:
+            entry = add_evcc_entry(hass)
+            start = time.perf_counter()
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            setup = (time.perf_counter() - start) * 1000
+            forwarded = sorted(entry.runtime_data.platforms)
+            start = time.perf_counter()
+            entry.runtime_data.client.message_received(
+                Message(f"{TOPIC}/loadpoints/1/title", "Garage")
+            )
+            await asyncio.sleep(0)
+            await hass.async_block_till_done()
+            first_loadpoint = (time.perf_counter() - start) * 1000
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+    return {
+        "setup": setup,
+        "first_loadpoint": first_loadpoint,
+        "platforms": forwarded,
+    }
+
+
+def _run_scenario(scenario: str) -> dict[str, Any]:
+    """Run a scenario in a fresh interpreter and return its results."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "benchmarks.startup", "--scenario", scenario],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _report(runs: int) -> None:
+    imports = [_run_scenario("import") for _ in range(runs)]
+    for module in MODULES:
+        print(  # noqa: T201
+            f"import {module:<36} {median(run[module] for run in imports):7.1f} ms"
+        )
+    for scenario in ("eager", "lazy"):
+        results = [_run_scenario(scenario) for _ in range(runs)]
+        print(  # noqa: T201
+            f"{scenario:>5}: async_setup_entry "
+            f"{median(run['setup'] for run in results):7.1f} ms with "
+            f"{', '.join(results[-1]['platforms'])}, first load point after "
+            f"{median(run['first_loadpoint'] for run in results):6.1f} ms"
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5, help="median of the runs")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.scenario is None:
+        _report(args.runs)
+    elif args.scenario == "import":
+        print(json.dumps(_measure_imports()))  # noqa: T201
+    else:
+        results = asyncio.run(_async_measure_setup(eager=args.scenario == "eager"))
+        print(json.dumps(results))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
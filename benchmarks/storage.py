@@ -0,0 +1,81 @@
+"""
+Compare the memory used by the compact and the __dict__ based LoadPoint.
+
+Run with ``python -m benchmarks.storage``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from custom_components.evcc.api import LOADPOINT_FIELDS, LoadPoint
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class LegacyLoadPoint:
+    """The load point with a __dict__ and a set of changed attribute names."""
+
+    def __init__(self) -> None:
+        """Create a new LegacyLoadPoint instance."""
+        self.changed: set[str] = set()
+        self.chargedEnergy: float = 0
+        self.totalChargedEnergy: float = 0
+        self.chargePower: float = 0
+        self.title = ""
+        self.chargeDuration: float = 0
+        self.chargeRemainingDuration: float = 0
+        self.chargeRemainingEnergy: float = 0
+        self.vehicleSoc: float = 0
+        self.vehicleLimitSoc: float = 0
+        self.vehicleRange: float = 0
+        self.phasesActive: int = 0
+        self.currentPhase1: float = 0
+        self.currentPhase2: float = 0
+        self.currentPhase3: float = 0
+
+
+def _measure(factory: Callable[[], object], count: int) -> tuple[int, int]:
+    """Return bytes and allocated blocks for count populated load points."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    loadpoints = []
+    for index in range(count):
+        loadpoint = factory()
+        for attribute, convert in LOADPOINT_FIELDS.values():
+            setattr(loadpoint, attribute, convert("1" if convert is int else index))
+        loadpoints.append(loadpoint)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del loadpoints
+    return size, blocks
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--loadpoints", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = {}
+    for name, factory in (("legacy", LegacyLoadPoint), ("compact", LoadPoint)):
+        size, blocks = _measure(factory, args.loadpoints)
+        results[name] = size
+        print(  # noqa: T201
+            f"{name:>7}: {size / args.loadpoints:8.1f} bytes/load point, "
+            f"{blocks / args.loadpoints:6.1f} allocations/load point"
+        )
+    saving = 1 - results["compact"] / results["legacy"]
+    print(f"{'saving':>7}: {saving:.0%}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
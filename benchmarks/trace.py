@@ -0,0 +1,124 @@
+"""
+Read, write and generate evcc MQTT traces.
+
+A trace is a text file, optionally gzip compressed, with one message per
+line: the receive time in seconds since the start of the trace, the topic
+and the payload, separated by tabs.
+
+Generate a synthetic trace with
+``python -m benchmarks.trace --duration 3600 evcc.trace.gz``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import random
+from typing import TYPE_CHECKING, NamedTuple
+
+from .common import LOADPOINT_SUFFIXES, TOPIC
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import IO
+
+
+class TraceMessage(NamedTuple):
+    """A recorded MQTT message."""
+
+    timestamp: float
+    topic: str
+    payload: str
+
+
+def _open(path: Path | str, mode: str) -> IO[str]:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # noqa: PTH123
+
+
+def read_trace(path: Path | str) -> Iterator[TraceMessage]:
+    """Read the messages of a trace file."""
+    with _open(path, "r") as file:
+        for line in file:
+            timestamp, topic, payload = line.rstrip("\n").split("\t", 2)
+            yield TraceMessage(float(timestamp), topic, payload)
+
+
+def write_trace(path: Path | str, messages: Iterable[TraceMessage]) -> None:
+    """Write messages to a trace file."""
+    with _open(path, "w") as file:
+        file.writelines(
+            f"{message.timestamp:.3f}\t{message.topic}\t{message.payload}\n"
+            for message in messages
+        )
+
+
+# Site topics evcc publishes every cycle.
+SITE_SUFFIXES = (
+    "gridPower",
+    "pvPower",
+    "homePower",
+    "batteryPower",
+    "batterySoc",
+)
+
+
+def generate_trace(
+    duration: float,
+    loadpoints: int = 3,
+    cycle: float = 10,
+    topic: str = TOPIC,
+    seed: int = 1,
+) -> Iterator[TraceMessage]:
+    """
+    Generate an evcc-like trace.
+
+    Every cycle evcc publishes all site and load point topics within a few
+    milliseconds. Power and currents change a little each cycle while most
+    other values repeat, like on a real installation.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    values: dict[str, float] = {}
+    timestamp = 0.0
+    while timestamp < duration:
+        offset = timestamp
+        for suffix in SITE_SUFFIXES:
+            key = f"{topic}/site/{suffix}"
+            values[key] = values.get(key, 1000) + rng.uniform(-50, 50)
+            offset += rng.uniform(0, 0.002)
+            yield TraceMessage(offset, key, f"{values[key]:.1f}")
+        for index in range(1, loadpoints + 1):
+            for suffix in LOADPOINT_SUFFIXES:
+                key = f"{topic}/loadpoints/{index}/{suffix}"
+                offset += rng.uniform(0, 0.002)
+                if suffix == "title":
+                    payload = f"Load point {index}"
+                elif suffix == "phasesActive":
+                    payload = "3"
+                elif suffix == "chargePower" or suffix.startswith("chargeCurrents"):
+                    values[key] = max(0.0, values.get(key, 16) + rng.uniform(-1, 1))
+                    payload = f"{values[key]:.2f}"
+                elif suffix in ("chargedEnergy", "chargeTotalImport"):
+                    values[key] = values.get(key, 0) + rng.uniform(0, 30)
+                    payload = f"{values[key]:.1f}"
+                else:
+                    payload = str(int(values.setdefault(key, rng.randint(0, 100))))
+                yield TraceMessage(offset, key, payload)
+        timestamp += cycle
+
+
+def main() -> None:
+    """Generate a synthetic trace file."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--duration", type=float, default=3600)
+    parser.add_argument("--loadpoints", type=int, default=3)
+    parser.add_argument("--cycle", type=float, default=10)
+    args = parser.parse_args()
+    write_trace(args.path, generate_trace(args.duration, args.loadpoints, args.cycle))
+
+
+if __name__ == "__main__":
+    main()
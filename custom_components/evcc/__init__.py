@@ -8,69 +8,333 @@ https://github.com/pail23/hass_evcc
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
+from functools import partial
 from typing import TYPE_CHECKING
 
 from homeassistant.components import mqtt
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import Platform
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import EvccApiClient
-from .const import CONF_TOPIC
+from .api import (
+    EvccApiClient,
+    EvccApiClientError,
+    async_fetch_state,
+    loadpoint_patterns,
+)
+from .commands import EvccCommands
+from .const import (
+    CONF_COALESCE_WINDOW,
+    CONF_INSTRUMENTATION,
+    CONF_MESSAGE_BUFFER_SIZE,
+    CONF_REGISTRY_SIZE,
+    CONF_REST_URL,
+    CONF_SITE_AGGREGATION,
+    CONF_SITE_INTERVAL,
+    CONF_TOPIC,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_MESSAGE_BUFFER_SIZE,
+    DEFAULT_REGISTRY_SIZE,
+    DEFAULT_SITE_AGGREGATION,
+    DEFAULT_SITE_INTERVAL,
+    DOMAIN,
+    LOADPOINT_DISCOVERY_TOPIC,
+    SIGNAL_NEW_LOADPOINT,
+    SIGNAL_NEW_VEHICLE,
+    SIGNAL_OPTIONS_UPDATED,
+    VEHICLE_DISCOVERY_TOPIC,
+)
 from .coordinator import EvccDataUpdateCoordinator
 from .data import EvccData
+from .devices import EvccDevices
+from .instrumentation import EvccInstrumentation, MessageRingBuffer
+from .services import async_setup_services
+from .sessions import SESSION_FIELDS, EvccSessionTracker, async_remove_session_log
+from .snapshot import EvccSnapshot, async_remove_snapshot
+from .subscriptions import EvccSubscriptions
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import EvccConfigEntry
 
-PLATFORMS: list[Platform] = [
-    Platform.SENSOR
-    #    Platform.BINARY_SENSOR,
-    #    Platform.SWITCH,
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Platforms set up with the entry, the site sensors need no discovery.
+PLATFORMS: list[Platform] = [Platform.SENSOR]
+
+# Platforms with load point entities only, they are set up when the first
+# load point is discovered. Sites without one never import them.
+LOADPOINT_PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SWITCH,
 ]
 
 
+async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
+    """Register the services."""
+    async_setup_services(hass)
+    return True
+
+
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: EvccConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = EvccDataUpdateCoordinator(hass=hass, topic=entry.data[CONF_TOPIC])
+    instrumentation = (
+        EvccInstrumentation() if entry.options.get(CONF_INSTRUMENTATION) else None
+    )
+    coordinator = EvccDataUpdateCoordinator(
+        hass=hass,
+        topic=entry.data[CONF_TOPIC],
+        coalesce_window=entry.options.get(
+            CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+        ),
+        instrumentation=instrumentation,
+    )
+    client = EvccApiClient(topic=entry.data[CONF_TOPIC])
+    _apply_client_options(client, entry.options)
+    client.schedule_drain = partial(hass.loop.call_soon, client.drain)
+    client.update_callback = coordinator.async_schedule_update
+    client.new_loadpoint_callback = partial(
+        async_dispatcher_send, hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_LOADPOINT.format(entry.entry_id),
+            partial(_async_add_loadpoint_platforms, hass, entry),
+        )
+    )
+    client.new_vehicle_callback = partial(
+        async_dispatcher_send, hass, SIGNAL_NEW_VEHICLE.format(entry.entry_id)
+    )
+    snapshot = EvccSnapshot(hass, entry.entry_id, client)
+    if await snapshot.async_restore():
+        coordinator.async_record_first_state()
+    entry.async_on_unload(coordinator.async_add_listener(snapshot.async_schedule_save))
+    entry.async_on_unload(snapshot.async_setup_shutdown_save())
+    subscriptions = EvccSubscriptions(
+        hass,
+        entry.data[CONF_TOPIC],
+        client.message_received
+        if instrumentation is None
+        else instrumentation.wrap(client),
+    )
+    # Registered right away, so the client is never left subscribed, not
+    # even when the setup fails further down.
+    entry.async_on_unload(subscriptions.async_unsubscribe)
     entry.runtime_data = EvccData(
-        client=EvccApiClient(topic=entry.data[CONF_TOPIC]),
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        subscriptions=subscriptions,
+        instrumentation=instrumentation,
+        snapshot=snapshot,
+        commands=EvccCommands(hass, entry.data[CONF_TOPIC]),
+        devices=EvccDevices(hass, entry.entry_id, client, coordinator),
+        sessions=EvccSessionTracker(hass, entry.entry_id, client),
     )
+    entry.async_on_unload(entry.runtime_data.commands.async_shutdown)
+    devices = entry.runtime_data.devices
+    entry.async_on_unload(devices.async_shutdown)
+    # Evicted load points and vehicles take their entities along.
+    client.removed_loadpoint_callback = devices.async_remove_loadpoint
+    client.removed_vehicle_callback = devices.async_remove_vehicle
+    sessions = entry.runtime_data.sessions
+    await sessions.async_load()
+    entry.async_on_unload(sessions.async_shutdown)
+    entry.async_on_unload(coordinator.async_add_listener(sessions.async_update))
+    if "recorder" in hass.config.components:
+        _async_setup_energy(hass, entry)
+    _async_apply_site_aggregation(hass, entry)
+    entry.async_on_unload(partial(_async_cancel_site_aggregation, entry))
+
+    if rest_url := entry.options.get(CONF_REST_URL):
+        # Load the whole state at once instead of message by message.
+        try:
+            state = await async_fetch_state(async_get_clientsession(hass), rest_url)
+        except EvccApiClientError as exception:
+            _LOGGER.warning("Waiting for MQTT, %s", exception)
+        else:
+            client.load_state(state)
+            coordinator.async_record_first_state()
 
     await mqtt.async_wait_for_mqtt_client(hass)
-    await mqtt.async_subscribe(
-        hass, f"{entry.data[CONF_TOPIC]}/#", entry.runtime_data.client.message_received
-    )
+    # Load points and vehicles are discovered through their title, all other
+    # topics are subscribed by the entities consuming them.
+    subscriptions.async_acquire(LOADPOINT_DISCOVERY_TOPIC)
+    subscriptions.async_acquire(VEHICLE_DISCOVERY_TOPIC)
+    # The sessions are tracked whether or not the entities are enabled.
+    for field in SESSION_FIELDS:
+        for pattern in loadpoint_patterns(field):
+            subscriptions.async_acquire(pattern)
+    await subscriptions.async_update()
 
     await coordinator.async_config_entry_first_refresh()
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    await _async_forward_platforms(hass, entry)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+@callback
+def _async_setup_energy(hass: HomeAssistant, entry: EvccConfigEntry) -> None:
+    """Add the charged energy of the load points to the long-term statistics."""
+    # Imported on demand, the recorder statistics pull in SQLAlchemy.
+    from .energy import ENERGY_FIELD, EvccEnergyStatistics
+
+    runtime_data = entry.runtime_data
+    energy = runtime_data.energy = EvccEnergyStatistics(
+        hass, entry.entry_id, runtime_data.client
+    )
+    for pattern in loadpoint_patterns(ENERGY_FIELD):
+        runtime_data.subscriptions.async_acquire(pattern)
+    entry.async_on_unload(energy.async_start())
+    entry.async_on_unload(energy.async_shutdown)
+    entry.async_on_unload(
+        runtime_data.coordinator.async_add_listener(energy.async_update)
+    )
+
+
+async def _async_forward_platforms(hass: HomeAssistant, entry: EvccConfigEntry) -> None:
+    """Set up the platforms needed by the load points known so far."""
+    platforms = entry.runtime_data.platforms
+    platforms.update(PLATFORMS)
+    if entry.runtime_data.client.loadpoints:
+        platforms.update(LOADPOINT_PLATFORMS)
+    # Load points discovered while forwarding add their platforms to the set.
+    forwarded: set[Platform] = set()
+    while missing := platforms - forwarded:
+        forwarded |= missing
+        await hass.config_entries.async_forward_entry_setups(entry, missing)
+
+
+@callback
+def _async_add_loadpoint_platforms(
+    hass: HomeAssistant, entry: EvccConfigEntry, _: int
+) -> None:
+    """Set up the load point platforms with the first load point."""
+    platforms = entry.runtime_data.platforms
+    if platforms.issuperset(LOADPOINT_PLATFORMS):
+        return
+    platforms.update(LOADPOINT_PLATFORMS)
+    # During the setup the platforms are forwarded by async_setup_entry.
+    if entry.state is ConfigEntryState.LOADED:
+        entry.async_create_task(
+            hass,
+            hass.config_entries.async_forward_entry_setups(entry, LOADPOINT_PLATFORMS),
+            "evcc forward load point platforms",
+        )
+
+
+def _apply_client_options(client: EvccApiClient, options: Mapping) -> None:
+    """Apply the registry size and create, resize or drop the message buffer."""
+    client.registry_size = int(options.get(CONF_REGISTRY_SIZE, DEFAULT_REGISTRY_SIZE))
+    size = int(options.get(CONF_MESSAGE_BUFFER_SIZE, DEFAULT_MESSAGE_BUFFER_SIZE))
+    buffer = client.message_buffer
+    if not size:
+        client.message_buffer = None
+    elif buffer is None or buffer.size != size:
+        client.message_buffer = MessageRingBuffer(size)
+
+
+@callback
+def _async_apply_site_aggregation(hass: HomeAssistant, entry: EvccConfigEntry) -> None:
+    """Apply the site aggregation options and (re)start the aggregation timer."""
+    _async_cancel_site_aggregation(entry)
+    client = entry.runtime_data.client
+    site_interval = entry.options.get(CONF_SITE_INTERVAL, DEFAULT_SITE_INTERVAL)
+    if not site_interval:
+        client.set_site_aggregation(None)
+        return
+    client.set_site_aggregation(
+        entry.options.get(CONF_SITE_AGGREGATION, DEFAULT_SITE_AGGREGATION)
+    )
+
+    @callback
+    def _async_aggregate_site(_: datetime) -> None:
+        client.aggregate_site()
+
+    entry.runtime_data.cancel_site_aggregation = async_track_time_interval(
+        hass,
+        _async_aggregate_site,
+        timedelta(seconds=site_interval),
+        name="evcc site aggregation",
+    )
+
+
+@callback
+def _async_cancel_site_aggregation(entry: EvccConfigEntry) -> None:
+    """Stop the site aggregation timer."""
+    if (cancel := entry.runtime_data.cancel_site_aggregation) is not None:
+        entry.runtime_data.cancel_site_aggregation = None
+        cancel()
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: EvccConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, entry.runtime_data.platforms
+    ):
+        await entry.runtime_data.snapshot.async_save()
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: EvccConfigEntry,
+) -> None:
+    """Remove the snapshot and the session log of a deleted entry."""
+    await async_remove_snapshot(hass, entry.entry_id)
+    await async_remove_session_log(hass, entry.entry_id)
 
 
-async def async_reload_entry(
+async def async_update_options(
     hass: HomeAssistant,
     entry: EvccConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """
+    Apply changed options.
+
+    The client state, the MQTT subscriptions and the entities are kept, only
+    toggling the instrumentation reloads the entry, since it wraps the
+    message callback and adds entities.
+    """
+    runtime_data = entry.runtime_data
+    options = entry.options
+    if bool(options.get(CONF_INSTRUMENTATION)) != (
+        runtime_data.instrumentation is not None
+    ):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    runtime_data.coordinator.coalesce_window = options.get(
+        CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+    )
+    _apply_client_options(runtime_data.client, options)
+    _async_apply_site_aggregation(hass, entry)
+    # The sensors pick up their publish filters.
+    async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id))
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import math
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import aiohttp
+
+from .rolling import RollingWindow
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
     from homeassistant.components.mqtt import ReceiveMessage
 
+    from .instrumentation import MessageRingBuffer
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -18,8 +30,40 @@ class EvccApiClientError(Exception):
 class LoadPoint:
     """Load point data."""
 
+    # Data attributes, the position is the bit used in `changed`.
+    FIELDS = (
+        "chargedEnergy",
+        "totalChargedEnergy",
+        "chargePower",
+        "title",
+        "chargeDuration",
+        "chargeRemainingDuration",
+        "chargeRemainingEnergy",
+        "vehicleSoc",
+        "vehicleLimitSoc",
+        "vehicleRange",
+        "phasesActive",
+        "currentPhase1",
+        "currentPhase2",
+        "currentPhase3",
+        "vehicleTitle",
+        "vehicleEnergyToLimit",
+        "mode",
+        "limitSoc",
+        "maxCurrent",
+        "connected",
+        "charging",
+        "enabled",
+    )
+    # Fixed attribute slots instead of a per-instance __dict__.
+    __slots__ = ("changed", "seen", *FIELDS)
+
     def __init__(self) -> None:
         """Create a new LoadPoint instance."""
+        # Bit mask of the FIELDS changed since the last flush to the entities.
+        self.changed: int = 0
+        # Monotonic time of the last message, the stale ones are evicted.
+        self.seen: float = -math.inf
         self.chargedEnergy: float = 0
         self.totalChargedEnergy: float = 0
         self.chargePower: float = 0
@@ -34,16 +78,250 @@ class LoadPoint:
         self.currentPhase1: float = 0
         self.currentPhase2: float = 0
         self.currentPhase3: float = 0
+        self.vehicleTitle: str = ""
+        # Derived from the connected vehicle, in Wh.
+        self.vehicleEnergyToLimit: float | None = None
+        # Charge mode, one of CHARGE_MODES.
+        self.mode: str = ""
+        self.limitSoc: float = 0
+        self.maxCurrent: float = 0
+        self.connected: bool = False
+        self.charging: bool = False
+        # Whether the charger is enabled by evcc.
+        self.enabled: bool = False
 
 
 class Vehicle:
     """Vehicle data."""
 
+    # Data attributes, the position is the bit used in `changed`.
+    FIELDS = ("title", "capacity", "soc", "loadpoint")
+    __slots__ = ("changed", "seen", *FIELDS)
+
     def __init__(self) -> None:
         """Create a new Vehicle instance."""
+        # Bit mask of the FIELDS changed since the last flush to the entities.
+        self.changed: int = 0
+        # Monotonic time of the last message, the stale ones are evicted.
+        self.seen: float = -math.inf
         self.title: str = ""
-        self.capacity: float = 0
-        self.title = ""
+        self.capacity: float = 0  # in kWh
+        # Derived from the load point the vehicle is connected to.
+        self.soc: float | None = None
+        self.loadpoint: int | None = None
+
+
+class Site:
+    """Site data, None until evcc published a value."""
+
+    # Data attributes, the position is the bit used in `changed`.
+    FIELDS = ("gridPower", "pvPower", "homePower", "batterySoc", "batteryPower")
+    __slots__ = ("changed", "seen", *FIELDS)
+
+    def __init__(self) -> None:
+        """Create a new Site instance."""
+        # Bit mask of the FIELDS changed since the last flush to the entities.
+        self.changed: int = 0
+        # Monotonic time of the last message, the stale ones are evicted.
+        self.seen: float = -math.inf
+        self.gridPower: float | None = None
+        self.pvPower: float | None = None
+        self.homePower: float | None = None
+        self.batterySoc: float | None = None
+        self.batteryPower: float | None = None
+
+
+# Charge modes of a load point, set on "<topic>/loadpoints/<id>/mode/set".
+CHARGE_MODES = ("off", "now", "minpv", "pv")
+
+
+def _to_bool(payload: Any) -> bool:
+    """Convert an evcc boolean payload or JSON value."""
+    return payload is True or payload == "true"
+
+
+# Maps the topic suffix below "<topic>/loadpoints/<id>/" to the attribute it
+# updates and the converter applied to the payload.
+LOADPOINT_FIELDS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "chargedEnergy": ("chargedEnergy", float),
+    "chargePower": ("chargePower", float),
+    "title": ("title", str),
+    "chargeTotalImport": ("totalChargedEnergy", float),
+    "chargeDuration": ("chargeDuration", float),
+    "chargeRemainingDuration": ("chargeRemainingDuration", float),
+    "chargeRemainingEnergy": ("chargeRemainingEnergy", float),
+    "vehicleSoc": ("vehicleSoc", float),
+    "vehicleLimitSoc": ("vehicleLimitSoc", float),
+    "vehicleRange": ("vehicleRange", float),
+    "phasesActive": ("phasesActive", int),
+    "chargeCurrents/l1": ("currentPhase1", float),
+    "chargeCurrents/l2": ("currentPhase2", float),
+    "chargeCurrents/l3": ("currentPhase3", float),
+    "vehicleTitle": ("vehicleTitle", str),
+    "mode": ("mode", str),
+    "limitSoc": ("limitSoc", float),
+    "maxCurrent": ("maxCurrent", float),
+    "connected": ("connected", _to_bool),
+    "charging": ("charging", _to_bool),
+    "enabled": ("enabled", _to_bool),
+}
+
+# Maps a LoadPoint attribute to the topic suffix it is published on.
+LOADPOINT_TOPICS: dict[str, str] = {
+    attribute: suffix for suffix, (attribute, _) in LOADPOINT_FIELDS.items()
+}
+
+# Maps the topic suffix below "<topic>/vehicle/<id>/" to the attribute it
+# updates and the converter applied to the payload.
+VEHICLE_FIELDS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "title": ("title", str),
+    "capacity": ("capacity", float),
+}
+
+# Maps a Vehicle attribute to the topic suffix it is published on.
+VEHICLE_TOPICS: dict[str, str] = {
+    attribute: suffix for suffix, (attribute, _) in VEHICLE_FIELDS.items()
+}
+
+# Topic patterns below the evcc topic the derived attributes are computed
+# from, they link load points and vehicles by the vehicle title.
+_LINK_PATTERNS = ("loadpoints/+/vehicleTitle", "vehicle/+/title")
+DERIVED_PATTERNS: dict[tuple[str, str], tuple[str, ...]] = {
+    ("loadpoints", "vehicleEnergyToLimit"): (
+        *_LINK_PATTERNS,
+        "loadpoints/+/vehicleSoc",
+        "loadpoints/+/vehicleLimitSoc",
+        "vehicle/+/capacity",
+    ),
+    ("vehicles", "soc"): (*_LINK_PATTERNS, "loadpoints/+/vehicleSoc"),
+    ("vehicles", "loadpoint"): _LINK_PATTERNS,
+}
+
+# LoadPoint and Vehicle attributes the derived attributes depend on.
+_LOADPOINT_LINK_INPUTS = frozenset({"vehicleTitle", "vehicleSoc", "vehicleLimitSoc"})
+_VEHICLE_LINK_INPUTS = frozenset({"title", "capacity"})
+
+
+def loadpoint_patterns(attribute: str) -> tuple[str, ...]:
+    """Return the topic patterns a LoadPoint attribute is read from."""
+    return DERIVED_PATTERNS.get(("loadpoints", attribute)) or (
+        f"loadpoints/+/{LOADPOINT_TOPICS[attribute]}",
+    )
+
+
+def vehicle_patterns(attribute: str) -> tuple[str, ...]:
+    """Return the topic patterns a Vehicle attribute is read from."""
+    return DERIVED_PATTERNS.get(("vehicles", attribute)) or (
+        f"vehicle/+/{VEHICLE_TOPICS[attribute]}",
+    )
+
+
+# Maps the topic suffix below "<topic>/site/" to the attribute it updates and
+# the converter applied to the payload.
+SITE_FIELDS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "gridPower": ("gridPower", float),
+    "pvPower": ("pvPower", float),
+    "homePower": ("homePower", float),
+    "batterySoc": ("batterySoc", float),
+    "batteryPower": ("batteryPower", float),
+}
+
+# Maps a Site attribute to the topic suffix it is published on.
+SITE_TOPICS: dict[str, str] = {
+    attribute: suffix for suffix, (attribute, _) in SITE_FIELDS.items()
+}
+
+# There is a single site, it is reported with this (registry, identifier) key.
+SITE_KEY = ("site", 0)
+
+# Aggregations applied to the site values received within an interval.
+SITE_AGGREGATION_MEAN = "mean"
+SITE_AGGREGATION_LAST = "last"
+
+
+# Seconds to wait for the evcc REST API.
+REST_TIMEOUT = 10
+
+# Seconds a load point or vehicle has to be silent before a new one with a
+# full registry evicts it.
+STALE_AFTER = 600
+
+# Number of ignored topics remembered, further ones are parsed every time.
+MAX_IGNORED_TOPICS = 1000
+
+# Highest load point and vehicle identifier, the session log stores them in
+# 16 bits and evcc numbers them from 1.
+MAX_IDENTIFIER = 0xFFFF
+
+
+async def async_fetch_state(session: aiohttp.ClientSession, url: str) -> Any:
+    """Fetch the state from the evcc REST API at url, e.g. http://evcc:7070."""
+    try:
+        async with asyncio.timeout(REST_TIMEOUT):
+            response = await session.get(f"{url.rstrip('/')}/api/state")
+            response.raise_for_status()
+            return await response.json()
+    except (aiohttp.ClientError, TimeoutError) as exception:
+        msg = f"Error fetching the evcc state - {exception}"
+        raise EvccApiClientError(msg) from exception
+
+
+def _state_values(state: Mapping[str, Any]) -> Iterator[tuple[str, Any]]:
+    """Yield the values of an /api/state response by topic path."""
+    # Older evcc versions wrap the state in "result".
+    state = state.get("result", state)
+    for index, loadpoint in enumerate(state.get("loadpoints") or (), 1):
+        for key, value in loadpoint.items():
+            if key == "chargeCurrents" and isinstance(value, list):
+                for phase, current in enumerate(value[:3], 1):
+                    yield f"loadpoints/{index}/chargeCurrents/l{phase}", current
+            else:
+                yield f"loadpoints/{index}/{key}", value
+    for key, vehicle in (state.get("vehicles") or {}).items():
+        if isinstance(vehicle, Mapping):
+            for field, value in vehicle.items():
+                yield f"vehicle/{key}/{field}", value
+    for key in SITE_FIELDS:
+        if key in state:
+            yield f"site/{key}", state[key]
+    grid = state.get("grid")
+    if "gridPower" not in state and isinstance(grid, Mapping) and "power" in grid:
+        yield "site/gridPower", grid["power"]
+
+
+class TopicRoute(NamedTuple):
+    """Precompiled route from an MQTT topic to the attribute it updates."""
+
+    key: tuple[str, int]
+    target: LoadPoint | Vehicle | Site
+    attribute: str
+    convert: Callable[[Any], Any]
+    bit: int
+    # Collect the values until the next aggregate_site call.
+    aggregate: bool = False
+    # Rolling windows fed with every value, even unchanged ones.
+    rolling: tuple[RollingWindow, ...] = ()
+    # Called with the identifier and attribute after a change.
+    on_change: Callable[[int, str], None] | None = None
+
+
+def _parse_identifier(index: str) -> int | None:
+    """Return the load point or vehicle identifier index, None if it is none."""
+    # Only plain ASCII numbers, str.isdigit also accepts digits int rejects.
+    if not (index.isascii() and index.isdigit()):
+        return None
+    if len(index) > len(str(MAX_IDENTIFIER)) or int(index) > MAX_IDENTIFIER:
+        return None
+    return int(index)
+
+
+def _restore_fields(
+    target: LoadPoint | Vehicle | Site, fields: Mapping[str, Any]
+) -> None:
+    """Set the known FIELDS of target from a snapshot."""
+    for field, value in fields.items():
+        if field in target.FIELDS:
+            setattr(target, field, value)
 
 
 class EvccApiClient:
@@ -55,58 +333,584 @@ class EvccApiClient:
     ) -> None:
         """Evcc API Client."""
         self._topic = topic
+        self._prefix = f"{topic}/"
         self.loadpoints: dict[int, LoadPoint] = {}
         self.vehicles: dict[int, Vehicle] = {}
+        self.site = Site()
+        # Maximum number of load points and of vehicles, None is unbounded.
+        self.registry_size: int | None = None
+        # Aggregation of the site values between aggregate_site calls, None
+        # applies every message directly.
+        self.site_aggregation: str | None = None
+        # [sum, count, last] of the site values received since aggregate_site.
+        self._site_samples: dict[str, list[float]] = {}
+        # Index of the vehicle connected to each load point.
+        self.loadpoint_vehicles: dict[int, int] = {}
+        self._vehicle_titles: dict[str, int] = {}
+        # Rolling windows per (load point, attribute) and window duration.
+        self._rolling: dict[tuple[int, str], dict[float, RollingWindow]] = {}
+        # Users of each rolling window, see release_rolling_window.
+        self._rolling_users: dict[tuple[int, str, float], int] = {}
+        # Parsed routes per topic string, None for topics that are ignored.
+        self._routes: dict[str, TopicRoute | None] = {}
+        # Number of None routes, see MAX_IGNORED_TOPICS.
+        self._ignored_topics = 0
+        # Last raw payload and its converted value per routed topic.
+        self._payloads: dict[str, tuple[Any, Any]] = {}
+        # Messages received and those skipped as a repeated payload.
+        self.received_messages = 0
+        self.duplicate_messages = 0
+        # Load points and vehicles with changes since the last flush.
+        self._dirty: dict[tuple[str, int], LoadPoint | Vehicle | Site] = {}
+        # Keeps the last raw messages for the diagnostics.
+        self.message_buffer: MessageRingBuffer | None = None
+        # Messages received since the last drain.
+        self._queue: list[ReceiveMessage] = []
+        # Schedules a call of drain, None applies every message right away.
+        self.schedule_drain: Callable[[], None] | None = None
+        # Called after a message changed the client state.
+        self.update_callback: Callable[[], None] | None = None
+        # Called with the identifier of a load point seen for the first time.
+        self.new_loadpoint_callback: Callable[[int], None] | None = None
+        # Called with the identifier of a vehicle seen for the first time.
+        self.new_vehicle_callback: Callable[[int], None] | None = None
+        # Called with the identifier of an evicted load point.
+        self.removed_loadpoint_callback: Callable[[int], None] | None = None
+        # Called with the identifier of an evicted vehicle.
+        self.removed_vehicle_callback: Callable[[int], None] | None = None
+
+    @property
+    def routes(self) -> Mapping[str, TopicRoute | None]:
+        """Return the routes parsed so far, None for ignored topics."""
+        return self._routes
+
+    @property
+    def duplicate_share(self) -> float | None:
+        """Return the share of the received messages repeating a payload."""
+        if not self.received_messages:
+            return None
+        return self.duplicate_messages / self.received_messages
+
+    def message_received(self, msg: ReceiveMessage) -> None:
+        """
+        Queue an evcc mqtt message.
+
+        Called synchronously from the MQTT client, the message is only queued
+        and the queue is applied by drain once per event loop iteration, see
+        schedule_drain. Without schedule_drain the message is applied right
+        away.
+        """
+        queue = self._queue
+        queue.append(msg)
+        if len(queue) == 1:
+            if self.schedule_drain is None:
+                self.drain()
+            else:
+                self.schedule_drain()
+
+    def drain(self) -> None:
+        """Apply the queued messages and notify update_callback once."""
+        queue = self._queue
+        if not queue:
+            return
+        self._queue = []
+        apply_message = self.apply_message
+        changed = False
+        for msg in queue:
+            try:
+                changed |= apply_message(msg)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Invalid payload %r on %s", msg.payload, msg.topic)
+        if changed and self.update_callback is not None:
+            self.update_callback()
+
+    def apply_message(self, msg: ReceiveMessage) -> bool:
+        """
+        Apply an evcc mqtt message, return whether the client state changed.
+
+        evcc republishes unchanged values every cycle, a payload equal to the
+        last one of its topic is skipped before it is converted. Only the
+        rolling windows and the site aggregation still get its value, they
+        count every sample.
+        """
+        topic = msg.topic
+        payload = msg.payload
+        self.received_messages += 1
+        if self.message_buffer is not None:
+            self.message_buffer.record(topic, payload, msg.timestamp)
+        cached = self._payloads.get(topic)
+        if cached is not None and cached[0] == payload:
+            self.duplicate_messages += 1
+            route = self._routes[topic]
+            route.target.seen = msg.timestamp
+            if route.aggregate:
+                self._add_site_sample(route.attribute, cached[1])
+            elif route.rolling:
+                for window in route.rolling:
+                    window.add(msg.timestamp, cached[1])
+            return False
+        first = False
+        try:
+            route = self._routes[topic]
+        except KeyError:
+            route = self._compile_route(topic, msg.timestamp)
+            first = True
+        if route is None:
+            return False
+        route.target.seen = msg.timestamp
+        value = route.convert(payload)
+        self._payloads[topic] = (payload, value)
+        if route.aggregate:
+            self._add_site_sample(route.attribute, value)
+            return False
+        if route.rolling:
+            for window in route.rolling:
+                window.add(msg.timestamp, value)
+        target = route.target
+        # The first message of a topic is always published, even if it matches
+        # the default value.
+        if not first and getattr(target, route.attribute) == value:
+            return False
+        setattr(target, route.attribute, value)
+        target.changed |= route.bit
+        self._dirty[route.key] = target
+        if route.on_change is not None:
+            route.on_change(route.key[1], route.attribute)
+        return True
+
+    def load_state(self, state: Mapping[str, Any]) -> None:
+        """
+        Apply a response of the evcc REST API /api/state in a single pass.
+
+        The routes of the loaded values are compiled on the way, so the
+        retained MQTT messages of the same values are no changes anymore and
+        MQTT only delivers deltas. Vehicles are keyed by name in the REST API,
+        only numeric keys match the vehicle topics.
+        """
+        routes = self._routes
+        prefix = self._prefix
+        now = time.monotonic()
+        for path, value in _state_values(state):
+            if value is None:
+                continue
+            topic = prefix + path
+            try:
+                route = routes[topic]
+            except KeyError:
+                route = self._compile_route(topic, now)
+            if route is None:
+                continue
+            route.target.seen = now
+            try:
+                converted = route.convert(value)
+            except (TypeError, ValueError):
+                continue
+            target = route.target
+            setattr(target, route.attribute, converted)
+            target.changed |= route.bit
+            self._dirty[route.key] = target
+            if route.on_change is not None:
+                route.on_change(route.key[1], route.attribute)
+        if self._dirty and self.update_callback is not None:
+            self.update_callback()
+
+    def _add_site_sample(self, attribute: str, value: float) -> None:
+        """Collect a site value until the next aggregate_site call."""
+        samples = self._site_samples.get(attribute)
+        if samples is None:
+            self._site_samples[attribute] = [value, 1, value]
+        else:
+            samples[0] += value
+            samples[1] += 1
+            samples[2] = value
+
+    def _set_derived(
+        self,
+        kind: str,
+        identifier: int,
+        target: LoadPoint | Vehicle,
+        attribute: str,
+        value: Any,
+    ) -> None:
+        """Set a derived attribute and mark it changed."""
+        if getattr(target, attribute) == value:
+            return
+        setattr(target, attribute, value)
+        target.changed |= 1 << target.FIELDS.index(attribute)
+        self._dirty[(kind, identifier)] = target
+
+    def _loadpoint_changed(self, identifier: int, attribute: str) -> None:
+        """Update the attributes derived from a load point attribute."""
+        loadpoint = self.loadpoints[identifier]
+        if attribute == "vehicleTitle":
+            self._link(identifier)
+        elif (vehicle_id := self.loadpoint_vehicles.get(identifier)) is not None:
+            if attribute == "vehicleSoc":
+                self._set_derived(
+                    "vehicles",
+                    vehicle_id,
+                    self.vehicles[vehicle_id],
+                    "soc",
+                    loadpoint.vehicleSoc,
+                )
+            self._update_energy_to_limit(identifier)
+
+    def _vehicle_changed(self, identifier: int, attribute: str) -> None:
+        """Update the attributes derived from a vehicle attribute."""
+        if attribute == "title":
+            self._index_vehicles()
+        else:
+            for loadpoint_id, vehicle_id in self.loadpoint_vehicles.items():
+                if vehicle_id == identifier:
+                    self._update_energy_to_limit(loadpoint_id)
+
+    def _index_vehicles(self) -> None:
+        """Rebuild the vehicle title index and link all load points."""
+        self._vehicle_titles = {
+            vehicle.title: vehicle_id
+            for vehicle_id, vehicle in self.vehicles.items()
+            if vehicle.title
+        }
+        for loadpoint_id in self.loadpoints:
+            self._link(loadpoint_id)
+
+    def _link(self, loadpoint_id: int) -> None:
+        """Link a load point to the vehicle matching its vehicle title."""
+        loadpoint = self.loadpoints[loadpoint_id]
+        vehicle_id = self._vehicle_titles.get(loadpoint.vehicleTitle)
+        previous = self.loadpoint_vehicles.get(loadpoint_id)
+        if vehicle_id == previous:
+            return
+        if previous is not None:
+            del self.loadpoint_vehicles[loadpoint_id]
+            vehicle = self.vehicles[previous]
+            self._set_derived("vehicles", previous, vehicle, "loadpoint", None)
+            self._set_derived("vehicles", previous, vehicle, "soc", None)
+        if vehicle_id is not None:
+            self.loadpoint_vehicles[loadpoint_id] = vehicle_id
+            vehicle = self.vehicles[vehicle_id]
+            self._set_derived(
+                "vehicles", vehicle_id, vehicle, "loadpoint", loadpoint_id
+            )
+            self._set_derived(
+                "vehicles", vehicle_id, vehicle, "soc", loadpoint.vehicleSoc
+            )
+        self._update_energy_to_limit(loadpoint_id)
+
+    def _update_energy_to_limit(self, loadpoint_id: int) -> None:
+        """Compute the energy in Wh to charge the connected vehicle to the limit."""
+        loadpoint = self.loadpoints[loadpoint_id]
+        vehicle_id = self.loadpoint_vehicles.get(loadpoint_id)
+        energy = None
+        if vehicle_id is not None and (capacity := self.vehicles[vehicle_id].capacity):
+            missing = loadpoint.vehicleLimitSoc - loadpoint.vehicleSoc
+            energy = max(capacity * 10 * missing, 0.0)
+        self._set_derived(
+            "loadpoints", loadpoint_id, loadpoint, "vehicleEnergyToLimit", energy
+        )
+
+    def rolling_window(
+        self, loadpoint_id: int, attribute: str, duration: float
+    ) -> RollingWindow:
+        """Return the rolling window of a load point attribute, created on demand."""
+        users = self._rolling_users
+        users[loadpoint_id, attribute, duration] = (
+            users.get((loadpoint_id, attribute, duration), 0) + 1
+        )
+        windows = self._rolling.setdefault((loadpoint_id, attribute), {})
+        window = windows.get(duration)
+        if window is not None:
+            return window
+        window = windows[duration] = RollingWindow(duration)
+        route = self._routes.get(self._rolling_topic(loadpoint_id, attribute))
+        if route is not None:
+            # Start with the current value and feed the window from now on.
+            window.add(time.monotonic(), getattr(route.target, attribute))
+        self._update_rolling_route(loadpoint_id, attribute)
+        return window
+
+    def release_rolling_window(
+        self, loadpoint_id: int, attribute: str, duration: float
+    ) -> None:
+        """Release a window of rolling_window, dropped with its last user."""
+        key = (loadpoint_id, attribute, duration)
+        users = self._rolling_users.get(key)
+        if users is None:
+            # Already dropped with the evicted load point.
+            return
+        if users > 1:
+            self._rolling_users[key] = users - 1
+            return
+        del self._rolling_users[key]
+        windows = self._rolling[loadpoint_id, attribute]
+        del windows[duration]
+        if not windows:
+            del self._rolling[loadpoint_id, attribute]
+        self._update_rolling_route(loadpoint_id, attribute)
+
+    def _rolling_topic(self, loadpoint_id: int, attribute: str) -> str:
+        return f"{self._prefix}loadpoints/{loadpoint_id}/{LOADPOINT_TOPICS[attribute]}"
+
+    def _update_rolling_route(self, loadpoint_id: int, attribute: str) -> None:
+        """Feed the current rolling windows of the attribute from its route."""
+        topic = self._rolling_topic(loadpoint_id, attribute)
+        route = self._routes.get(topic)
+        if route is not None:
+            windows = self._rolling.get((loadpoint_id, attribute))
+            self._routes[topic] = route._replace(
+                rolling=tuple(windows.values()) if windows else ()
+            )
+
+    def set_site_aggregation(self, aggregation: str | None) -> None:
+        """Change the site aggregation, None applies every message directly."""
+        self.aggregate_site()
+        self.site_aggregation = aggregation
+        routes = self._routes
+        for topic, route in routes.items():
+            if route is not None and route.key == SITE_KEY:
+                routes[topic] = route._replace(aggregate=aggregation is not None)
+
+    def aggregate_site(self) -> None:
+        """Apply the site values aggregated since the last call."""
+        if not self._site_samples:
+            return
+        mean = self.site_aggregation == SITE_AGGREGATION_MEAN
+        site = self.site
+        changed = 0
+        for attribute, (total, count, last) in self._site_samples.items():
+            value = total / count if mean else last
+            if getattr(site, attribute) != value:
+                setattr(site, attribute, value)
+                changed |= 1 << Site.FIELDS.index(attribute)
+        self._site_samples.clear()
+        if changed:
+            site.changed |= changed
+            self._dirty[SITE_KEY] = site
+            if self.update_callback is not None:
+                self.update_callback()
+
+    def pop_changes(self) -> set[tuple[str, int, str]]:
+        """
+        Return and reset the changes since the last call.
+
+        Each change is reported as (registry, identifier, attribute), for
+        example ("loadpoints", 1, "chargePower").
+        """
+        changes = set()
+        for (kind, identifier), target in self._dirty.items():
+            changed = target.changed
+            target.changed = 0
+            changes.update(
+                (kind, identifier, attribute)
+                for bit, attribute in enumerate(target.FIELDS)
+                if changed >> bit & 1
+            )
+        self._dirty.clear()
+        return changes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the site, all load points and vehicles."""
+        return {
+            "loadpoints": {
+                str(identifier): {
+                    field: getattr(loadpoint, field) for field in loadpoint.FIELDS
+                }
+                for identifier, loadpoint in self.loadpoints.items()
+            },
+            "vehicles": {
+                str(identifier): {
+                    field: getattr(vehicle, field) for field in vehicle.FIELDS
+                }
+                for identifier, vehicle in self.vehicles.items()
+            },
+            "site": {field: getattr(self.site, field) for field in Site.FIELDS},
+        }
+
+    def restore(self, data: Mapping[str, Any]) -> None:
+        """
+        Restore a state returned by as_dict, unknown fields are skipped.
+
+        Invalid identifiers are skipped as well and the restored load points
+        and vehicles share the registry size with the ones from MQTT.
+        """
+        now = time.monotonic()
+        for index, fields in data.get("loadpoints", {}).items():
+            identifier = _parse_identifier(str(index))
+            if identifier is None:
+                continue
+            loadpoint = self.loadpoints.get(identifier)
+            if loadpoint is None:
+                if not self._make_room("loadpoints", now):
+                    continue
+                loadpoint = self.loadpoints[identifier] = LoadPoint()
+            _restore_fields(loadpoint, fields)
+            loadpoint.seen = now
+        for index, fields in data.get("vehicles", {}).items():
+            identifier = _parse_identifier(str(index))
+            if identifier is None:
+                continue
+            vehicle = self.vehicles.get(identifier)
+            if vehicle is None:
+                if not self._make_room("vehicles", now):
+                    continue
+                vehicle = self.vehicles[identifier] = Vehicle()
+            _restore_fields(vehicle, fields)
+            vehicle.seen = now
+        self._index_vehicles()
+        # The derived attributes are part of the snapshot, nothing changed.
+        self.pop_changes()
+        _restore_fields(self.site, data.get("site", {}))
+
+    def _compile_route(self, topic: str, now: float) -> TopicRoute | None:  # noqa: PLR0911, PLR0912
+        """
+        Parse and cache the route used for all later messages of a topic.
+
+        None is returned for ignored topics. The topics of a new load point or
+        vehicle are not cached while its registry is full, see _make_room.
+        """
+        if not topic.startswith(self._prefix):
+            return self._cache(topic, None)
+        parts = topic[len(self._prefix) :].split("/", 2)
+        if parts[0] == "site":
+            return self._cache(topic, self._compile_site_route(parts))
+        if len(parts) < 3 or (identifier := _parse_identifier(parts[1])) is None:
+            return self._cache(topic, None)
+        kind, _, suffix = parts
+        target: LoadPoint | Vehicle | None
+        on_change: Callable[[int, str], None] | None = None
+        if kind == "loadpoints":
+            field = LOADPOINT_FIELDS.get(suffix)
+            if field is None:
+                return self._cache(topic, None)
+            target = self.loadpoints.get(identifier)
+            if target is None:
+                if not self._make_room(kind, now):
+                    return None
+                target = self.loadpoints[identifier] = LoadPoint()
+                target.seen = now
+                if self.new_loadpoint_callback is not None:
+                    self.new_loadpoint_callback(identifier)
+            if field[0] in _LOADPOINT_LINK_INPUTS:
+                on_change = self._loadpoint_changed
+        elif kind == "vehicle":
+            field = VEHICLE_FIELDS.get(suffix)
+            if field is None:
+                return self._cache(topic, None)
+            kind = "vehicles"
+            target = self.vehicles.get(identifier)
+            if target is None:
+                if not self._make_room(kind, now):
+                    return None
+                target = self.vehicles[identifier] = Vehicle()
+                target.seen = now
+                if self.new_vehicle_callback is not None:
+                    self.new_vehicle_callback(identifier)
+            if field[0] in _VEHICLE_LINK_INPUTS:
+                on_change = self._vehicle_changed
+        else:
+            return self._cache(topic, None)
+        attribute, convert = field
+        bit = 1 << target.FIELDS.index(attribute)
+        windows = (
+            self._rolling.get((identifier, attribute)) if kind == "loadpoints" else None
+        )
+        return self._cache(
+            topic,
+            TopicRoute(
+                (kind, identifier),
+                target,
+                attribute,
+                convert,
+                bit,
+                rolling=tuple(windows.values()) if windows else (),
+                on_change=on_change,
+            ),
+        )
+
+    def _cache(self, topic: str, route: TopicRoute | None) -> TopicRoute | None:
+        """Cache the route of a topic, up to MAX_IGNORED_TOPICS ignored ones."""
+        if route is not None:
+            self._routes[topic] = route
+        elif self._ignored_topics < MAX_IGNORED_TOPICS:
+            self._ignored_topics += 1
+            self._routes[topic] = None
+        return route
+
+    def _make_room(self, kind: str, now: float) -> bool:
+        """
+        Return whether another load point or vehicle fits into its registry.
+
+        While the registry is full, the one seen least recently is evicted if
+        it was silent for STALE_AFTER seconds. Otherwise there is no room and
+        the topics of the new one are ignored until there is.
+        """
+        registry: dict[int, LoadPoint] | dict[int, Vehicle] = (
+            self.loadpoints if kind == "loadpoints" else self.vehicles
+        )
+        size = self.registry_size
+        while size is not None and len(registry) >= size:
+            identifier = min(registry, key=lambda i: registry[i].seen)
+            silent = now - registry[identifier].seen
+            if silent < STALE_AFTER:
+                _LOGGER.debug("No room for another of the %d %s", size, kind)
+                return False
+            _LOGGER.info("Evicting %s %d, silent for %.0f s", kind, identifier, silent)
+            self._evict(kind, identifier)
+        return True
+
+    def _evict(self, kind: str, identifier: int) -> None:
+        """Drop a load point or vehicle with its routes and derived links."""
+        key = (kind, identifier)
+        for topic in [
+            topic
+            for topic, route in self._routes.items()
+            if route is not None and route.key == key
+        ]:
+            del self._routes[topic]
+            self._payloads.pop(topic, None)
+        self._dirty.pop(key, None)
+        if kind == "loadpoints":
+            del self.loadpoints[identifier]
+            for rolling_key in [k for k in self._rolling if k[0] == identifier]:
+                del self._rolling[rolling_key]
+            for users_key in [k for k in self._rolling_users if k[0] == identifier]:
+                del self._rolling_users[users_key]
+            vehicle_id = self.loadpoint_vehicles.pop(identifier, None)
+            if vehicle_id is not None:
+                vehicle = self.vehicles[vehicle_id]
+                self._set_derived("vehicles", vehicle_id, vehicle, "loadpoint", None)
+                self._set_derived("vehicles", vehicle_id, vehicle, "soc", None)
+            removed_callback = self.removed_loadpoint_callback
+        else:
+            del self.vehicles[identifier]
+            unlinked = [
+                loadpoint_id
+                for loadpoint_id, vehicle_id in self.loadpoint_vehicles.items()
+                if vehicle_id == identifier
+            ]
+            for loadpoint_id in unlinked:
+                del self.loadpoint_vehicles[loadpoint_id]
+            self._index_vehicles()
+            for loadpoint_id in unlinked:
+                self._update_energy_to_limit(loadpoint_id)
+            removed_callback = self.removed_vehicle_callback
+        if removed_callback is not None:
+            removed_callback(identifier)
 
-    async def message_received(self, msg: ReceiveMessage) -> None:
-        """Handle evcc mqtt messages."""
-        _LOGGER.debug("New message: %s=%s", msg.topic, msg.payload)
-        parts = msg.topic.split("/")
-        if len(parts) > 3:
-            if parts[1] == "loadpoints":
-                identifier = int(parts[2])
-                loadpoint = self.loadpoints.get(identifier)
-                if loadpoint is None:
-                    loadpoint = LoadPoint()
-                    self.loadpoints[identifier] = loadpoint
-                if parts[3] == "chargedEnergy":
-                    loadpoint.chargedEnergy = float(msg.payload)
-                elif parts[3] == "chargePower":
-                    loadpoint.chargePower = float(msg.payload)
-                elif parts[3] == "title":
-                    loadpoint.title = str(msg.payload)
-                elif parts[3] == "chargeTotalImport":
-                    loadpoint.totalChargedEnergy = float(msg.payload)
-                elif parts[3] == "chargeDuration":
-                    loadpoint.chargeDuration = float(msg.payload)
-                elif parts[3] == "chargeRemainingDuration":
-                    loadpoint.chargeRemainingDuration = float(msg.payload)
-                elif parts[3] == "chargeRemainingEnergy":
-                    loadpoint.chargeRemainingEnergy = float(msg.payload)
-                elif parts[3] == "vehicleSoc":
-                    loadpoint.vehicleSoc = float(msg.payload)
-                elif parts[3] == "vehicleLimitSoc":
-                    loadpoint.vehicleLimitSoc = float(msg.payload)
-                elif parts[3] == "vehicleRange":
-                    loadpoint.vehicleRange = float(msg.payload)
-                elif parts[3] == "phasesActive":
-                    loadpoint.phasesActive = int(msg.payload)
-                elif parts[3] == "chargeCurrents" and len(parts) > 4:
-                    if parts[4] == "l1":
-                        loadpoint.currentPhase1 = float(msg.payload)
-                    elif parts[4] == "l2":
-                        loadpoint.currentPhase2 = float(msg.payload)
-                    elif parts[4] == "l3":
-                        loadpoint.currentPhase3 = float(msg.payload)
-            elif parts[1] == "vehicle":
-                identifier = int(parts[2])
-                vehicle = self.vehicles.get(identifier)
-                if vehicle is None:
-                    vehicle = Vehicle()
-                    self.vehicles[identifier] = vehicle
-                if parts[3] == "title":
-                    vehicle.title = str(msg.payload)
-                elif parts[3] == "capacity":
-                    vehicle.capacity = float(msg.payload)
-                elif parts[3] == "title":
-                    vehicle.title = str(msg.payload)
+    def _compile_site_route(self, parts: list[str]) -> TopicRoute | None:
+        """Parse the parts of a "<topic>/site/<field>" topic into a route."""
+        if len(parts) != 2:
+            return None
+        field = SITE_FIELDS.get(parts[1])
+        if field is None:
+            return None
+        attribute, convert = field
+        bit = 1 << Site.FIELDS.index(attribute)
+        return TopicRoute(
+            SITE_KEY,
+            self.site,
+            attribute,
+            convert,
+            bit,
+            aggregate=self.site_aggregation is not None,
+        )
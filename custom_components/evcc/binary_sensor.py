@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import (
@@ -9,53 +10,119 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .entity import EvccEntity
+from .const import SIGNAL_NEW_LOADPOINT
+from .entity import EvccLoadPointEntity
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import EvccApiClient, LoadPoint
     from .coordinator import EvccDataUpdateCoordinator
     from .data import EvccConfigEntry
 
+
+@dataclass(kw_only=True, frozen=True)
+class EvccLoadpointBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes Evcc binary sensor entity."""
+
+    value_fn: Callable[[LoadPoint], bool]
+    # LoadPoint attribute read by value_fn, the entity updates when it changes.
+    field: str
+
+
+CONNECTED = "hass_evcc_connected"
+CHARGING = "hass_evcc_charging"
+CHARGER_ENABLED = "hass_evcc_charger_enabled"
+
 ENTITY_DESCRIPTIONS = (
-    BinarySensorEntityDescription(
-        key="hass_evcc",
-        name="Integration Blueprint Binary Sensor",
-        device_class=BinarySensorDeviceClass.CONNECTIVITY,
+    EvccLoadpointBinarySensorEntityDescription(
+        key=CONNECTED,
+        name="Vehicle Connected",
+        icon="mdi:ev-plug-type2",
+        translation_key=CONNECTED,
+        device_class=BinarySensorDeviceClass.PLUG,
+        value_fn=lambda loadpoint: loadpoint.connected,
+        field="connected",
+    ),
+    EvccLoadpointBinarySensorEntityDescription(
+        key=CHARGING,
+        name="Charging",
+        icon="mdi:ev-station",
+        translation_key=CHARGING,
+        device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
+        value_fn=lambda loadpoint: loadpoint.charging,
+        field="charging",
+    ),
+    EvccLoadpointBinarySensorEntityDescription(
+        key=CHARGER_ENABLED,
+        name="Charger Enabled",
+        icon="mdi:power-plug-outline",
+        translation_key=CHARGER_ENABLED,
+        value_fn=lambda loadpoint: loadpoint.enabled,
+        field="enabled",
     ),
 )
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: EvccConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary_sensor platform."""
-    async_add_entities(
-        IntegrationBlueprintBinarySensor(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
+
+    @callback
+    def async_add_loadpoint(loadpoint_id: int) -> None:
+        async_add_entities(
+            LoadpointEvccBinarySensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+        )
+
+    for loadpoint_id in entry.runtime_data.client.loadpoints:
+        async_add_loadpoint(loadpoint_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id), async_add_loadpoint
         )
-        for entity_description in ENTITY_DESCRIPTIONS
     )
 
 
-class IntegrationBlueprintBinarySensor(EvccEntity, BinarySensorEntity):
+class LoadpointEvccBinarySensor(EvccLoadPointEntity, BinarySensorEntity):
     """hass_evcc binary_sensor class."""
 
     def __init__(
         self,
         coordinator: EvccDataUpdateCoordinator,
-        entity_description: BinarySensorEntityDescription,
+        client: EvccApiClient,
+        entity_description: EvccLoadpointBinarySensorEntityDescription,
+        loadpoint_id: int,
     ) -> None:
         """Initialize the binary_sensor class."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            client,
+            entity_description.key,
+            loadpoint_id,
+            entity_description.field,
+        )
         self.entity_description = entity_description
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the binary_sensor is on."""
-        return self.coordinator.data.get("title", "") == "foo"
+        return (
+            self.entity_description.value_fn(self.loadpoint)
+            if self.loadpoint is not None
+            else None
+        )
@@ -0,0 +1,137 @@
+"""Coalesced publishing of evcc commands for hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import mqtt
+from homeassistant.core import callback
+
+from .const import COMMAND_COALESCE_WINDOW, COMMAND_ECHO_TIMEOUT
+
+if TYPE_CHECKING:
+    from asyncio import TimerHandle
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+
+class EvccCommands:
+    """
+    Publish commands to the "<topic>/<path>/set" topics of evcc.
+
+    Commands sent within the coalescing window are collected and only the
+    last one per path is published, so dragging a slider floods neither the
+    broker nor the evcc control loop. The commanded value is shown
+    optimistically until evcc echoes it on the path, or until
+    COMMAND_ECHO_TIMEOUT passed without an echo, for example because evcc
+    rejected the value.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        coalesce_window: float = COMMAND_COALESCE_WINDOW,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._topic = topic
+        self.coalesce_window = coalesce_window
+        # Payloads published with the next flush, by path.
+        self._pending: dict[str, str] = {}
+        # Commanded values evcc did not echo yet, by path.
+        self._expected: dict[str, Any] = {}
+        # Echo timeouts and the callbacks writing the state, by path. Several
+        # entities may command the same path, like the mode select and switch.
+        self._timeouts: dict[str, TimerHandle] = {}
+        self._listeners: dict[str, set[Callable[[], None]]] = {}
+        self._flush_handle: TimerHandle | None = None
+        # Commands sent by entities and published to the broker.
+        self.sent = 0
+        self.published = 0
+
+    def value(self, path: str, actual: Any) -> Any:
+        """Return the commanded value of path, actual if there is none."""
+        return self._expected.get(path, actual)
+
+    @callback
+    def async_send(
+        self, path: str, value: Any, payload: str, listener: Callable[[], None]
+    ) -> None:
+        """
+        Command evcc to set path to value, published as payload.
+
+        listener writes the state of the commanding entity. It is called
+        right away together with the listeners of the earlier commands of
+        path, so all of them show value, and again when the commanded value
+        is dropped without an echo.
+        """
+        self._pending[path] = payload
+        self._expected[path] = value
+        listeners = self._listeners.setdefault(path, set())
+        listeners.add(listener)
+        self._async_cancel_timeout(path)
+        self.sent += 1
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                self.coalesce_window, self._async_flush
+            )
+        for path_listener in listeners:
+            path_listener()
+
+    @callback
+    def async_reconcile(self, path: str, actual: Any) -> None:
+        """Drop the commanded value of path once evcc reported it."""
+        if path in self._expected and self._expected[path] == actual:
+            del self._expected[path]
+            del self._listeners[path]
+            self._async_cancel_timeout(path)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Publish the pending commands now and drop the commanded values."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._async_flush()
+        for handle in self._timeouts.values():
+            handle.cancel()
+        self._timeouts.clear()
+        self._expected.clear()
+        self._listeners.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "sent": self.sent,
+            "published": self.published,
+            "awaiting_echo": sorted(self._expected),
+        }
+
+    @callback
+    def _async_flush(self) -> None:
+        """Publish the last command of each path."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for path, payload in pending.items():
+            self.published += 1
+            self._timeouts[path] = self.hass.loop.call_later(
+                COMMAND_ECHO_TIMEOUT, self._async_timeout, path
+            )
+            self.hass.async_create_task(
+                mqtt.async_publish(self.hass, f"{self._topic}/{path}/set", payload),
+                f"evcc command {path}",
+            )
+
+    @callback
+    def _async_timeout(self, path: str) -> None:
+        """Fall back to the state reported by evcc."""
+        del self._timeouts[path]
+        self._expected.pop(path, None)
+        for listener in self._listeners.pop(path, ()):
+            listener()
+
+    @callback
+    def _async_cancel_timeout(self, path: str) -> None:
+        if (handle := self._timeouts.pop(path, None)) is not None:
+            handle.cancel()
@@ -4,10 +4,31 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
-from .const import CONF_TOPIC, DOMAIN
+from .api import SITE_AGGREGATION_LAST, SITE_AGGREGATION_MEAN
+from .const import (
+    CONF_COALESCE_WINDOW,
+    CONF_INSTRUMENTATION,
+    CONF_MESSAGE_BUFFER_SIZE,
+    CONF_PUBLISH_FILTERS,
+    CONF_REGISTRY_SIZE,
+    CONF_REST_URL,
+    CONF_SITE_AGGREGATION,
+    CONF_SITE_INTERVAL,
+    CONF_TOPIC,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_MESSAGE_BUFFER_SIZE,
+    DEFAULT_REGISTRY_SIZE,
+    DEFAULT_SITE_AGGREGATION,
+    DEFAULT_SITE_INTERVAL,
+    DOMAIN,
+)
+from .filters import PublishFilter
+from .sensor import FILTERED_DESCRIPTIONS
+
+CONF_SENSOR = "sensor"
 
 
 class EvccFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -15,6 +36,14 @@ class EvccFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> EvccOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return EvccOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -43,3 +72,201 @@ class EvccFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=_errors,
         )
+
+
+class EvccOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for evcc."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        # Description key of the sensor whose publish filter is edited.
+        self._sensor: str | None = None
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,  # noqa: ARG002
+    ) -> data_entry_flow.FlowResult:
+        """Choose which options to manage."""
+        return self.async_show_menu(
+            step_id="init", menu_options=["settings", "publish_filter"]
+        )
+
+    async def async_step_settings(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the delivery options."""
+        if user_input is not None:
+            options = {**self.config_entry.options, **user_input}
+            if CONF_REST_URL not in user_input:
+                # The URL was cleared.
+                options.pop(CONF_REST_URL, None)
+            return self.async_create_entry(data=options)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        default=options.get(
+                            CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=10,
+                            step=0.05,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_INSTRUMENTATION,
+                        default=options.get(CONF_INSTRUMENTATION, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_MESSAGE_BUFFER_SIZE,
+                        default=options.get(
+                            CONF_MESSAGE_BUFFER_SIZE, DEFAULT_MESSAGE_BUFFER_SIZE
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=10000,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_SITE_INTERVAL,
+                        default=options.get(CONF_SITE_INTERVAL, DEFAULT_SITE_INTERVAL),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=300,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_SITE_AGGREGATION,
+                        default=options.get(
+                            CONF_SITE_AGGREGATION, DEFAULT_SITE_AGGREGATION
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[SITE_AGGREGATION_MEAN, SITE_AGGREGATION_LAST],
+                            translation_key=CONF_SITE_AGGREGATION,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_REGISTRY_SIZE,
+                        default=options.get(CONF_REGISTRY_SIZE, DEFAULT_REGISTRY_SIZE),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=1000,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_REST_URL,
+                        description={"suggested_value": options.get(CONF_REST_URL)},
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.URL,
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_publish_filter(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Choose the sensor whose deadband and rate limit are edited."""
+        if user_input is not None:
+            self._sensor = user_input[CONF_SENSOR]
+            return await self.async_step_publish_filter_settings()
+
+        return self.async_show_form(
+            step_id="publish_filter",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_SENSOR): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=key, label=str(description.name)
+                                )
+                                for key, description in FILTERED_DESCRIPTIONS.items()
+                            ],
+                        ),
+                    ),
+                },
+            ),
+        )
+
+    async def async_step_publish_filter_settings(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the deadband and rate limit of the chosen sensor."""
+        sensor = self._sensor
+        if sensor is None:
+            return self.async_abort(reason="unknown")
+        publish_filters = self.config_entry.options.get(CONF_PUBLISH_FILTERS, {})
+        if user_input is not None:
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    CONF_PUBLISH_FILTERS: {
+                        **publish_filters,
+                        sensor: PublishFilter.from_dict(user_input).as_dict(),
+                    },
+                }
+            )
+
+        if (stored := publish_filters.get(sensor)) is not None:
+            publish_filter = PublishFilter.from_dict(stored)
+        else:
+            publish_filter = FILTERED_DESCRIPTIONS[sensor].publish_filter
+        return self.async_show_form(
+            step_id="publish_filter_settings",
+            description_placeholders={
+                "sensor": str(FILTERED_DESCRIPTIONS[sensor].name)
+            },
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        "deadband", default=publish_filter.deadband
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100000,
+                            step="any",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        "relative", default=publish_filter.relative
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        "min_interval", default=publish_filter.min_interval
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=3600,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+        )
@@ -8,3 +8,66 @@ DOMAIN = "evcc"
 ATTRIBUTION = "Data provided by http://jsonplaceholder.typicode.com/"
 
 CONF_TOPIC = "Topic"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_INSTRUMENTATION = "instrumentation"
+CONF_MESSAGE_BUFFER_SIZE = "message_buffer_size"
+CONF_SITE_INTERVAL = "site_interval"
+CONF_SITE_AGGREGATION = "site_aggregation"
+# Base URL of the evcc REST API the state is loaded from at startup, empty
+# waits for the retained MQTT messages only.
+CONF_REST_URL = "rest_url"
+# Deadband and rate limit per sensor description key, see PublishFilter.
+CONF_PUBLISH_FILTERS = "publish_filters"
+CONF_REGISTRY_SIZE = "registry_size"
+
+# Seconds to collect MQTT updates before entities are notified.
+DEFAULT_COALESCE_WINDOW = 0.25
+
+# Seconds to collect commands to the same evcc setting before the last one is
+# published.
+COMMAND_COALESCE_WINDOW = 0.5
+
+# Seconds a commanded value is shown while evcc did not echo it.
+COMMAND_ECHO_TIMEOUT = 10
+
+# Number of raw messages kept for the diagnostics, 0 disables the buffer.
+DEFAULT_MESSAGE_BUFFER_SIZE = 200
+
+# Seconds over which the high-frequency site values are aggregated into one
+# update, 0 applies every message.
+DEFAULT_SITE_INTERVAL = 10
+DEFAULT_SITE_AGGREGATION = "mean"
+
+# Maximum number of load points and of vehicles of an evcc instance, a new
+# one beyond evicts the one silent for the longest time, see STALE_AFTER.
+DEFAULT_REGISTRY_SIZE = 16
+
+# Dispatcher signal sent with the identifier of a newly seen load point,
+# formatted with the config entry id.
+SIGNAL_NEW_LOADPOINT = "evcc_new_loadpoint_{}"
+
+# Dispatcher signal sent when a load point was evicted, formatted with the
+# config entry id and the load point id.
+SIGNAL_REMOVED_LOADPOINT = "evcc_removed_loadpoint_{}_{}"
+
+# Dispatcher signal sent after the options changed, formatted with the config
+# entry id.
+SIGNAL_OPTIONS_UPDATED = "evcc_options_updated_{}"
+
+# Dispatcher signal sent with the identifier of a newly seen vehicle,
+# formatted with the config entry id.
+SIGNAL_NEW_VEHICLE = "evcc_new_vehicle_{}"
+
+# Dispatcher signal sent when a vehicle was evicted, formatted with the config
+# entry id and the vehicle id.
+SIGNAL_REMOVED_VEHICLE = "evcc_removed_vehicle_{}_{}"
+
+# Dispatcher signal sent after a charging session was logged or the month
+# changed, formatted with the config entry id.
+SIGNAL_SESSIONS_UPDATED = "evcc_sessions_updated_{}"
+
+# Topic pattern below the evcc topic used to discover load points.
+LOADPOINT_DISCOVERY_TOPIC = "loadpoints/+/title"
+
+# Topic pattern below the evcc topic used to discover vehicles.
+VEHICLE_DISCOVERY_TOPIC = "vehicle/+/title"
@@ -2,35 +2,120 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN, LOGGER
+from .const import DEFAULT_COALESCE_WINDOW, DOMAIN, LOGGER
 
 if TYPE_CHECKING:
+    from asyncio import TimerHandle
+
     from homeassistant.core import HomeAssistant
 
     from .data import EvccConfigEntry
+    from .instrumentation import EvccInstrumentation
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class EvccDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """
+    Class to push MQTT updates to the entities.
+
+    There is no polling: the MQTT ingest path calls async_schedule_update and
+    all updates received within the coalescing window are handed to the
+    entities as a single coordinator update. Entities registered with a
+    (registry, identifier, attribute) context are only notified when that
+    attribute changed.
+    """
 
     config_entry: EvccConfigEntry
 
-    def __init__(self, hass: HomeAssistant, topic: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        instrumentation: EvccInstrumentation | None = None,
+    ) -> None:
         """Initialize."""
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=10),
+            update_interval=None,
         )
         self.topic = topic
+        self.coalesce_window = coalesce_window
+        self.instrumentation = instrumentation
+        self._created = time.perf_counter()
+        # Milliseconds from setup until the entities had a valid state.
+        self.time_to_first_state: float | None = None
+        self._flush_handle: TimerHandle | None = None
+        # Changes of the running flush, None notifies all listeners.
+        self._changes: set[tuple[str, int, str]] | None = None
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
-        return {"loadpoints": self.config_entry.runtime_data.client.loadpoints}
+        client = self.config_entry.runtime_data.client
+        return {
+            "loadpoints": client.loadpoints,
+            "vehicles": client.vehicles,
+            "site": client.site,
+        }
+
+    @callback
+    def async_schedule_update(self) -> None:
+        """Notify the entities once the coalescing window has passed."""
+        if self._flush_handle is None and not self._shutdown_requested:
+            self._flush_handle = self.hass.loop.call_later(
+                self.coalesce_window, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self) -> None:
+        """Hand the updates collected in the coalescing window to the entities."""
+        self._flush_handle = None
+        client = self.config_entry.runtime_data.client
+        changes = client.pop_changes()
+        if not changes:
+            return
+        self._changes = changes
+        start = time.perf_counter()
+        try:
+            self.async_set_updated_data(
+                {
+                    "loadpoints": client.loadpoints,
+                    "vehicles": client.vehicles,
+                    "site": client.site,
+                }
+            )
+        finally:
+            self._changes = None
+        if self.instrumentation is not None:
+            self.instrumentation.record_flush(len(changes), time.perf_counter() - start)
+        self.async_record_first_state()
+
+    @callback
+    def async_record_first_state(self) -> None:
+        """Record the time until the first valid state, restored or received."""
+        if self.time_to_first_state is None:
+            self.time_to_first_state = (time.perf_counter() - self._created) * 1000
+            LOGGER.debug("First valid state after %.0f ms", self.time_to_first_state)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose context changed."""
+        changes = self._changes
+        for update_callback, context in list(self._listeners.values()):
+            if changes is None or context is None or context in changes:
+                update_callback()
+
+    async def async_shutdown(self) -> None:
+        """Cancel a pending flush and ignore further updates."""
+        await super().async_shutdown()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
+    from homeassistant.core import CALLBACK_TYPE
     from homeassistant.loader import Integration
 
     from .api import EvccApiClient
+    from .commands import EvccCommands
     from .coordinator import EvccDataUpdateCoordinator
+    from .devices import EvccDevices
+    from .energy import EvccEnergyStatistics
+    from .instrumentation import EvccInstrumentation
+    from .sessions import EvccSessionTracker
+    from .snapshot import EvccSnapshot
+    from .subscriptions import EvccSubscriptions
 
 
 type EvccConfigEntry = ConfigEntry[EvccData]
@@ -23,3 +32,15 @@ class EvccData:
     client: EvccApiClient
     coordinator: EvccDataUpdateCoordinator
     integration: Integration
+    subscriptions: EvccSubscriptions
+    instrumentation: EvccInstrumentation | None
+    snapshot: EvccSnapshot
+    commands: EvccCommands
+    devices: EvccDevices
+    sessions: EvccSessionTracker
+    # Platforms forwarded or being forwarded to.
+    platforms: set[Platform] = field(default_factory=set)
+    # Long-term energy statistics, None without the recorder.
+    energy: EvccEnergyStatistics | None = None
+    # Stops the timer of the site aggregation, None while it is disabled.
+    cancel_site_aggregation: CALLBACK_TYPE | None = None
@@ -0,0 +1,154 @@
+"""Devices for hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN, SIGNAL_REMOVED_LOADPOINT, SIGNAL_REMOVED_VEHICLE
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .api import EvccApiClient
+    from .coordinator import EvccDataUpdateCoordinator
+
+MANUFACTURER = "EVCC"
+
+
+class EvccDevices:
+    """
+    Device metadata of the site, load points and vehicles of a config entry.
+
+    The DeviceInfo of a load point or vehicle is built once and shared by
+    all its entities. A listener on the title of each one renames its device
+    in the device registry when evcc publishes a new title, the entities
+    are not involved. The entities of an evicted load point or vehicle are
+    removed from hass, but its device and entity registry entries are kept,
+    so the entities come back with the changes of the user when evcc reports
+    it again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        client: EvccApiClient,
+        coordinator: EvccDataUpdateCoordinator,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._client = client
+        self._coordinator = coordinator
+        self.site = DeviceInfo(
+            name="evcc",
+            identifiers={(entry_id, DOMAIN)},
+            manufacturer=MANUFACTURER,
+        )
+        self._loadpoints: dict[int, DeviceInfo] = {}
+        self._vehicles: dict[int, DeviceInfo] = {}
+        # Removes the title listener per load point and vehicle.
+        self._remove_listeners: dict[tuple[str, int], CALLBACK_TYPE] = {}
+
+    @callback
+    def loadpoint(self, loadpoint_id: int) -> DeviceInfo:
+        """Return the DeviceInfo of a load point."""
+        if (device_info := self._loadpoints.get(loadpoint_id)) is None:
+            device_info = self._loadpoints[loadpoint_id] = self._loadpoint_info(
+                loadpoint_id
+            )
+            self._remove_listeners[("loadpoints", loadpoint_id)] = (
+                self._coordinator.async_add_listener(
+                    lambda: self._async_loadpoint_title_changed(loadpoint_id),
+                    ("loadpoints", loadpoint_id, "title"),
+                )
+            )
+        return device_info
+
+    @callback
+    def vehicle(self, vehicle_id: int) -> DeviceInfo:
+        """Return the DeviceInfo of a vehicle."""
+        if (device_info := self._vehicles.get(vehicle_id)) is None:
+            device_info = self._vehicles[vehicle_id] = self._vehicle_info(vehicle_id)
+            self._remove_listeners[("vehicles", vehicle_id)] = (
+                self._coordinator.async_add_listener(
+                    lambda: self._async_vehicle_title_changed(vehicle_id),
+                    ("vehicles", vehicle_id, "title"),
+                )
+            )
+        return device_info
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop following the titles."""
+        for remove_listener in self._remove_listeners.values():
+            remove_listener()
+        self._remove_listeners.clear()
+
+    @callback
+    def async_remove_loadpoint(self, loadpoint_id: int) -> None:
+        """Remove the entities of an evicted load point."""
+        self._loadpoints.pop(loadpoint_id, None)
+        self._async_remove(
+            ("loadpoints", loadpoint_id),
+            SIGNAL_REMOVED_LOADPOINT.format(self._entry_id, loadpoint_id),
+        )
+
+    @callback
+    def async_remove_vehicle(self, vehicle_id: int) -> None:
+        """Remove the entities of an evicted vehicle."""
+        self._vehicles.pop(vehicle_id, None)
+        self._async_remove(
+            ("vehicles", vehicle_id),
+            SIGNAL_REMOVED_VEHICLE.format(self._entry_id, vehicle_id),
+        )
+
+    def _loadpoint_info(self, loadpoint_id: int) -> DeviceInfo:
+        loadpoint = self._client.loadpoints.get(loadpoint_id)
+        title = loadpoint.title if loadpoint is not None else ""
+        return DeviceInfo(
+            name=f"Load point {title or loadpoint_id}",
+            identifiers={(f"{self._entry_id}_lp_{loadpoint_id}", DOMAIN)},
+            manufacturer=MANUFACTURER,
+        )
+
+    def _vehicle_info(self, vehicle_id: int) -> DeviceInfo:
+        vehicle = self._client.vehicles.get(vehicle_id)
+        title = vehicle.title if vehicle is not None else ""
+        return DeviceInfo(
+            name=f"Vehicle {title or vehicle_id}",
+            identifiers={(f"{self._entry_id}_vehicle_{vehicle_id}", DOMAIN)},
+            manufacturer=MANUFACTURER,
+        )
+
+    @callback
+    def _async_loadpoint_title_changed(self, loadpoint_id: int) -> None:
+        device_info = self._loadpoints[loadpoint_id] = self._loadpoint_info(
+            loadpoint_id
+        )
+        self._async_rename(device_info)
+
+    @callback
+    def _async_vehicle_title_changed(self, vehicle_id: int) -> None:
+        device_info = self._vehicles[vehicle_id] = self._vehicle_info(vehicle_id)
+        self._async_rename(device_info)
+
+    @callback
+    def _async_remove(self, key: tuple[str, int], signal: str) -> None:
+        """Stop following the title and signal the entities to remove."""
+        if (remove_listener := self._remove_listeners.pop(key, None)) is not None:
+            remove_listener()
+        async_dispatcher_send(self.hass, signal)
+
+    @callback
+    def _async_rename(self, device_info: DeviceInfo) -> None:
+        """Rename the registered device, a name set by the user is kept."""
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(identifiers=device_info["identifiers"])
+        if device is not None and device.name != device_info["name"]:
+            registry.async_update_device(device.id, name=device_info["name"])
@@ -0,0 +1,39 @@
+"""Diagnostics support for hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .subscriptions import async_get_router
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EvccConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: EvccConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    instrumentation = runtime_data.instrumentation
+    message_buffer = runtime_data.client.message_buffer
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "subscriptions": runtime_data.subscriptions.topics,
+        "mqtt_subscriptions": async_get_router(hass).topics,
+        "mqtt_callbacks": async_get_router(hass).callback_count,
+        "loadpoints": sorted(runtime_data.client.loadpoints),
+        "vehicles": sorted(runtime_data.client.vehicles),
+        "time_to_first_state_ms": runtime_data.coordinator.time_to_first_state,
+        "received_messages": runtime_data.client.received_messages,
+        "duplicate_messages": runtime_data.client.duplicate_messages,
+        "commands": runtime_data.commands.as_dict(),
+        "instrumentation": (
+            instrumentation.as_dict() if instrumentation is not None else None
+        ),
+        "messages": (message_buffer.as_list() if message_buffer is not None else None),
+    }
@@ -0,0 +1,217 @@
+"""Long-term energy statistics for hass_evcc."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .api import EvccApiClient
+
+HOUR = 3600
+
+# LoadPoint attribute the energy is computed from, evcc's chargeTotalImport
+# in kWh.
+ENERGY_FIELD = "totalChargedEnergy"
+
+
+class HourlyEnergy:
+    """
+    Hourly energy of a load point from the deltas of its meter total.
+
+    A delta is spread linearly over the time since the previous reading, so
+    readings minutes or hours apart still land in the right hours. A total
+    lower than the previous one is a meter reset and starts over from it.
+    """
+
+    __slots__ = ("_buckets", "_time", "_total", "sum")
+
+    def __init__(
+        self, total: float | None = None, time: float = 0.0, sum_: float = 0.0
+    ) -> None:
+        """Continue from the meter total in kWh at the unix time and the sum."""
+        self._total = total
+        self._time = time
+        # Energy in kWh of the hours which were not popped, by their start.
+        self._buckets: dict[int, float] = {}
+        # Energy in kWh of all popped hours.
+        self.sum = sum_
+
+    def add(self, total: float, now: float) -> None:
+        """Add the meter total in kWh read at the unix time now."""
+        last, since = self._total, self._time
+        self._total, self._time = total, now
+        if last is None or total <= last:
+            return
+        delta = total - last
+        buckets = self._buckets
+        if now <= since:
+            hour = int(now - now % HOUR)
+            buckets[hour] = buckets.get(hour, 0.0) + delta
+            return
+        hour = int(since - since % HOUR)
+        while hour < now:
+            share = (min(hour + HOUR, now) - max(hour, since)) / (now - since)
+            buckets[hour] = buckets.get(hour, 0.0) + delta * share
+            hour += HOUR
+
+    def pop_completed(self, now: float) -> list[tuple[int, float, float]]:
+        """
+        Return the hours which ended before now.
+
+        Each hour is returned as its start, the meter total at its end and
+        the sum up to its end, all energies in kWh.
+        """
+        current = now - now % HOUR
+        completed = sorted(hour for hour in self._buckets if hour < current)
+        if not completed:
+            return []
+        # The total at the end of an hour excludes the energy of later hours.
+        later = sum(energy for hour, energy in self._buckets.items() if hour >= current)
+        ends = []
+        total = (self._total or 0.0) - later
+        for hour in reversed(completed):
+            ends.append(total)
+            total -= self._buckets[hour]
+        rows = []
+        for hour, end in zip(completed, reversed(ends), strict=True):
+            self.sum += self._buckets.pop(hour)
+            rows.append((hour, end, self.sum))
+        return rows
+
+
+def statistic_id(entry_id: str, loadpoint_id: int) -> str:
+    """Return the id of the external statistic of a load point."""
+    return f"{DOMAIN}:{entry_id.lower()}_loadpoint_{loadpoint_id}_charged_energy"
+
+
+class EvccEnergyStatistics:
+    """
+    Hourly charged energy of the load points as external statistics.
+
+    The energy is computed from the chargeTotalImport deltas and every
+    completed hour is added to the long-term statistics, the recorder
+    derives the daily and monthly ones. The energy dashboard keeps working
+    when the energy sensors are excluded from the recorder. After a restart
+    the meter total and the sum continue from the last statistic, the
+    energy charged meanwhile is spread over the time in between.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, client: EvccApiClient
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._client = client
+        self._energy: dict[int, HourlyEnergy] = {}
+        # Last reading per load point while its last statistic is loaded.
+        self._loading: dict[int, tuple[float, float]] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Add the completed hours shortly after every full hour."""
+        return async_track_utc_time_change(
+            self.hass, self._async_add_statistics, minute=0, second=10
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Add the hours completed since the last full hour."""
+        self._async_add_statistics(dt_util.utcnow())
+
+    @callback
+    def async_update(self) -> None:
+        """Read the meter totals, called after every flush."""
+        now = dt_util.utcnow().timestamp()
+        loadpoints = self._client.loadpoints
+        if len(self._energy) > len(loadpoints):
+            # Add the completed hours of evicted load points before dropping.
+            self._async_add_statistics(dt_util.utcnow())
+            for loadpoint_id in self._energy.keys() - loadpoints.keys():
+                del self._energy[loadpoint_id]
+        for loadpoint_id, loadpoint in loadpoints.items():
+            total = getattr(loadpoint, ENERGY_FIELD)
+            if not total:
+                # Not published yet.
+                continue
+            if (energy := self._energy.get(loadpoint_id)) is not None:
+                energy.add(total, now)
+                continue
+            loading = loadpoint_id in self._loading
+            self._loading[loadpoint_id] = (total, now)
+            if not loading:
+                self.hass.async_create_task(
+                    self._async_load(loadpoint_id), "evcc load energy statistic"
+                )
+
+    async def _async_load(self, loadpoint_id: int) -> None:
+        """Continue from the last statistic of a load point."""
+        statistic = statistic_id(self._entry_id, loadpoint_id)
+        last = await get_instance(self.hass).async_add_executor_job(
+            partial(
+                get_last_statistics,
+                self.hass,
+                1,
+                statistic,
+                convert_units=False,
+                types={"state", "sum"},
+            )
+        )
+        if rows := last.get(statistic):
+            row = rows[0]
+            energy = HourlyEnergy(
+                row.get("state") or 0.0, row["start"] + HOUR, row.get("sum") or 0.0
+            )
+        else:
+            energy = HourlyEnergy()
+        if (reading := self._loading.pop(loadpoint_id, None)) is not None:
+            energy.add(*reading)
+        self._energy[loadpoint_id] = energy
+
+    @callback
+    def _async_add_statistics(self, now: datetime) -> None:
+        """Add the completed hours of all load points."""
+        timestamp = now.timestamp()
+        for loadpoint_id, energy in self._energy.items():
+            if not (rows := energy.pop_completed(timestamp)):
+                continue
+            loadpoint = self._client.loadpoints.get(loadpoint_id)
+            title = loadpoint.title if loadpoint is not None else None
+            metadata = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{title or f'Load point {loadpoint_id}'} charged energy",
+                source=DOMAIN,
+                statistic_id=statistic_id(self._entry_id, loadpoint_id),
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            )
+            async_add_external_statistics(
+                self.hass,
+                metadata,
+                [
+                    StatisticData(
+                        start=dt_util.utc_from_timestamp(hour),
+                        state=total,
+                        sum=energy_sum,
+                    )
+                    for hour, total, energy_sum in rows
+                ],
+            )
@@ -1,13 +1,24 @@
 """BlueprintEntity class."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from homeassistant.helpers.device_registry import DeviceInfo
+from typing import Any
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from custom_components.evcc.api import EvccApiClient, LoadPoint
+from custom_components.evcc.api import (
+    LOADPOINT_TOPICS,
+    SITE_KEY,
+    SITE_TOPICS,
+    EvccApiClient,
+    LoadPoint,
+    Site,
+    Vehicle,
+    loadpoint_patterns,
+    vehicle_patterns,
+)
 
-from .const import ATTRIBUTION, DOMAIN
+from .const import ATTRIBUTION, SIGNAL_REMOVED_LOADPOINT, SIGNAL_REMOVED_VEHICLE
 from .coordinator import EvccDataUpdateCoordinator
 
 
@@ -16,39 +27,197 @@ class EvccEntity(CoordinatorEntity[EvccDataUpdateCoordinator]):
 
     _attr_attribution = ATTRIBUTION
 
-    def __init__(self, coordinator: EvccDataUpdateCoordinator) -> None:
+    def __init__(
+        self, coordinator: EvccDataUpdateCoordinator, context: Any = None
+    ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
 
 
 class EvccLoadPointEntity(EvccEntity):
     """EvccLoadPointEntity class."""
 
+    # False for entities without field which write their state themselves.
+    _coordinator_updates = True
+
     def __init__(
         self,
         coordinator: EvccDataUpdateCoordinator,
         client: EvccApiClient,
         entity_type: str,
         loadpoint_id: int,
+        field: str | None = None,
     ) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+        """
+        Initialize.
+
+        If field is given, the entity is only updated when this LoadPoint
+        attribute changed and its topic is only subscribed while the entity is
+        enabled. Without field, the entity is updated on every change, or on
+        none if _coordinator_updates is False.
+        """
+        if field is not None:
+            context = ("loadpoints", loadpoint_id, field)
+        elif self._coordinator_updates:
+            context = None
+        else:
+            # Matches no change, the changed attribute is never None.
+            context = ("loadpoints", loadpoint_id, None)
+        super().__init__(coordinator, context)
+        self.field = field
         self.loadpoint_id = loadpoint_id
         self.client = client
-        unique_id = coordinator.config_entry.entry_id
-        self._attr_unique_id = f"{unique_id}_lp_{loadpoint_id}_{entity_type}"
+        entry = coordinator.config_entry
+        self._attr_unique_id = f"{entry.entry_id}_lp_{loadpoint_id}_{entity_type}"
+        self._attr_device_info = entry.runtime_data.devices.loadpoint(loadpoint_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the topic of the field when added to hass."""
+        await super().async_added_to_hass()
+        # Removed when the load point is evicted, the registry entry is kept.
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_REMOVED_LOADPOINT.format(
+                    self.coordinator.config_entry.entry_id, self.loadpoint_id
+                ),
+                self.async_remove,
+            )
+        )
+        if self.field is not None:
+            subscriptions = self.coordinator.config_entry.runtime_data.subscriptions
+            for pattern in loadpoint_patterns(self.field):
+                self.async_on_remove(subscriptions.async_acquire(pattern))
 
     @property
     def loadpoint(self) -> LoadPoint | None:
         """Get the assigned load point."""
         return self.client.loadpoints.get(self.loadpoint_id)
 
+
+class EvccLoadPointControlEntity(EvccLoadPointEntity):
+    """
+    Load point entity changing its field with evcc commands.
+
+    The commands are published through the EvccCommands of the entry, which
+    coalesces them and keeps the commanded value until evcc echoes it.
+    """
+
+    field: str
+
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return device specific attributes."""
-        unique_id = f"{self.coordinator.config_entry.entry_id}_lp_{self.loadpoint_id}"
-        return DeviceInfo(
-            name=f"Load point {self.loadpoint.title if self.loadpoint is not None else self.loadpoint_id}",
-            identifiers={(unique_id, DOMAIN)},
-            manufacturer="EVCC",
+    def command_path(self) -> str:
+        """Return the topic path below the evcc topic the field is set on."""
+        return f"loadpoints/{self.loadpoint_id}/{LOADPOINT_TOPICS[self.field]}"
+
+    @property
+    def field_value(self) -> Any:
+        """Return the commanded value of the field, else the one of evcc."""
+        if self.loadpoint is None:
+            return None
+        commands = self.coordinator.config_entry.runtime_data.commands
+        return commands.value(self.command_path, getattr(self.loadpoint, self.field))
+
+    @callback
+    def async_send_command(self, value: Any, payload: str) -> None:
+        """Command evcc to set the field and show the value right away."""
+        commands = self.coordinator.config_entry.runtime_data.commands
+        commands.async_send(
+            self.command_path, value, payload, self.async_write_ha_state
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Reconcile the commanded value with the one reported by evcc."""
+        if self.loadpoint is not None:
+            commands = self.coordinator.config_entry.runtime_data.commands
+            commands.async_reconcile(
+                self.command_path, getattr(self.loadpoint, self.field)
+            )
+        super()._handle_coordinator_update()
+
+
+class EvccSiteEntity(EvccEntity):
+    """EvccSiteEntity class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_type: str,
+        field: str,
+    ) -> None:
+        """
+        Initialize.
+
+        The entity is only updated when the Site attribute field changed and
+        its topic is only subscribed while the entity is enabled.
+        """
+        super().__init__(coordinator, (*SITE_KEY, field))
+        self.field = field
+        self.client = client
+        entry = coordinator.config_entry
+        self._attr_unique_id = f"{entry.entry_id}_site_{entity_type}"
+        self._attr_device_info = entry.runtime_data.devices.site
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the topic of the field when added to hass."""
+        await super().async_added_to_hass()
+        subscriptions = self.coordinator.config_entry.runtime_data.subscriptions
+        self.async_on_remove(
+            subscriptions.async_acquire(f"site/{SITE_TOPICS[self.field]}")
+        )
+
+    @property
+    def site(self) -> Site:
+        """Get the site."""
+        return self.client.site
+
+
+class EvccVehicleEntity(EvccEntity):
+    """EvccVehicleEntity class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_type: str,
+        vehicle_id: int,
+        field: str,
+    ) -> None:
+        """
+        Initialize.
+
+        The entity is only updated when the Vehicle attribute field changed and
+        the topics it is read from are only subscribed while the entity is
+        enabled.
+        """
+        super().__init__(coordinator, ("vehicles", vehicle_id, field))
+        self.field = field
+        self.vehicle_id = vehicle_id
+        self.client = client
+        entry = coordinator.config_entry
+        self._attr_unique_id = f"{entry.entry_id}_vehicle_{vehicle_id}_{entity_type}"
+        self._attr_device_info = entry.runtime_data.devices.vehicle(vehicle_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the topics of the field when added to hass."""
+        await super().async_added_to_hass()
+        # Removed when the vehicle is evicted, the registry entry is kept.
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_REMOVED_VEHICLE.format(
+                    self.coordinator.config_entry.entry_id, self.vehicle_id
+                ),
+                self.async_remove,
+            )
+        )
+        subscriptions = self.coordinator.config_entry.runtime_data.subscriptions
+        for pattern in vehicle_patterns(self.field):
+            self.async_on_remove(subscriptions.async_acquire(pattern))
+
+    @property
+    def vehicle(self) -> Vehicle | None:
+        """Get the assigned vehicle."""
+        return self.client.vehicles.get(self.vehicle_id)
@@ -0,0 +1,141 @@
+"""Deadband and rate limiting of sensor state writes for hass_evcc."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+# Seconds after which a value held back by the deadband is written anyway.
+DEADBAND_FLUSH_DELAY = 60
+
+
+@dataclass(frozen=True, slots=True)
+class PublishFilter:
+    """Significance and rate limit of the state writes of a sensor."""
+
+    # Changes smaller than this are held back, 0 writes every change.
+    deadband: float = 0
+    # The deadband is a fraction of the last written value.
+    relative: bool = False
+    # Minimum seconds between two state writes.
+    min_interval: float = 0
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PublishFilter:
+        """Create a filter from the options stored for a sensor."""
+        return cls(
+            deadband=float(data.get("deadband", 0)),
+            relative=bool(data.get("relative", False)),
+            min_interval=float(data.get("min_interval", 0)),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the filter as stored in the options."""
+        return {
+            "deadband": self.deadband,
+            "relative": self.relative,
+            "min_interval": self.min_interval,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the filter holds back any state write."""
+        return bool(self.deadband or self.min_interval)
+
+    def significant(self, written: Any, value: Any) -> bool:
+        """Return whether value differs enough from the written value."""
+        if not isinstance(value, int | float) or not isinstance(written, int | float):
+            return value != written
+        deadband = self.deadband * abs(written) if self.relative else self.deadband
+        return abs(value - written) >= deadband if deadband else value != written
+
+
+# Writes every change.
+NO_PUBLISH_FILTER = PublishFilter()
+
+
+class PublishLimiter:
+    """
+    Apply a PublishFilter to the state writes of an entity.
+
+    Values held back by the filter are not lost: a trailing write publishes
+    the latest value once the minimum interval has passed, or after
+    DEADBAND_FLUSH_DELAY for changes within the deadband.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        publish_filter: PublishFilter,
+        value_fn: Callable[[], Any],
+        write_fn: Callable[[], None],
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.publish_filter = publish_filter
+        self._value_fn = value_fn
+        self._write_fn = write_fn
+        self._written: Any = None
+        self._written_at = -float("inf")
+        self._flush: CALLBACK_TYPE | None = None
+        self._flush_at = 0.0
+
+    @callback
+    def async_filter(self) -> bool:
+        """Return whether the current value is written now."""
+        value = self._value_fn()
+        now = time.monotonic()
+        publish_filter = self.publish_filter
+        due = self._written_at + publish_filter.min_interval
+        significant = publish_filter.significant(self._written, value)
+        if significant and now >= due:
+            self._async_mark_written(value, now)
+            return True
+        if value != self._written:
+            self._async_schedule_flush(
+                due if significant else max(due, now + DEADBAND_FLUSH_DELAY), now
+            )
+        return False
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a pending trailing write."""
+        if self._flush is not None:
+            self._flush()
+            self._flush = None
+
+    @callback
+    def _async_mark_written(self, value: Any, now: float) -> None:
+        self._written = value
+        self._written_at = now
+        self.async_cancel()
+
+    @callback
+    def _async_schedule_flush(self, flush_at: float, now: float) -> None:
+        """Schedule the trailing write, an earlier one replaces a later one."""
+        if self._flush is not None:
+            if self._flush_at <= flush_at:
+                return
+            self._flush()
+        self._flush_at = flush_at
+        self._flush = async_call_later(
+            self.hass, max(flush_at - now, 0), self._async_flush
+        )
+
+    @callback
+    def _async_flush(self, _: datetime) -> None:
+        self._flush = None
+        value = self._value_fn()
+        if value != self._written:
+            self._async_mark_written(value, time.monotonic())
+            self._write_fn()
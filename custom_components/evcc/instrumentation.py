@@ -0,0 +1,198 @@
+"""Opt-in instrumentation of the MQTT ingest path for hass_evcc."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.components.mqtt import ReceiveMessage
+
+    from .api import EvccApiClient
+
+
+class Histogram:
+    """Histogram with fixed bucket bounds."""
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Create a histogram, values above the last bound go to an extra bucket."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    @property
+    def count(self) -> int:
+        """Return the number of recorded values."""
+        return sum(self.counts)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bucket bound containing the percentile."""
+        count = self.count
+        if not count:
+            return None
+        rank = count * percent / 100
+        seen = 0
+        # The overflow bucket reports the last bound.
+        for bound, bucket in zip(
+            (*self.bounds, self.bounds[-1]), self.counts, strict=True
+        ):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        buckets = {
+            f"<={bound}": count
+            for bound, count in zip(self.bounds, self.counts, strict=False)
+        }
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        count = self.count
+        return {
+            "count": count,
+            "mean": self.total / count if count else None,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+# Bucket bounds in microseconds.
+LATENCY_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class EvccInstrumentation:
+    """
+    Counters and histograms of the MQTT ingest path.
+
+    Only created when enabled in the options, so the ingest path carries no
+    overhead otherwise.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.topic_counts: dict[str, int] = {}
+        self.ignored_messages = 0
+        self.parse_time = Histogram(LATENCY_BOUNDS)
+        self.flushes = 0
+        self.flushed_changes = 0
+        self.state_write_time = Histogram(LATENCY_BOUNDS)
+        self._client: EvccApiClient | None = None
+
+    @property
+    def messages(self) -> int:
+        """Return the number of received messages."""
+        return sum(self.topic_counts.values())
+
+    @property
+    def duplicate_share(self) -> float | None:
+        """Return the percentage of messages skipped as a repeated payload."""
+        if self._client is None or self._client.duplicate_share is None:
+            return None
+        return self._client.duplicate_share * 100
+
+    @property
+    def coalescing_ratio(self) -> float | None:
+        """Return the number of messages received per coordinator update."""
+        return self.messages / self.flushes if self.flushes else None
+
+    def wrap(self, client: EvccApiClient) -> Callable[[ReceiveMessage], None]:
+        """Instrument applying the messages, return the client's ingest path."""
+        self._client = client
+        apply_message = client.apply_message
+        routes = client.routes
+        topic_counts = self.topic_counts
+        parse_time = self.parse_time
+
+        def instrumented_apply_message(msg: ReceiveMessage) -> bool:
+            start = time.perf_counter()
+            changed = apply_message(msg)
+            parse_time.record((time.perf_counter() - start) * 1e6)
+            topic = msg.topic
+            topic_counts[topic] = topic_counts.get(topic, 0) + 1
+            if routes.get(topic) is None:
+                self.ignored_messages += 1
+            return changed
+
+        client.apply_message = instrumented_apply_message  # type: ignore[method-assign]
+        return client.message_received
+
+    def record_flush(self, changes: int, duration: float) -> None:
+        """Record a coordinator update writing changes in duration seconds."""
+        self.flushes += 1
+        self.flushed_changes += changes
+        self.state_write_time.record(duration * 1e6)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the collected data for diagnostics."""
+        return {
+            "messages": self.messages,
+            "ignored_messages": self.ignored_messages,
+            "duplicate_share_percent": self.duplicate_share,
+            "topic_counts": dict(
+                sorted(self.topic_counts.items(), key=lambda item: -item[1])
+            ),
+            "parse_time_us": self.parse_time.as_dict(),
+            "flushes": self.flushes,
+            "flushed_changes": self.flushed_changes,
+            "coalescing_ratio": self.coalescing_ratio,
+            "state_write_time_us": self.state_write_time.as_dict(),
+        }
+
+
+class MessageRingBuffer:
+    """
+    Preallocated buffer of the last received raw messages.
+
+    Recording only stores references, the messages are formatted when the
+    buffer is dumped to the diagnostics.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Create a buffer for the last size messages."""
+        self.size = size
+        self.received = 0
+        self._next = 0
+        self._topics: list[str | None] = [None] * size
+        self._payloads: list[Any] = [None] * size
+        self._timestamps: list[float] = [0.0] * size
+
+    def record(self, topic: str, payload: Any, timestamp: float) -> None:
+        """Store a message received at the time.monotonic() timestamp."""
+        index = self._next
+        self._topics[index] = topic
+        self._payloads[index] = payload
+        self._timestamps[index] = timestamp
+        index += 1
+        self._next = 0 if index == self.size else index
+        self.received += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the buffered messages for diagnostics, oldest first."""
+        count = min(self.received, self.size)
+        start = (self._next - count) % self.size if self.size else 0
+        offset = time.time() - time.monotonic()
+        messages = []
+        for position in range(count):
+            index = (start + position) % self.size
+            payload = self._payloads[index]
+            messages.append(
+                {
+                    "received": datetime.fromtimestamp(
+                        self._timestamps[index] + offset, UTC
+                    ).isoformat(),
+                    "topic": self._topics[index],
+                    "payload": payload if isinstance(payload, str) else repr(payload),
+                }
+            )
+        return messages
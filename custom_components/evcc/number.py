@@ -0,0 +1,125 @@
+"""Number platform for hass_evcc."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.number import (
+    NumberDeviceClass,
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
+from homeassistant.const import PERCENTAGE, UnitOfElectricCurrent
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import SIGNAL_NEW_LOADPOINT
+from .entity import EvccLoadPointControlEntity
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .api import EvccApiClient
+    from .coordinator import EvccDataUpdateCoordinator
+    from .data import EvccConfigEntry
+
+
+@dataclass(kw_only=True, frozen=True)
+class EvccLoadpointNumberEntityDescription(NumberEntityDescription):
+    """Describes Evcc number entity."""
+
+    # LoadPoint attribute shown and set by the entity.
+    field: str
+
+
+LIMIT_SOC = "hass_evcc_limit_soc"
+MAX_CURRENT = "hass_evcc_max_current"
+
+ENTITY_DESCRIPTIONS = (
+    EvccLoadpointNumberEntityDescription(
+        key=LIMIT_SOC,
+        name="Limit SoC",
+        icon="mdi:battery-lock",
+        translation_key=LIMIT_SOC,
+        native_unit_of_measurement=PERCENTAGE,
+        native_min_value=0,
+        native_max_value=100,
+        native_step=1,
+        mode=NumberMode.SLIDER,
+        field="limitSoc",
+    ),
+    EvccLoadpointNumberEntityDescription(
+        key=MAX_CURRENT,
+        name="Max Current",
+        icon="mdi:current-ac",
+        translation_key=MAX_CURRENT,
+        device_class=NumberDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        native_min_value=6,
+        native_max_value=32,
+        native_step=1,
+        mode=NumberMode.SLIDER,
+        field="maxCurrent",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: EvccConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the number platform."""
+
+    @callback
+    def async_add_loadpoint(loadpoint_id: int) -> None:
+        async_add_entities(
+            LoadpointEvccNumber(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+        )
+
+    for loadpoint_id in entry.runtime_data.client.loadpoints:
+        async_add_loadpoint(loadpoint_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id), async_add_loadpoint
+        )
+    )
+
+
+class LoadpointEvccNumber(EvccLoadPointControlEntity, NumberEntity):
+    """hass_evcc number class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: EvccLoadpointNumberEntityDescription,
+        loadpoint_id: int,
+    ) -> None:
+        """Initialize the number class."""
+        super().__init__(
+            coordinator,
+            client,
+            entity_description.key,
+            loadpoint_id,
+            entity_description.field,
+        )
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the value of the field."""
+        return self.field_value
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set the field, a slider drag is published once."""
+        self.async_send_command(value, f"{value:g}")
@@ -0,0 +1,78 @@
+"""Rolling window statistics for hass_evcc."""
+
+from __future__ import annotations
+
+from collections import deque
+
+
+class RollingWindow:
+    """
+    Mean, minimum and maximum of the samples within a sliding time window.
+
+    Adding a sample and evicting old ones is amortized O(1): the sum is kept
+    incrementally and the minimum and maximum are the heads of monotonic
+    deques. The newest sample is never evicted, so a value evcc stopped
+    publishing still reports itself.
+    """
+
+    __slots__ = ("_added", "_evicted", "_max", "_min", "_samples", "_sum", "duration")
+
+    def __init__(self, duration: float) -> None:
+        """Create a window over the last duration seconds."""
+        self.duration = duration
+        self._samples: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        # Sequence numbers of the samples added and evicted so far.
+        self._added = 0
+        self._evicted = 0
+        # (sequence number, value) of the minimum and maximum candidates.
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample received at the time.monotonic() timestamp."""
+        self._samples.append((timestamp, value))
+        self._sum += value
+        sequence = self._added
+        self._added += 1
+        minimum = self._min
+        while minimum and minimum[-1][1] >= value:
+            minimum.pop()
+        minimum.append((sequence, value))
+        maximum = self._max
+        while maximum and maximum[-1][1] <= value:
+            maximum.pop()
+        maximum.append((sequence, value))
+        self.evict(timestamp)
+
+    def evict(self, now: float) -> None:
+        """Drop the samples which left the window."""
+        samples = self._samples
+        if not samples:
+            return
+        start = now - self.duration
+        while len(samples) > 1 and samples[0][0] < start:
+            self._sum -= samples.popleft()[1]
+            self._evicted += 1
+        if len(samples) == 1:
+            # Reset the rounding errors accumulated in the sum.
+            self._sum = samples[0][1]
+        while self._min[0][0] < self._evicted:
+            self._min.popleft()
+        while self._max[0][0] < self._evicted:
+            self._max.popleft()
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples in the window."""
+        return self._sum / len(self._samples) if self._samples else None
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the minimum of the samples in the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the maximum of the samples in the window."""
+        return self._max[0][1] if self._max else None
@@ -0,0 +1,88 @@
+"""Select platform for hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .api import CHARGE_MODES
+from .const import SIGNAL_NEW_LOADPOINT
+from .entity import EvccLoadPointControlEntity
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .api import EvccApiClient
+    from .coordinator import EvccDataUpdateCoordinator
+    from .data import EvccConfigEntry
+
+CHARGE_MODE = "hass_evcc_charge_mode"
+
+ENTITY_DESCRIPTIONS = (
+    SelectEntityDescription(
+        key=CHARGE_MODE,
+        name="Charge Mode",
+        icon="mdi:ev-station",
+        translation_key=CHARGE_MODE,
+        options=list(CHARGE_MODES),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: EvccConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the select platform."""
+
+    @callback
+    def async_add_loadpoint(loadpoint_id: int) -> None:
+        async_add_entities(
+            ChargeModeEvccSelect(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+        )
+
+    for loadpoint_id in entry.runtime_data.client.loadpoints:
+        async_add_loadpoint(loadpoint_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id), async_add_loadpoint
+        )
+    )
+
+
+class ChargeModeEvccSelect(EvccLoadPointControlEntity, SelectEntity):
+    """hass_evcc charge mode select class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: SelectEntityDescription,
+        loadpoint_id: int,
+    ) -> None:
+        """Initialize the select class."""
+        super().__init__(
+            coordinator, client, entity_description.key, loadpoint_id, "mode"
+        )
+        self.entity_description = entity_description
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the charge mode."""
+        mode = self.field_value
+        return mode if mode in CHARGE_MODES else None
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the charge mode."""
+        self.async_send_command(option, option)
@@ -2,36 +2,59 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-from collections.abc import Callable
+import time
 from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
-    SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.const import (
+    EntityCategory,
+    UnitOfElectricCurrent,
     UnitOfEnergy,
+    UnitOfLength,
     UnitOfPower,
     UnitOfTime,
-    UnitOfLength,
-    UnitOfElectricCurrent,
 )
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from custom_components.evcc.api import EvccApiClient, LoadPoint
-from custom_components.evcc.const import DOMAIN
-
-from .entity import EvccEntity, EvccLoadPointEntity
+from .const import (
+    CONF_PUBLISH_FILTERS,
+    SIGNAL_NEW_LOADPOINT,
+    SIGNAL_NEW_VEHICLE,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_SESSIONS_UPDATED,
+)
+from .entity import (
+    EvccEntity,
+    EvccLoadPointEntity,
+    EvccSiteEntity,
+    EvccVehicleEntity,
+)
+from .filters import NO_PUBLISH_FILTER, PublishFilter, PublishLimiter
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import EvccApiClient, LoadPoint, Site, Vehicle
     from .coordinator import EvccDataUpdateCoordinator
     from .data import EvccConfigEntry
+    from .instrumentation import EvccInstrumentation
+    from .rolling import RollingWindow
+    from .sessions import ChargingSession
+
+# Only the instrumentation and rolling window sensors are polled.
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -39,6 +62,48 @@ class EvccLoadpointSensorEntityDescription(SensorEntityDescription):
     """Describes Evcc sensor entity."""
 
     value_fn: Callable[[LoadPoint], float | int | None]
+    # LoadPoint attribute read by value_fn, the entity updates when it changes.
+    field: str
+    # Default of the deadband and rate limit, overridden in the options.
+    publish_filter: PublishFilter = NO_PUBLISH_FILTER
+
+
+@dataclass(kw_only=True, frozen=True)
+class EvccRollingSensorEntityDescription(SensorEntityDescription):
+    """Describes Evcc rolling window statistics sensor entity."""
+
+    value_fn: Callable[[RollingWindow], float | None]
+    # LoadPoint attribute feeding the window.
+    field: str
+    # Window duration in seconds.
+    window: float
+
+
+@dataclass(kw_only=True, frozen=True)
+class EvccSiteSensorEntityDescription(SensorEntityDescription):
+    """Describes Evcc site sensor entity."""
+
+    value_fn: Callable[[Site], float | int | None]
+    # Site attribute read by value_fn, the entity updates when it changes.
+    field: str
+    # Default of the deadband and rate limit, overridden in the options.
+    publish_filter: PublishFilter = NO_PUBLISH_FILTER
+
+
+@dataclass(kw_only=True, frozen=True)
+class EvccVehicleSensorEntityDescription(SensorEntityDescription):
+    """Describes Evcc vehicle sensor entity."""
+
+    value_fn: Callable[[Vehicle], float | int | None]
+    # Vehicle attribute read by value_fn, the entity updates when it changes.
+    field: str
+
+
+@dataclass(kw_only=True, frozen=True)
+class EvccInstrumentationSensorEntityDescription(SensorEntityDescription):
+    """Describes Evcc instrumentation sensor entity."""
+
+    value_fn: Callable[[EvccInstrumentation], float | int | None]
 
 
 CHARGED_ENERGY = "hass_evcc_charged_energy"
@@ -50,10 +115,20 @@ CHARGE_REMAINING_ENERGY = "hass_evcc_charge_remaining_energy"
 VEHICLE_SOC = "hass_evcc_vehicle_soc"
 VEHICLE_LIMIT_SOC = "hass_evcc_vehicle_limit_soc"
 VEHICLE_RANGE = "hass_evcc_vehicle_range"
+VEHICLE_ENERGY_TO_LIMIT = "hass_evcc_vehicle_energy_to_limit"
+VEHICLE_CAPACITY = "hass_evcc_vehicle_capacity"
+VEHICLE_BATTERY_SOC = "hass_evcc_vehicle_battery_soc"
 PHASES_ACTIVE = "hass_evcc_active_phases"
 CHARGE_CURRENT_L1 = "hass_evcc_charge_current_l1"
 CHARGE_CURRENT_L2 = "hass_evcc_charge_current_l2"
 CHARGE_CURRENT_L3 = "hass_evcc_charge_current_l3"
+GRID_POWER = "hass_evcc_grid_power"
+PV_POWER = "hass_evcc_pv_power"
+HOME_POWER = "hass_evcc_home_power"
+BATTERY_SOC = "hass_evcc_battery_soc"
+BATTERY_POWER = "hass_evcc_battery_power"
+LAST_SESSION_ENERGY = "hass_evcc_last_session_energy"
+VEHICLE_MONTH_ENERGY = "hass_evcc_vehicle_month_energy"
 
 
 ENTITY_DESCRIPTIONS = (
@@ -66,6 +141,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.chargedEnergy,
+        field="chargedEnergy",
         state_class=SensorStateClass.TOTAL,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -74,9 +150,10 @@ ENTITY_DESCRIPTIONS = (
         icon="mdi:battery-charging-high",
         translation_key=TOTAL_CHARGED_ENERGY,
         device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.totalChargedEnergy,
+        field="totalChargedEnergy",
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -88,6 +165,8 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfPower.WATT,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.chargePower,
+        field="chargePower",
+        publish_filter=PublishFilter(deadband=10),
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -99,6 +178,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_display_precision=0,
         value_fn=lambda loadpoint: loadpoint.chargeDuration,
+        field="chargeDuration",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -110,6 +190,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfTime.SECONDS,
         suggested_display_precision=0,
         value_fn=lambda loadpoint: loadpoint.chargeRemainingDuration,
+        field="chargeRemainingDuration",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -121,6 +202,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.chargeRemainingEnergy,
+        field="chargeRemainingEnergy",
         state_class=SensorStateClass.TOTAL,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -131,6 +213,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement="%",
         suggested_display_precision=0,
         value_fn=lambda loadpoint: loadpoint.vehicleSoc,
+        field="vehicleSoc",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -141,6 +224,7 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement="%",
         suggested_display_precision=0,
         value_fn=lambda loadpoint: loadpoint.vehicleLimitSoc,
+        field="vehicleLimitSoc",
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -152,8 +236,20 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.vehicleRange,
+        field="vehicleRange",
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    EvccLoadpointSensorEntityDescription(
+        key=VEHICLE_ENERGY_TO_LIMIT,
+        name="Vehicle Energy to Limit",
+        icon="mdi:battery-arrow-up",
+        translation_key=VEHICLE_ENERGY_TO_LIMIT,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        suggested_display_precision=0,
+        value_fn=lambda loadpoint: loadpoint.vehicleEnergyToLimit,
+        field="vehicleEnergyToLimit",
+    ),
     EvccLoadpointSensorEntityDescription(
         key=CHARGE_CURRENT_L1,
         name="Charge Current L1",
@@ -163,6 +259,8 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.currentPhase1,
+        field="currentPhase1",
+        publish_filter=PublishFilter(deadband=0.1),
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -174,6 +272,8 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.currentPhase2,
+        field="currentPhase2",
+        publish_filter=PublishFilter(deadband=0.1),
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -185,6 +285,8 @@ ENTITY_DESCRIPTIONS = (
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         suggested_display_precision=1,
         value_fn=lambda loadpoint: loadpoint.currentPhase3,
+        field="currentPhase3",
+        publish_filter=PublishFilter(deadband=0.1),
         state_class=SensorStateClass.MEASUREMENT,
     ),
     EvccLoadpointSensorEntityDescription(
@@ -193,29 +295,387 @@ ENTITY_DESCRIPTIONS = (
         icon="mdi:backburger",
         translation_key=PHASES_ACTIVE,
         value_fn=lambda loadpoint: loadpoint.phasesActive,
+        field="phasesActive",
+    ),
+)
+
+# LoadPoint attributes with rolling window statistics.
+ROLLING_FIELDS = ("chargePower", "currentPhase1", "currentPhase2", "currentPhase3")
+
+# Window durations in minutes.
+ROLLING_WINDOWS = (1, 5, 15)
+
+ROLLING_STATISTICS: tuple[
+    tuple[str, str, Callable[[RollingWindow], float | None]], ...
+] = (
+    ("mean", "Mean", lambda window: window.mean),
+    ("min", "Min", lambda window: window.minimum),
+    ("max", "Max", lambda window: window.maximum),
+)
+
+ROLLING_DESCRIPTIONS = tuple(
+    EvccRollingSensorEntityDescription(
+        key=f"{description.key}_{statistic}_{minutes}m",
+        name=f"{description.name} {label} {minutes} min",
+        icon=description.icon,
+        device_class=description.device_class,
+        native_unit_of_measurement=description.native_unit_of_measurement,
+        suggested_display_precision=description.suggested_display_precision,
+        entity_registry_enabled_default=False,
+        value_fn=value_fn,
+        field=description.field,
+        window=minutes * 60,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+    for description in ENTITY_DESCRIPTIONS
+    if description.field in ROLLING_FIELDS
+    for minutes in ROLLING_WINDOWS
+    for statistic, label, value_fn in ROLLING_STATISTICS
+)
+
+SITE_DESCRIPTIONS = (
+    EvccSiteSensorEntityDescription(
+        key=GRID_POWER,
+        name="Grid Power",
+        icon="mdi:transmission-tower",
+        translation_key=GRID_POWER,
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        value_fn=lambda site: site.gridPower,
+        field="gridPower",
+        publish_filter=PublishFilter(deadband=10),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EvccSiteSensorEntityDescription(
+        key=PV_POWER,
+        name="PV Power",
+        icon="mdi:solar-power",
+        translation_key=PV_POWER,
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        value_fn=lambda site: site.pvPower,
+        field="pvPower",
+        publish_filter=PublishFilter(deadband=10),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EvccSiteSensorEntityDescription(
+        key=HOME_POWER,
+        name="Home Power",
+        icon="mdi:home-lightning-bolt",
+        translation_key=HOME_POWER,
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        value_fn=lambda site: site.homePower,
+        field="homePower",
+        publish_filter=PublishFilter(deadband=10),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EvccSiteSensorEntityDescription(
+        key=BATTERY_SOC,
+        name="Battery SoC",
+        icon="mdi:home-battery",
+        translation_key=BATTERY_SOC,
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement="%",
+        suggested_display_precision=0,
+        value_fn=lambda site: site.batterySoc,
+        field="batterySoc",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EvccSiteSensorEntityDescription(
+        key=BATTERY_POWER,
+        name="Battery Power",
+        icon="mdi:home-battery",
+        translation_key=BATTERY_POWER,
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        value_fn=lambda site: site.batteryPower,
+        field="batteryPower",
+        publish_filter=PublishFilter(deadband=10),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+VEHICLE_DESCRIPTIONS = (
+    EvccVehicleSensorEntityDescription(
+        key=VEHICLE_CAPACITY,
+        name="Vehicle Capacity",
+        icon="mdi:car-battery",
+        translation_key=VEHICLE_CAPACITY,
+        device_class=SensorDeviceClass.ENERGY_STORAGE,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=1,
+        value_fn=lambda vehicle: vehicle.capacity,
+        field="capacity",
+    ),
+    EvccVehicleSensorEntityDescription(
+        key=VEHICLE_BATTERY_SOC,
+        name="Vehicle Battery SoC",
+        icon="mdi:battery",
+        translation_key=VEHICLE_BATTERY_SOC,
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement="%",
+        suggested_display_precision=0,
+        value_fn=lambda vehicle: vehicle.soc,
+        field="soc",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+SESSION_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key=LAST_SESSION_ENERGY,
+        name="Last Session Energy",
+        icon="mdi:history",
+        translation_key=LAST_SESSION_ENERGY,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+    ),
+)
+
+VEHICLE_SESSION_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key=VEHICLE_MONTH_ENERGY,
+        name="Vehicle Energy This Month",
+        icon="mdi:calendar-month",
+        translation_key=VEHICLE_MONTH_ENERGY,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.TOTAL,
+    ),
+)
+
+# Sensors with a PublishFilter, by key.
+FILTERED_DESCRIPTIONS: dict[
+    str, EvccLoadpointSensorEntityDescription | EvccSiteSensorEntityDescription
+] = {
+    description.key: description
+    for description in (*ENTITY_DESCRIPTIONS, *SITE_DESCRIPTIONS)
+}
+
+INSTRUMENTATION_DESCRIPTIONS = (
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_messages",
+        name="MQTT Messages",
+        icon="mdi:message-processing-outline",
+        value_fn=lambda instrumentation: instrumentation.messages,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_ignored_messages",
+        name="Ignored MQTT Messages",
+        icon="mdi:message-off-outline",
+        value_fn=lambda instrumentation: instrumentation.ignored_messages,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_duplicate_share",
+        name="Duplicate MQTT Messages",
+        icon="mdi:content-duplicate",
+        native_unit_of_measurement="%",
+        suggested_display_precision=1,
+        value_fn=lambda instrumentation: instrumentation.duplicate_share,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_parse_time_p99",
+        name="Message Parse Time P99",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        value_fn=lambda instrumentation: instrumentation.parse_time.percentile(99),
+    ),
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_coalescing_ratio",
+        name="Messages per Update",
+        icon="mdi:call-merge",
+        suggested_display_precision=1,
+        value_fn=lambda instrumentation: instrumentation.coalescing_ratio,
+    ),
+    EvccInstrumentationSensorEntityDescription(
+        key="hass_evcc_state_write_time_p99",
+        name="State Write Time P99",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        value_fn=lambda instrumentation: instrumentation.state_write_time.percentile(
+            99
+        ),
     ),
 )
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: EvccConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the sensor platform."""
+    """
+    Set up the sensor platform.
+
+    Site entities are created right away, load point and vehicle entities for
+    the ones known so far and then for each one the first time evcc reports
+    it.
+    """
+
+    @callback
+    def async_add_loadpoint(loadpoint_id: int) -> None:
+        async_add_entities(
+            LoadpointEvccSensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+        )
+        async_add_entities(
+            RollingLoadpointEvccSensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ROLLING_DESCRIPTIONS
+        )
+        async_add_entities(
+            LastSessionEvccSensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in SESSION_DESCRIPTIONS
+        )
+
+    @callback
+    def async_add_vehicle(vehicle_id: int) -> None:
+        async_add_entities(
+            VehicleEvccSensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                vehicle_id=vehicle_id,
+            )
+            for entity_description in VEHICLE_DESCRIPTIONS
+        )
+        async_add_entities(
+            VehicleMonthEnergyEvccSensor(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                vehicle_id=vehicle_id,
+            )
+            for entity_description in VEHICLE_SESSION_DESCRIPTIONS
+        )
+
+    if (instrumentation := entry.runtime_data.instrumentation) is not None:
+        async_add_entities(
+            InstrumentationEvccSensor(
+                entry=entry,
+                instrumentation=instrumentation,
+                entity_description=entity_description,
+            )
+            for entity_description in INSTRUMENTATION_DESCRIPTIONS
+        )
     async_add_entities(
-        LoadpointEvccSensor(
+        SiteEvccSensor(
             coordinator=entry.runtime_data.coordinator,
             client=entry.runtime_data.client,
             entity_description=entity_description,
-            loadpoint_id=i + 1,
         )
-        for entity_description in ENTITY_DESCRIPTIONS
-        for i in range(3)
+        for entity_description in SITE_DESCRIPTIONS
+    )
+    for loadpoint_id in entry.runtime_data.client.loadpoints:
+        async_add_loadpoint(loadpoint_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id), async_add_loadpoint
+        )
     )
+    for vehicle_id in entry.runtime_data.client.vehicles:
+        async_add_vehicle(vehicle_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_VEHICLE.format(entry.entry_id), async_add_vehicle
+        )
+    )
+
+
+class FilteredEvccSensor(EvccEntity, SensorEntity):
+    """
+    hass_evcc sensor whose state writes pass a PublishFilter.
+
+    The filter of the description is overridden by the one stored for the
+    description key in the options, changes of the options apply right away.
+    """
+
+    entity_description: (
+        EvccLoadpointSensorEntityDescription | EvccSiteSensorEntityDescription
+    )
+    _limiter: PublishLimiter | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Set up the PublishLimiter when added to hass."""
+        await super().async_added_to_hass()
+        self._async_apply_publish_filter()
+        entry_id = self.coordinator.config_entry.entry_id
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(entry_id),
+                self._async_options_updated,
+            )
+        )
+        self.async_on_remove(self._async_cancel_limiter)
+
+    @callback
+    def _async_apply_publish_filter(self) -> bool:
+        """Set up the PublishLimiter, return whether the filter changed."""
+        options = self.coordinator.config_entry.options.get(CONF_PUBLISH_FILTERS, {})
+        if (stored := options.get(self.entity_description.key)) is not None:
+            publish_filter = PublishFilter.from_dict(stored)
+        else:
+            publish_filter = self.entity_description.publish_filter
+        current = self._limiter.publish_filter if self._limiter else NO_PUBLISH_FILTER
+        if publish_filter == current:
+            return False
+        self._async_cancel_limiter()
+        if publish_filter.enabled:
+            self._limiter = PublishLimiter(
+                self.hass,
+                publish_filter,
+                lambda: self.native_value,
+                self.async_write_ha_state,
+            )
+            # The state written when the entity was added.
+            self._limiter.async_filter()
+        return True
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Write the value a replaced filter may have held back."""
+        if self._async_apply_publish_filter():
+            self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_limiter(self) -> None:
+        if self._limiter is not None:
+            self._limiter.async_cancel()
+            self._limiter = None
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the PublishFilter lets the change pass."""
+        if self._limiter is None or self._limiter.async_filter():
+            super()._handle_coordinator_update()
 
-class LoadpointEvccSensor(EvccLoadPointEntity, SensorEntity):
+
+class LoadpointEvccSensor(FilteredEvccSensor, EvccLoadPointEntity):
     """hass_evcc Sensor class."""
 
     def __init__(
@@ -231,6 +691,7 @@ class LoadpointEvccSensor(EvccLoadPointEntity, SensorEntity):
             client,
             entity_description.key,
             loadpoint_id,
+            entity_description.field,
         )
         self.entity_description = entity_description
 
@@ -242,3 +703,238 @@ class LoadpointEvccSensor(EvccLoadPointEntity, SensorEntity):
             if self.loadpoint is not None
             else None
         )
+
+
+class RollingLoadpointEvccSensor(EvccLoadPointEntity, SensorEntity):
+    """
+    hass_evcc rolling window statistics sensor class.
+
+    The sensor updates with the load point attribute feeding the window and
+    is polled, so the statistics keep following the window while evcc does
+    not publish changes.
+    """
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: EvccRollingSensorEntityDescription,
+        loadpoint_id: int,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(
+            coordinator,
+            client,
+            entity_description.key,
+            loadpoint_id,
+            entity_description.field,
+        )
+        self.entity_description = entity_description
+        self._window: RollingWindow | None = None
+
+    @property
+    def should_poll(self) -> bool:
+        """Poll to evict the samples which left the window."""
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """Start feeding the window when added to hass."""
+        await super().async_added_to_hass()
+        self._window = self.client.rolling_window(
+            self.loadpoint_id,
+            self.entity_description.field,
+            self.entity_description.window,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the window when removed from hass."""
+        await super().async_will_remove_from_hass()
+        if self._window is not None:
+            self._window = None
+            self.client.release_rolling_window(
+                self.loadpoint_id,
+                self.entity_description.field,
+                self.entity_description.window,
+            )
+
+    async def async_update(self) -> None:
+        """Nothing to fetch, the window is evicted when the state is read."""
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value of the sensor."""
+        if self._window is None:
+            return None
+        self._window.evict(time.monotonic())
+        return self.entity_description.value_fn(self._window)
+
+
+class SiteEvccSensor(FilteredEvccSensor, EvccSiteEntity):
+    """hass_evcc site sensor class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: EvccSiteSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(
+            coordinator, client, entity_description.key, entity_description.field
+        )
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.site)
+
+
+class VehicleEvccSensor(EvccVehicleEntity, SensorEntity):
+    """hass_evcc vehicle sensor class."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: EvccVehicleSensorEntityDescription,
+        vehicle_id: int,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(
+            coordinator,
+            client,
+            entity_description.key,
+            vehicle_id,
+            entity_description.field,
+        )
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the native value of the sensor."""
+        return (
+            self.entity_description.value_fn(self.vehicle)
+            if self.vehicle is not None
+            else None
+        )
+
+
+class SessionEvccSensor(EvccEntity, SensorEntity):
+    """hass_evcc sensor written when a charging session was logged."""
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the session log when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SESSIONS_UPDATED.format(self.coordinator.config_entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+
+class LastSessionEvccSensor(SessionEvccSensor, EvccLoadPointEntity):
+    """
+    hass_evcc sensor of the last charging session of a load point.
+
+    The energy is the state, the other figures of the session are attributes.
+    """
+
+    # Written when the session log changed.
+    _coordinator_updates = False
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: SensorEntityDescription,
+        loadpoint_id: int,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, client, entity_description.key, loadpoint_id)
+        self.entity_description = entity_description
+
+    @property
+    def session(self) -> ChargingSession | None:
+        """Return the last session of the load point."""
+        sessions = self.coordinator.config_entry.runtime_data.sessions
+        return sessions.last_sessions.get(self.loadpoint_id)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the energy of the last session in kWh."""
+        session = self.session
+        return session.energy / 1000 if session is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the other figures of the last session."""
+        session = self.session
+        if session is None:
+            return None
+        attributes = session.as_dict()
+        del attributes["loadpoint"], attributes["energy"]
+        return attributes
+
+
+class VehicleMonthEnergyEvccSensor(SessionEvccSensor, EvccVehicleEntity):
+    """hass_evcc sensor of the energy charged into a vehicle this month."""
+
+    def __init__(
+        self,
+        coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
+        entity_description: SensorEntityDescription,
+        vehicle_id: int,
+    ) -> None:
+        """Initialize the sensor class."""
+        # The sessions are logged by the title of the vehicle.
+        super().__init__(
+            coordinator, client, entity_description.key, vehicle_id, "title"
+        )
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the energy of the sessions ended this month in kWh."""
+        vehicle = self.vehicle
+        if vehicle is None or not vehicle.title:
+            return None
+        sessions = self.coordinator.config_entry.runtime_data.sessions
+        return sessions.month_energy.get(vehicle.title, 0.0) / 1000
+
+    @property
+    def last_reset(self) -> datetime:
+        """Return the start of the month."""
+        return self.coordinator.config_entry.runtime_data.sessions.month_start
+
+
+class InstrumentationEvccSensor(SensorEntity):
+    """
+    hass_evcc instrumentation sensor class.
+
+    The sensors are polled, so the instrumentation itself does not add state
+    writes on every coordinator update.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        entry: EvccConfigEntry,
+        instrumentation: EvccInstrumentation,
+        entity_description: EvccInstrumentationSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        self.entity_description = entity_description
+        self.instrumentation = instrumentation
+        self._attr_unique_id = f"{entry.entry_id}_{entity_description.key}"
+        self._attr_device_info = entry.runtime_data.devices.site
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.instrumentation)
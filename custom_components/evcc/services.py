@@ -0,0 +1,109 @@
+"""Services for hass_evcc."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .data import EvccConfigEntry
+
+SERVICE_GET_SESSIONS = "get_sessions"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_VEHICLE = "vehicle"
+
+GET_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_VEHICLE): cv.string,
+    }
+)
+
+
+def _timestamp(value: datetime) -> float:
+    """Return the unix time of a datetime, naive ones are local time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.get_default_time_zone())
+    return value.timestamp()
+
+
+def _loaded_entries(hass: HomeAssistant, call: ServiceCall) -> list[EvccConfigEntry]:
+    """Return the loaded config entries the call refers to."""
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is None:
+        return [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return [entry]
+
+
+async def _async_get_sessions(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """
+    Return the charging sessions which ended within a time range.
+
+    The response contains the sessions and the energy per vehicle in kWh,
+    read from the session logs without touching the recorder.
+    """
+    start = _timestamp(call.data[ATTR_START])
+    end = _timestamp(call.data.get(ATTR_END) or dt_util.now())
+    vehicle = call.data.get(ATTR_VEHICLE)
+    sessions = []
+    energy: dict[str, float] = {}
+    for entry in _loaded_entries(hass, call):
+        for session in await entry.runtime_data.sessions.async_query(start, end):
+            if vehicle is not None and session.vehicle != vehicle:
+                continue
+            sessions.append(session.as_dict())
+            energy[session.vehicle] = energy.get(session.vehicle, 0.0) + session.energy
+    return {
+        "sessions": sessions,
+        "energy": {title: round(value / 1000, 3) for title, value in energy.items()},
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SESSIONS,
+        partial(_async_get_sessions, hass),
+        schema=GET_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
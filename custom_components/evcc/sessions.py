@@ -0,0 +1,376 @@
+"""Charging sessions for hass_evcc."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, SIGNAL_SESSIONS_UPDATED
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .api import EvccApiClient, LoadPoint
+
+# LoadPoint attributes the sessions are detected from.
+SESSION_FIELDS = (
+    "charging",
+    "connected",
+    "chargedEnergy",
+    "chargePower",
+    "phasesActive",
+    "vehicleTitle",
+)
+
+# File header: magic, format version and record size.
+_HEADER = struct.Struct("<4sHH")
+_MAGIC = b"EVCS"
+_VERSION = 1
+# Start and end in unix seconds, energy in Wh, peak power in W, mean phases,
+# load point and the index of the vehicle title.
+_RECORD = struct.Struct("<IIffeHH")
+
+
+class ChargingSession(NamedTuple):
+    """A completed charging session of a load point."""
+
+    loadpoint: int
+    vehicle: str
+    start: float  # unix seconds
+    end: float  # unix seconds
+    energy: float  # in Wh
+    peak_power: float  # in W
+    # Time-weighted mean of the active phases while charging.
+    phases: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session for a service response, the energy in kWh."""
+        return {
+            "loadpoint": self.loadpoint,
+            "vehicle": self.vehicle,
+            "start": dt_util.utc_from_timestamp(self.start).isoformat(),
+            "end": dt_util.utc_from_timestamp(self.end).isoformat(),
+            "energy": round(self.energy / 1000, 3),
+            "peak_power": round(self.peak_power),
+            "phases": round(self.phases, 2),
+        }
+
+
+class SessionDetector:
+    """
+    Detects the charging sessions of a load point from its updates.
+
+    A session starts when the load point starts charging and ends once the
+    vehicle is disconnected and no longer charging, pauses in between belong
+    to the session. The energy is the chargedEnergy evcc counts per session.
+    A session running while Home Assistant restarts starts again at the
+    restart, with the energy evcc counted from the actual start.
+    """
+
+    __slots__ = (
+        "_charge_seconds",
+        "_charging",
+        "_last",
+        "_phase_seconds",
+        "_phases",
+        "energy",
+        "loadpoint_id",
+        "peak_power",
+        "start",
+        "vehicle",
+    )
+
+    def __init__(self, loadpoint_id: int) -> None:
+        """Detect the sessions of a load point."""
+        self.loadpoint_id = loadpoint_id
+        # Start of the running session, None while there is none.
+        self.start: float | None = None
+        self.vehicle = ""
+        self.energy = 0.0
+        self.peak_power = 0.0
+        self._last = 0.0
+        self._charging = False
+        self._phases = 0
+        # Seconds spent charging and the sum of the active phases over them.
+        self._charge_seconds = 0.0
+        self._phase_seconds = 0.0
+
+    def update(self, loadpoint: LoadPoint, now: float) -> ChargingSession | None:
+        """Feed the load point state at now, return a session which ended."""
+        if self.start is None:
+            if not loadpoint.charging:
+                return None
+            self.start = now
+            self.vehicle = ""
+            self.energy = self.peak_power = 0.0
+            self._charge_seconds = self._phase_seconds = 0.0
+        elif self._charging:
+            elapsed = now - self._last
+            self._charge_seconds += elapsed
+            self._phase_seconds += elapsed * self._phases
+        self._last = now
+        self._charging = loadpoint.charging
+        self._phases = loadpoint.phasesActive
+        self.energy = max(self.energy, loadpoint.chargedEnergy)
+        self.peak_power = max(self.peak_power, loadpoint.chargePower)
+        if loadpoint.vehicleTitle:
+            self.vehicle = loadpoint.vehicleTitle
+        if loadpoint.connected or loadpoint.charging:
+            return None
+        session = ChargingSession(
+            loadpoint=self.loadpoint_id,
+            vehicle=self.vehicle,
+            start=self.start,
+            end=now,
+            energy=self.energy,
+            peak_power=self.peak_power,
+            phases=self._phase_seconds / self._charge_seconds
+            if self._charge_seconds
+            else float(self._phases),
+        )
+        self.start = None
+        return session
+
+
+class SessionLog:
+    """
+    Append-only log of the completed charging sessions.
+
+    The sessions are fixed-size binary records in the order they ended, the
+    vehicle titles are stored once in a sidecar file and referenced by their
+    line. Only the end times are kept in memory: appending a session writes
+    a single record and a range query is a binary search and a single read
+    of the matching records. All methods do blocking I/O, run them in the
+    executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Use the log at path."""
+        self.path = Path(path)
+        self._vehicles_path = Path(f"{path}.vehicles")
+        # End times of the records, in unix seconds.
+        self._ends = array("I")
+        self._vehicles: list[str] = []
+        self._vehicle_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of sessions."""
+        return len(self._ends)
+
+    def load(self) -> dict[int, ChargingSession]:
+        """Read the index, return the last session of each load point."""
+        try:
+            with self._vehicles_path.open(encoding="utf-8") as file:
+                self._vehicles = file.read().split("\n")[:-1]
+        except FileNotFoundError:
+            self._vehicles = []
+        self._vehicle_index = {
+            vehicle: index for index, vehicle in enumerate(self._vehicles)
+        }
+        try:
+            with self.path.open("r+b") as file:
+                header = file.read(_HEADER.size)
+                if not header:
+                    return {}
+                if header != _HEADER.pack(_MAGIC, _VERSION, _RECORD.size):
+                    LOGGER.warning("Ignoring the invalid session log %s", self.path)
+                    file.close()
+                    self.path.replace(f"{self.path}.invalid")
+                    return {}
+                data = file.read()
+                # A record torn by a crash while it was appended.
+                if torn := len(data) % _RECORD.size:
+                    data = data[:-torn]
+                    file.truncate(_HEADER.size + len(data))
+        except FileNotFoundError:
+            return {}
+        last: dict[int, ChargingSession] = {}
+        ends = self._ends = array("I")
+        for record in _RECORD.iter_unpack(data):
+            ends.append(record[1])
+            session = self._session(record)
+            last[session.loadpoint] = session
+        return last
+
+    def append(self, session: ChargingSession) -> None:
+        """Append a session, its end is not before the one of the last."""
+        # The titles are stored one per line.
+        title = session.vehicle.replace("\n", " ")
+        vehicle = self._vehicle_index.get(title)
+        if vehicle is None:
+            with self._vehicles_path.open("a", encoding="utf-8") as file:
+                file.write(f"{title}\n")
+            vehicle = self._vehicle_index[title] = len(self._vehicles)
+            self._vehicles.append(title)
+        end = max(int(session.end), self._ends[-1] if self._ends else 0)
+        record = _RECORD.pack(
+            int(session.start),
+            end,
+            session.energy,
+            session.peak_power,
+            session.phases,
+            session.loadpoint,
+            vehicle,
+        )
+        with self.path.open("ab") as file:
+            if not file.tell():
+                file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+            file.write(record)
+        self._ends.append(end)
+
+    def query(self, start: float, end: float) -> list[ChargingSession]:
+        """Return the sessions which ended from start until before end."""
+        first = bisect_left(self._ends, start)
+        last = bisect_left(self._ends, end)
+        if first >= last:
+            return []
+        with self.path.open("rb") as file:
+            file.seek(_HEADER.size + first * _RECORD.size)
+            data = file.read((last - first) * _RECORD.size)
+        return [self._session(record) for record in _RECORD.iter_unpack(data)]
+
+    def remove(self) -> None:
+        """Delete the log."""
+        for path in (self.path, self._vehicles_path):
+            path.unlink(missing_ok=True)
+
+    def _session(self, record: tuple[Any, ...]) -> ChargingSession:
+        start, end, energy, peak_power, phases, loadpoint, vehicle = record
+        return ChargingSession(
+            loadpoint=loadpoint,
+            vehicle=self._vehicles[vehicle] if vehicle < len(self._vehicles) else "",
+            start=start,
+            end=end,
+            energy=energy,
+            peak_power=peak_power,
+            phases=phases,
+        )
+
+
+def session_log_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the session log of a config entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.sessions")
+
+
+def month_start(now: datetime) -> datetime:
+    """Return the start of the local month of now."""
+    return dt_util.start_of_local_day(dt_util.as_local(now).date().replace(day=1))
+
+
+class EvccSessionTracker:
+    """
+    Charging sessions of the load points of a config entry.
+
+    Fed with the coordinator updates, every completed session is appended to
+    the SessionLog. The energy per vehicle of the sessions which ended this
+    month is kept in memory, so the sensors never query the recorder or the
+    log.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, client: EvccApiClient
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._entry_id = entry_id
+        self._client = client
+        self.log = SessionLog(session_log_path(hass, entry_id))
+        self._detectors: dict[int, SessionDetector] = {}
+        # Serializes the log access in the executor.
+        self._lock = asyncio.Lock()
+        # Last completed session per load point.
+        self.last_sessions: dict[int, ChargingSession] = {}
+        self.month_start = month_start(dt_util.now())
+        # Energy in Wh per vehicle title of the sessions ended this month.
+        self.month_energy: dict[str, float] = {}
+        self._cancel_month: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the session log and sum up the current month."""
+        async with self._lock:
+            self.last_sessions = await self.hass.async_add_executor_job(self.log.load)
+        await self._async_start_month()
+
+    @callback
+    def async_update(self) -> None:
+        """Feed the load points to the detectors, called after every flush."""
+        now = dt_util.utcnow().timestamp()
+        detectors = self._detectors
+        for loadpoint_id, loadpoint in self._client.loadpoints.items():
+            detector = detectors.get(loadpoint_id)
+            if detector is None:
+                detector = detectors[loadpoint_id] = SessionDetector(loadpoint_id)
+            if (session := detector.update(loadpoint, now)) is not None:
+                self.hass.async_create_task(
+                    self._async_append(session), "evcc append charging session"
+                )
+        if len(detectors) > len(self._client.loadpoints):
+            # Drop the detectors of evicted load points.
+            for loadpoint_id in detectors.keys() - self._client.loadpoints.keys():
+                del detectors[loadpoint_id]
+
+    async def async_query(self, start: float, end: float) -> list[ChargingSession]:
+        """Return the sessions which ended from start until before end."""
+        async with self._lock:
+            return await self.hass.async_add_executor_job(self.log.query, start, end)
+
+    async def async_shutdown(self) -> None:
+        """Stop the month timer and wait for the pending appends."""
+        if self._cancel_month is not None:
+            self._cancel_month()
+            self._cancel_month = None
+        async with self._lock:
+            pass
+
+    async def _async_append(self, session: ChargingSession) -> None:
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self.log.append, session)
+            except OSError as exception:
+                LOGGER.error("Error appending a charging session: %s", exception)
+            if session.end >= self.month_start.timestamp():
+                self.month_energy[session.vehicle] = (
+                    self.month_energy.get(session.vehicle, 0.0) + session.energy
+                )
+        self.last_sessions[session.loadpoint] = session
+        async_dispatcher_send(self.hass, SIGNAL_SESSIONS_UPDATED.format(self._entry_id))
+
+    async def _async_start_month(self, now: datetime | None = None) -> None:
+        """Sum up the sessions of the month and schedule the next one."""
+        self.month_start = start = month_start(now or dt_util.now())
+        month_energy: dict[str, float] = {}
+        for session in await self.async_query(start.timestamp(), float("inf")):
+            month_energy[session.vehicle] = (
+                month_energy.get(session.vehicle, 0.0) + session.energy
+            )
+        self.month_energy = month_energy
+        # Any day of the next month, the start of the month is local.
+        next_month = month_start(start + timedelta(days=32))
+        self._cancel_month = async_track_point_in_time(
+            self.hass, self._async_month_changed, next_month
+        )
+
+    async def _async_month_changed(self, now: datetime) -> None:
+        self._cancel_month = None
+        await self._async_start_month(now)
+        async_dispatcher_send(self.hass, SIGNAL_SESSIONS_UPDATED.format(self._entry_id))
+
+
+async def async_remove_session_log(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the session log of a config entry."""
+    await hass.async_add_executor_job(
+        SessionLog(session_log_path(hass, entry_id)).remove
+    )
@@ -0,0 +1,85 @@
+"""Persisted state snapshot for hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .api import EvccApiClient
+
+STORAGE_VERSION = 1
+
+# Maximum seconds between a change and the snapshot being written.
+SNAPSHOT_DELAY = 60
+
+
+class EvccSnapshot:
+    """
+    Snapshot of the EvccApiClient state in the Home Assistant storage.
+
+    The snapshot is restored before the platforms are set up, so entities
+    start with the last known values instead of zeros.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, client: EvccApiClient
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._client = client
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._save_scheduled = False
+
+    async def async_restore(self) -> bool:
+        """Restore the client state, return whether a snapshot existed."""
+        data = await self._store.async_load()
+        if not data:
+            return False
+        self._client.restore(data)
+        return True
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """
+        Save the state after SNAPSHOT_DELAY.
+
+        Unlike repeated Store.async_delay_save calls, further changes do not
+        postpone a scheduled save.
+        """
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data, SNAPSHOT_DELAY)
+
+    @callback
+    def async_setup_shutdown_save(self) -> CALLBACK_TYPE:
+        """Save the state when Home Assistant stops."""
+
+        @callback
+        def _async_stop(_: Event) -> None:
+            # The store writes pending data on the final write event.
+            self._store.async_delay_save(self._data)
+
+        return self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+
+    async def async_save(self) -> None:
+        """Save the state now."""
+        await self._store.async_save(self._data())
+
+    def _data(self) -> dict[str, Any]:
+        self._save_scheduled = False
+        return self._client.as_dict()
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the snapshot of a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}").async_remove()
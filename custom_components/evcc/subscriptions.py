@@ -0,0 +1,252 @@
+"""MQTT subscriptions for hass_evcc."""
+
+from __future__ import annotations
+
+from functools import partial
+from itertools import count
+from typing import TYPE_CHECKING
+
+from homeassistant.components.mqtt.subscription import (
+    async_prepare_subscribe_topics,
+    async_subscribe_topics,
+)
+from homeassistant.core import CALLBACK_TYPE, HassJobType, callback
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.components.mqtt import ReceiveMessage
+    from homeassistant.components.mqtt.subscription import EntitySubscription
+    from homeassistant.core import HomeAssistant
+
+
+class EvccMqttRouter:
+    """
+    Integration-wide owner of the evcc MQTT subscriptions.
+
+    Config entries register their evcc topic and acquire topic patterns below
+    it. A pattern acquired by a single evcc topic is subscribed literally,
+    several evcc topics with the same number of levels share one subscription
+    with "+" levels instead. Messages are dispatched to the client of their
+    evcc topic with a dict lookup, so the number of subscriptions and the
+    cost per message do not grow with the number of config entries. The
+    message callbacks are synchronous and run inline by the MQTT client.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        # Message callbacks per evcc topic.
+        self._callbacks: dict[str, list[Callable[[ReceiveMessage], None]]] = {}
+        # Changes with every registration, so a topic subscribed for a new
+        # client is subscribed again with its callback.
+        self._generations: dict[str, int] = {}
+        self._counter = count()
+        # Reference counts per pattern and evcc topic.
+        self._refcounts: dict[str, dict[str, int]] = {}
+        # Dispatchers per number of levels of the evcc topic.
+        self._routes: dict[int, Callable[[ReceiveMessage], None]] = {}
+        self._sub_state: dict[str, EntitySubscription] | None = None
+        self._update_pending = False
+
+    @property
+    def topics(self) -> list[str]:
+        """Return the subscribed topics."""
+        return sorted(
+            subscription.topic for subscription in (self._sub_state or {}).values()
+        )
+
+    @property
+    def callback_count(self) -> int:
+        """Return the number of registered message callbacks."""
+        return sum(len(callbacks) for callbacks in self._callbacks.values())
+
+    @callback
+    def async_register(
+        self, topic: str, msg_callback: Callable[[ReceiveMessage], None]
+    ) -> CALLBACK_TYPE:
+        """Dispatch the messages below the evcc topic to msg_callback."""
+        self._callbacks.setdefault(topic, []).append(msg_callback)
+        self._generations[topic] = next(self._counter)
+        self._async_schedule_update()
+
+        @callback
+        def unregister() -> None:
+            callbacks = self._callbacks[topic]
+            callbacks.remove(msg_callback)
+            if not callbacks:
+                del self._callbacks[topic]
+                del self._generations[topic]
+            self._async_schedule_update()
+
+        return unregister
+
+    @callback
+    def async_acquire(self, topic: str, pattern: str) -> CALLBACK_TYPE:
+        """Subscribe to a pattern below the evcc topic until released."""
+        counts = self._refcounts.setdefault(pattern, {})
+        count = counts.get(topic, 0)
+        counts[topic] = count + 1
+        if count == 0:
+            self._async_schedule_update()
+
+        return partial(self.async_release, topic, pattern)
+
+    @callback
+    def async_release(self, topic: str, pattern: str) -> None:
+        """Release one reference acquired with async_acquire."""
+        counts = self._refcounts[pattern]
+        remaining = counts[topic] - 1
+        if remaining:
+            counts[topic] = remaining
+            return
+        del counts[topic]
+        if not counts:
+            del self._refcounts[pattern]
+        self._async_schedule_update()
+
+    @callback
+    def _async_schedule_update(self) -> None:
+        """Apply all changes of this loop iteration at once."""
+        if not self._update_pending:
+            self._update_pending = True
+            self.hass.async_create_task(self.async_update(), eager_start=False)
+
+    async def async_update(self) -> None:
+        """Bring the MQTT subscriptions in line with the acquired patterns."""
+        self._update_pending = False
+        self._sub_state = async_prepare_subscribe_topics(
+            self.hass,
+            self._sub_state,
+            {
+                key: {
+                    "topic": topic,
+                    "msg_callback": msg_callback,
+                    "job_type": HassJobType.Callback,
+                }
+                for key, (topic, msg_callback) in self.subscription_topics().items()
+            },
+        )
+        await async_subscribe_topics(self.hass, self._sub_state)
+
+    def subscription_topics(
+        self,
+    ) -> dict[str, tuple[str, Callable[[ReceiveMessage], None]]]:
+        """Return the topics to subscribe and their message callbacks by key."""
+        topics = {}
+        for pattern, counts in self._refcounts.items():
+            by_depth: dict[int, list[str]] = {}
+            for topic in counts:
+                by_depth.setdefault(topic.count("/") + 1, []).append(topic)
+            for depth, evcc_topics in by_depth.items():
+                if len(evcc_topics) > 1:
+                    topic = f"{'/'.join('+' * depth)}/{pattern}"
+                    topics[topic] = (topic, self._route(depth))
+                    continue
+                evcc_topic = evcc_topics[0]
+                topic = f"{evcc_topic}/{pattern}"
+                callbacks = self._callbacks.get(evcc_topic, ())
+                if len(callbacks) == 1:
+                    # A topic of a single client needs no dispatching.
+                    key = f"{topic}#{self._generations[evcc_topic]}"
+                    topics[key] = (topic, callbacks[0])
+                else:
+                    topics[topic] = (topic, self._route(depth))
+        return topics
+
+    def _route(self, depth: int) -> Callable[[ReceiveMessage], None]:
+        """Return the dispatcher for evcc topics with depth levels."""
+        route = self._routes.get(depth)
+        if route is None:
+            route = self._routes[depth] = partial(self._async_route, depth)
+        return route
+
+    @callback
+    def _async_route(self, depth: int, msg: ReceiveMessage) -> None:
+        """Pass a message to the clients of its evcc topic."""
+        topic = msg.topic
+        end = -1
+        for _ in range(depth):
+            end = topic.find("/", end + 1)
+            if end < 0:
+                return
+        callbacks = self._callbacks.get(topic[:end])
+        if callbacks is not None:
+            for msg_callback in callbacks:
+                msg_callback(msg)
+
+
+@callback
+def async_get_router(hass: HomeAssistant) -> EvccMqttRouter:
+    """Return the router shared by all config entries."""
+    router: EvccMqttRouter | None = hass.data.get(DOMAIN)
+    if router is None:
+        router = hass.data[DOMAIN] = EvccMqttRouter(hass)
+    return router
+
+
+class EvccSubscriptions:
+    """
+    Subscribe to the evcc topics which are actually consumed.
+
+    Entities acquire the topic patterns they read, for example
+    "loadpoints/+/chargePower", and the MQTT subscriptions of the shared
+    EvccMqttRouter follow the reference counts. Everything else is filtered
+    by the broker.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        topic: str,
+        msg_callback: Callable[[ReceiveMessage], None],
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._topic = topic
+        self._router = async_get_router(hass)
+        self._unregister = self._router.async_register(topic, msg_callback)
+        self._refcounts: dict[str, int] = {}
+        self._closed = False
+
+    @property
+    def topics(self) -> list[str]:
+        """Return the subscribed topics."""
+        return sorted(f"{self._topic}/{pattern}" for pattern in self._refcounts)
+
+    @callback
+    def async_acquire(self, pattern: str) -> CALLBACK_TYPE:
+        """Subscribe to a pattern below the evcc topic until released."""
+        self._router.async_acquire(self._topic, pattern)
+        self._refcounts[pattern] = self._refcounts.get(pattern, 0) + 1
+
+        @callback
+        def release() -> None:
+            if self._closed:
+                # Released by async_unsubscribe already.
+                return
+            remaining = self._refcounts[pattern] - 1
+            if remaining:
+                self._refcounts[pattern] = remaining
+            else:
+                del self._refcounts[pattern]
+            self._router.async_release(self._topic, pattern)
+
+        return release
+
+    async def async_update(self) -> None:
+        """Bring the MQTT subscriptions in line with the acquired patterns."""
+        await self._router.async_update()
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Release the patterns of this entry and stop receiving messages."""
+        self._closed = True
+        self._unregister()
+        # Other entries may hold the same patterns of the same evcc topic.
+        for pattern, references in self._refcounts.items():
+            for _ in range(references):
+                self._router.async_release(self._topic, pattern)
+        self._refcounts.clear()
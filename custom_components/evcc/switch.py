@@ -5,61 +5,102 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .entity import EvccEntity
+from .const import SIGNAL_NEW_LOADPOINT
+from .entity import EvccLoadPointControlEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .api import EvccApiClient
     from .coordinator import EvccDataUpdateCoordinator
     from .data import EvccConfigEntry
 
+CHARGING_ENABLED = "hass_evcc_charging_enabled"
+
 ENTITY_DESCRIPTIONS = (
     SwitchEntityDescription(
-        key="hass_evcc",
-        name="Integration Switch",
-        icon="mdi:format-quote-close",
+        key=CHARGING_ENABLED,
+        name="Charging Enabled",
+        icon="mdi:ev-station",
+        translation_key=CHARGING_ENABLED,
     ),
 )
 
+# Charge mode used to enable charging before another mode than "off" was seen.
+DEFAULT_ENABLED_MODE = "pv"
+
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: EvccConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the switch platform."""
-    async_add_entities(
-        IntegrationBlueprintSwitch(
-            coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
+
+    @callback
+    def async_add_loadpoint(loadpoint_id: int) -> None:
+        async_add_entities(
+            ChargingEvccSwitch(
+                coordinator=entry.runtime_data.coordinator,
+                client=entry.runtime_data.client,
+                entity_description=entity_description,
+                loadpoint_id=loadpoint_id,
+            )
+            for entity_description in ENTITY_DESCRIPTIONS
+        )
+
+    for loadpoint_id in entry.runtime_data.client.loadpoints:
+        async_add_loadpoint(loadpoint_id)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_LOADPOINT.format(entry.entry_id), async_add_loadpoint
         )
-        for entity_description in ENTITY_DESCRIPTIONS
     )
 
 
-class IntegrationBlueprintSwitch(EvccEntity, SwitchEntity):
-    """hass_evcc switch class."""
+class ChargingEvccSwitch(EvccLoadPointControlEntity, SwitchEntity):
+    """
+    hass_evcc switch enabling charging of a load point.
+
+    evcc has no separate enable setting, the switch sets the charge mode to
+    "off" and back to the last mode evcc reported before.
+    """
 
     def __init__(
         self,
         coordinator: EvccDataUpdateCoordinator,
+        client: EvccApiClient,
         entity_description: SwitchEntityDescription,
+        loadpoint_id: int,
     ) -> None:
         """Initialize the switch class."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, client, entity_description.key, loadpoint_id, "mode"
+        )
         self.entity_description = entity_description
+        self._enabled_mode = DEFAULT_ENABLED_MODE
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        return self.coordinator.data.get("title", "") == "foo"
+        mode = self.field_value
+        return mode != "off" if mode else None
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
-        await self.coordinator.async_request_refresh()
+        self.async_send_command(self._enabled_mode, self._enabled_mode)
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
-        await self.coordinator.async_request_refresh()
+        self.async_send_command("off", "off")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Remember the mode charging is enabled with."""
+        if self.loadpoint is not None and self.loadpoint.mode not in ("", "off"):
+            self._enabled_mode = self.loadpoint.mode
+        super()._handle_coordinator_update()
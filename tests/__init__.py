@@ -0,0 +1 @@
+"""Tests for hass_evcc."""
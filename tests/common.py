@@ -0,0 +1,165 @@
+"""Helpers for hass_evcc tests, also used by benchmarks/fuzz.py."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, NamedTuple
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.evcc.api import (
+    LOADPOINT_FIELDS,
+    MAX_IDENTIFIER,
+    MAX_IGNORED_TOPICS,
+    SITE_FIELDS,
+    SITE_KEY,
+    VEHICLE_FIELDS,
+)
+
+if TYPE_CHECKING:
+    import random
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.evcc.api import EvccApiClient
+
+TOPIC = "evcc"
+
+
+class Message(NamedTuple):
+    """MQTT message as passed to EvccApiClient.message_received."""
+
+    topic: str
+    payload: str | bytes
+    timestamp: float = 0.0
+
+
+async def async_advance(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float
+) -> None:
+    """Advance the frozen clock and fire the timers due by then."""
+    # Schedule the timers of the queued messages first.
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+# Load points publishing throughout a random stream, known before it starts
+# like after a restart. They must never be evicted.
+LIVE_LOADPOINTS = (1, 2)
+LIVE_SHARE = 0.2
+
+_BAD_INDEXES = ("", "abc", "-1", "1.5", " 1", "0x1", "\u00b2", "\u0661", "1/2")
+_BAD_SUFFIXES = ("foo", "chargeCurrents/l9", "title/extra", "", "/")
+_SUFFIXES = (*LOADPOINT_FIELDS, *VEHICLE_FIELDS, *_BAD_SUFFIXES)
+_PAYLOADS = (
+    "",
+    "true",
+    "false",
+    "nan",
+    "inf",
+    "-inf",
+    "1e999",
+    "null",
+    "{}",
+    "[1, 2]",
+    "Garage",
+    "éèê",
+    "9" * 5000,
+    b"12.5",
+    b"\xff\xfe",
+)
+
+
+def _random_index(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.7:
+        return str(rng.randint(1, 5000))
+    if roll < 0.8:
+        return rng.choice(_BAD_INDEXES)
+    if roll < 0.9:
+        return str(rng.randint(MAX_IDENTIFIER, 10**30))
+    return "9" * rng.randint(6, 5000)
+
+
+def _random_payload(rng: random.Random) -> str | bytes:
+    if rng.random() < 0.5:
+        return f"{rng.uniform(-1e6, 1e6):.{rng.randint(0, 3)}f}"
+    return rng.choice(_PAYLOADS)
+
+
+def _random_topic(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.45:
+        return f"{TOPIC}/loadpoints/{_random_index(rng)}/{rng.choice(_SUFFIXES)}"
+    if roll < 0.8:
+        return f"{TOPIC}/vehicle/{_random_index(rng)}/{rng.choice(_SUFFIXES)}"
+    if roll < 0.9:
+        return f"{TOPIC}/site/{rng.choice((*SITE_FIELDS, *_BAD_SUFFIXES))}"
+    return rng.choice(
+        (
+            f"{TOPIC}/foo/{_random_index(rng)}/title",
+            f"{TOPIC}2/loadpoints/1/title",
+            f"other/{rng.random()}",
+            TOPIC,
+            f"{TOPIC}/",
+        )
+    )
+
+
+def generate_batch(
+    rng: random.Random, count: int, start: int, rate: float
+) -> list[Message]:
+    """Generate the messages start to start + count of the stream."""
+    messages = []
+    for number in range(start, start + count):
+        now = number / rate
+        if rng.random() < LIVE_SHARE:
+            loadpoint_id = rng.choice(LIVE_LOADPOINTS)
+            messages.append(
+                Message(
+                    f"{TOPIC}/loadpoints/{loadpoint_id}/chargePower",
+                    f"{rng.uniform(0, 11000):.1f}",
+                    now,
+                )
+            )
+        else:
+            messages.append(Message(_random_topic(rng), _random_payload(rng), now))
+    return messages
+
+
+def check_bounds(client: EvccApiClient, size: int) -> list[str]:
+    """Return the violated bounds and invariants of the client."""
+    errors = []
+    if len(client.loadpoints) > size:
+        errors.append(f"{len(client.loadpoints)} load points")
+    if len(client.vehicles) > size:
+        errors.append(f"{len(client.vehicles)} vehicles")
+    errors.extend(
+        f"live load point {loadpoint_id} evicted"
+        for loadpoint_id in LIVE_LOADPOINTS
+        if loadpoint_id not in client.loadpoints
+    )
+    routes = [route for route in client.routes.values() if route is not None]
+    ignored = len(client.routes) - len(routes)
+    limit = size * (len(LOADPOINT_FIELDS) + len(VEHICLE_FIELDS)) + len(SITE_FIELDS)
+    if len(routes) > limit:
+        errors.append(f"{len(routes)} routes")
+    if ignored > MAX_IGNORED_TOPICS:
+        errors.append(f"{ignored} ignored topics")
+    registries = {"loadpoints": client.loadpoints, "vehicles": client.vehicles}
+    for route in routes:
+        kind, identifier = route.key
+        if route.key == SITE_KEY:
+            target = client.site
+        else:
+            target = registries[kind].get(identifier)
+        if route.target is not target:
+            errors.append(f"stale route of {kind} {identifier}")
+            break
+    for loadpoint_id, vehicle_id in client.loadpoint_vehicles.items():
+        if loadpoint_id not in client.loadpoints or vehicle_id not in client.vehicles:
+            errors.append(f"stale link of load point {loadpoint_id}")
+    return errors
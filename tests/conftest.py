@@ -0,0 +1,18 @@
+"""Fixtures for hass_evcc tests."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable loading the integration from custom_components."""
+
+
+@pytest.fixture
+def expected_lingering_timers() -> bool:
+    """Allow the periodic timer the mocked MQTT client leaves behind."""
+    return True
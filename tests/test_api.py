@@ -0,0 +1,351 @@
+"""Tests for the evcc API client."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc import api
+from custom_components.evcc.api import (
+    STALE_AFTER,
+    EvccApiClient,
+    EvccApiClientError,
+    async_fetch_state,
+)
+from custom_components.evcc.const import (
+    CONF_REST_URL,
+    CONF_TOPIC,
+    DEFAULT_COALESCE_WINDOW,
+    DOMAIN,
+)
+
+from .common import LIVE_LOADPOINTS, TOPIC, Message, check_bounds, generate_batch
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from homeassistant.core import HomeAssistant
+
+STATE = {
+    "loadpoints": [
+        {
+            "title": "Garage",
+            "chargePower": 1200,
+            "chargeCurrents": [5.1, 5.2, 5.3],
+            "connected": True,
+            "mode": "pv",
+            "vehicleTitle": "ID.3",
+            "vehicleSoc": 40,
+            "limitSoc": 80,
+            "vehicleLimitSoc": 80,
+            "unknown": {"nested": 1},
+        },
+        {"title": "Carport", "chargeCurrents": [1, 2, 3, 4], "chargePower": None},
+    ],
+    "vehicles": {
+        "2": {"title": "ID.3", "capacity": 58},
+        "db:1": {"title": "By name"},
+    },
+    "grid": {"power": -300},
+    "pvPower": 5000,
+}
+
+# Registry size and simulated stream of the random message tests, long enough
+# for silent identifiers to become stale.
+REGISTRY_SIZE = 4
+MESSAGES = 20_000
+BATCH = 1000
+RATE = 10
+
+
+class EvccStandIn:
+    """Local HTTP server answering /api/state like evcc."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.state: Any = STATE
+        self.status = 200
+        self.delay = 0.0
+        self.requests = 0
+        app = web.Application()
+        app.router.add_get("/api/state", self._handle_state)
+        self.server = TestServer(app, host="127.0.0.1")
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the server."""
+        return str(self.server.make_url("/"))
+
+    async def _handle_state(self, _: web.Request) -> web.Response:
+        self.requests += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.json_response(self.state)
+
+
+async def _async_settle(hass: HomeAssistant) -> None:
+    """Wait for the coalesced updates and the MQTT subscriptions."""
+    await hass.async_block_till_done()
+    await asyncio.sleep(DEFAULT_COALESCE_WINDOW + 0.1)
+    await hass.async_block_till_done()
+
+
+@pytest.fixture
+async def evcc(socket_enabled: None) -> AsyncIterator[EvccStandIn]:  # noqa: ARG001
+    """Run an evcc stand-in on localhost."""
+    stand_in = EvccStandIn()
+    await stand_in.server.start_server()
+    yield stand_in
+    await stand_in.server.close()
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Return a client session for the stand-in, also used by the integration.
+
+    The default resolver of aiohttp leaves a thread behind, the stand-in is
+    reached by its IP address anyway.
+    """
+    connector = aiohttp.TCPConnector(resolver=aiohttp.ThreadedResolver())
+    async with aiohttp.ClientSession(connector=connector) as client_session:
+        with patch(
+            "custom_components.evcc.async_get_clientsession",
+            return_value=client_session,
+        ):
+            yield client_session
+
+
+async def test_fetch_state(evcc: EvccStandIn, session: aiohttp.ClientSession) -> None:
+    """The state is fetched from /api/state below the URL."""
+    assert await async_fetch_state(session, evcc.url) == STATE
+    assert await async_fetch_state(session, evcc.url.rstrip("/")) == STATE
+    assert evcc.requests == 2
+
+
+async def test_fetch_state_errors(
+    evcc: EvccStandIn,
+    session: aiohttp.ClientSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """HTTP, connection and timeout errors raise EvccApiClientError."""
+    evcc.status = 500
+    with pytest.raises(EvccApiClientError):
+        await async_fetch_state(session, evcc.url)
+
+    evcc.status = 200
+    evcc.delay = 1
+    monkeypatch.setattr(api, "REST_TIMEOUT", 0.05)
+    with pytest.raises(EvccApiClientError):
+        await async_fetch_state(session, evcc.url)
+
+    url = evcc.url
+    await evcc.server.close()
+    with pytest.raises(EvccApiClientError):
+        await async_fetch_state(session, url)
+
+
+def test_load_state_mapping() -> None:
+    """The REST keys are mapped to the attributes of the MQTT topics."""
+    client = EvccApiClient(TOPIC)
+    new_loadpoints: list[int] = []
+    client.new_loadpoint_callback = new_loadpoints.append
+    updates: list[None] = []
+    client.update_callback = lambda: updates.append(None)
+    # Older evcc versions wrap the state in "result".
+    client.load_state({"result": STATE})
+
+    assert new_loadpoints == [1, 2]
+    assert len(updates) == 1
+    garage = client.loadpoints[1]
+    assert (garage.title, garage.chargePower, garage.connected, garage.mode) == (
+        "Garage",
+        1200,
+        True,
+        "pv",
+    )
+    assert (garage.currentPhase1, garage.currentPhase2, garage.currentPhase3) == (
+        5.1,
+        5.2,
+        5.3,
+    )
+    # Only three phases, null values are skipped.
+    carport = client.loadpoints[2]
+    assert (carport.currentPhase1, carport.currentPhase3) == (1, 3)
+    assert carport.chargePower == 0
+    assert client.site.gridPower == -300
+    assert client.site.pvPower == 5000
+    # Vehicles keyed by name do not match the vehicle topics.
+    assert list(client.vehicles) == [2]
+    assert client.loadpoint_vehicles == {1: 2}
+    assert garage.vehicleEnergyToLimit == 58 * 10 * 40
+
+
+def test_load_state_prefers_grid_power() -> None:
+    """The gridPower of newer evcc versions wins over grid.power."""
+    client = EvccApiClient(TOPIC)
+    client.load_state({"gridPower": 100, "grid": {"power": -300}})
+    assert client.site.gridPower == 100
+
+
+def test_load_state_then_mqtt_deltas() -> None:
+    """Retained messages of the loaded values are no changes."""
+    client = EvccApiClient(TOPIC)
+    client.load_state(STATE)
+    assert ("loadpoints", 1, "chargePower") in client.pop_changes()
+    assert not client.apply_message(
+        Message(f"{TOPIC}/loadpoints/1/chargePower", "1200")
+    )
+    assert not client.apply_message(
+        Message(f"{TOPIC}/loadpoints/1/chargeCurrents/l2", "5.2")
+    )
+    assert client.pop_changes() == set()
+    assert client.apply_message(Message(f"{TOPIC}/loadpoints/1/chargePower", "1300"))
+    assert client.pop_changes() == {("loadpoints", 1, "chargePower")}
+
+
+def test_load_state_skips_invalid_values() -> None:
+    """Values which do not convert are skipped."""
+    client = EvccApiClient(TOPIC)
+    client.load_state(
+        {"loadpoints": [{"title": "Garage", "chargePower": "fast"}], "pvPower": []}
+    )
+    assert client.loadpoints[1].chargePower == 0
+    assert client.site.pvPower is None
+
+
+@pytest.mark.usefixtures("mqtt_mock", "session")
+async def test_setup_loads_rest_state(hass: HomeAssistant, evcc: EvccStandIn) -> None:
+    """The entities start with the state of the REST API."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_TOPIC: TOPIC}, options={CONF_REST_URL: evcc.url}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert evcc.requests == 1
+    assert entry.runtime_data.client.loadpoints[1].title == "Garage"
+    assert hass.states.get("sensor.charge_power").state == "1200.0"
+    assert hass.states.get("sensor.pv_power").state == "5000.0"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("mqtt_mock", "session")
+async def test_setup_falls_back_to_mqtt(
+    hass: HomeAssistant, evcc: EvccStandIn, caplog: pytest.LogCaptureFixture
+) -> None:
+    """The entry starts with MQTT only when the REST API fails."""
+    evcc.status = 503
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_TOPIC: TOPIC}, options={CONF_REST_URL: evcc.url}
+    )
+    entry.add_to_hass(hass)
+    with caplog.at_level(logging.WARNING):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert evcc.requests == 1
+    assert "Waiting for MQTT" in caplog.text
+    assert not entry.runtime_data.client.loadpoints
+
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await _async_settle(hass)
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/chargePower", "700")
+    await _async_settle(hass)
+    assert hass.states.get("sensor.charge_power").state == "700.0"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+def test_restore_skips_invalid_and_keeps_size() -> None:
+    """Restored identifiers are validated and fill the registries up to the size."""
+    source = EvccApiClient(TOPIC)
+    source.load_state(STATE)
+    data = source.as_dict()
+    data["loadpoints"] |= {
+        "abc": {"title": "Letters"},
+        "²": {"title": "Superscript"},
+        "70000": {"title": "Too high"},
+        "3": {"title": "Shed"},
+    }
+    data["vehicles"]["-1"] = {"title": "Negative"}
+
+    client = EvccApiClient(TOPIC)
+    client.registry_size = 2
+    client.restore(data)
+    assert list(client.loadpoints) == [1, 2]
+    assert client.loadpoints[2].title == "Carport"
+    assert list(client.vehicles) == [2]
+    assert client.loadpoint_vehicles == {1: 2}
+    # The restored ones were just seen, a new one has no room.
+    client.apply_message(Message(f"{TOPIC}/loadpoints/3/title", "Shed"))
+    assert list(client.loadpoints) == [1, 2]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_messages_stay_bounded(
+    seed: int, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Random topics and payloads neither raise nor outgrow the registries."""
+    # Every invalid payload is logged as a warning.
+    caplog.set_level(logging.ERROR, logger=api.__name__)
+    rng = random.Random(seed)  # noqa: S311
+    client = EvccApiClient(TOPIC)
+    client.registry_size = REGISTRY_SIZE
+    client.schedule_drain = lambda: None
+    evicted: list[int] = []
+    client.removed_loadpoint_callback = evicted.append
+    client.removed_vehicle_callback = evicted.append
+    for loadpoint_id in LIVE_LOADPOINTS:
+        client.apply_message(
+            Message(f"{TOPIC}/loadpoints/{loadpoint_id}/title", "Garage")
+        )
+
+    for start in range(0, MESSAGES, BATCH):
+        for message in generate_batch(rng, BATCH, start, RATE):
+            client.message_received(message)
+        client.drain()
+        client.pop_changes()
+        assert check_bounds(client, REGISTRY_SIZE) == []
+    assert evicted
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_stale_evicted_before_fresh(seed: int) -> None:
+    """A full registry evicts the ones silent the longest, never a fresh one."""
+    rng = random.Random(seed)  # noqa: S311
+    client = EvccApiClient(TOPIC)
+    client.registry_size = 8
+    evicted: list[int] = []
+    client.removed_loadpoint_callback = evicted.append
+    seen = dict(enumerate(rng.sample(range(100), 8), 1))
+    for loadpoint_id, timestamp in seen.items():
+        client.apply_message(
+            Message(f"{TOPIC}/loadpoints/{loadpoint_id}/title", "Garage", timestamp)
+        )
+
+    # The ones seen up to 50 are stale by now.
+    now = STALE_AFTER + 50
+    stale = sorted((i for i in seen if seen[i] <= 50), key=seen.__getitem__)
+    new = list(range(100, 108))
+    for loadpoint_id in new:
+        client.apply_message(
+            Message(f"{TOPIC}/loadpoints/{loadpoint_id}/title", "Shed", now)
+        )
+    assert evicted == stale
+    assert set(client.loadpoints) == {
+        *(i for i in seen if i not in stale),
+        *new[: len(stale)],
+    }
@@ -0,0 +1,67 @@
+"""Tests for the coalesced evcc commands."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc.const import (
+    COMMAND_COALESCE_WINDOW,
+    COMMAND_ECHO_TIMEOUT,
+    CONF_TOPIC,
+    DOMAIN,
+)
+
+from .common import TOPIC, async_advance
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import MqttMockHAClient
+
+
+async def test_commands_of_one_path_share_timeout(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockHAClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Every entity commanding a path falls back when evcc does not echo."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_TOPIC: TOPIC})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await async_advance(hass, freezer, 1)
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/mode", "pv")
+    await async_advance(hass, freezer, 1)
+    assert hass.states.get("select.charge_mode").state == "pv"
+    assert hass.states.get("switch.charging_enabled").state == "on"
+
+    # The select and the switch both command loadpoints/1/mode.
+    await hass.services.async_call(
+        "select",
+        "select_option",
+        {"entity_id": "select.charge_mode", "option": "now"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        "switch", "turn_off", {"entity_id": "switch.charging_enabled"}, blocking=True
+    )
+    # Both show the last commanded mode right away.
+    assert hass.states.get("select.charge_mode").state == "off"
+    assert hass.states.get("switch.charging_enabled").state == "off"
+    await async_advance(hass, freezer, COMMAND_COALESCE_WINDOW)
+    assert [call.args[:2] for call in mqtt_mock.async_publish.call_args_list] == [
+        (f"{TOPIC}/loadpoints/1/mode/set", "off")
+    ]
+
+    # evcc rejected the command, both show the reported mode again.
+    await async_advance(hass, freezer, COMMAND_ECHO_TIMEOUT)
+    assert hass.states.get("select.charge_mode").state == "pv"
+    assert hass.states.get("switch.charging_enabled").state == "on"
+    assert entry.runtime_data.commands.as_dict()["awaiting_echo"] == []
+    assert await hass.config_entries.async_unload(entry.entry_id)
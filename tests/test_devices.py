@@ -0,0 +1,76 @@
+"""Tests for the devices of the load points and vehicles."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc.api import STALE_AFTER
+from custom_components.evcc.const import CONF_REGISTRY_SIZE, CONF_TOPIC, DOMAIN
+
+from .common import TOPIC, async_advance
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_eviction_keeps_registry_entries(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """An evicted load point keeps its device and the customized entities."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_TOPIC: TOPIC}, options={CONF_REGISTRY_SIZE: 1}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await async_advance(hass, freezer, 1)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    garage = device_registry.async_get_device(
+        identifiers={(f"{entry.entry_id}_lp_1", DOMAIN)}
+    )
+    assert garage is not None
+    entity_registry.async_update_entity(
+        "switch.charging_enabled", new_entity_id="switch.garage_charging"
+    )
+    entities = er.async_entries_for_device(entity_registry, garage.id)
+    assert entities
+    assert hass.states.get("switch.garage_charging") is not None
+
+    # Load point 1 is silent, the new load point 2 evicts it.
+    await async_advance(hass, freezer, STALE_AFTER)
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/2/title", "Carport")
+    await async_advance(hass, freezer, 1)
+    assert list(entry.runtime_data.client.loadpoints) == [2]
+    # The registry keeps the entity as unavailable.
+    state = hass.states.get("switch.garage_charging")
+    assert state is not None
+    assert state.state == STATE_UNAVAILABLE
+    assert state.attributes.get("restored")
+    assert device_registry.async_get(garage.id) is not None
+    assert [
+        entity.entity_id
+        for entity in er.async_entries_for_device(entity_registry, garage.id)
+    ] == [entity.entity_id for entity in entities]
+
+    # Back again after load point 2 went silent, with the customized entity.
+    await async_advance(hass, freezer, STALE_AFTER)
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await async_advance(hass, freezer, 1)
+    assert list(entry.runtime_data.client.loadpoints) == [1]
+    state = hass.states.get("switch.garage_charging")
+    assert state is not None
+    assert not state.attributes.get("restored")
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,173 @@
+"""Tests for the hourly charged energy statistics."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.evcc.const import CONF_TOPIC, DOMAIN
+from custom_components.evcc.energy import HOUR, HourlyEnergy, statistic_id
+
+from .common import TOPIC, async_advance
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.components.recorder import Recorder
+    from homeassistant.core import HomeAssistant
+
+# Start of an hour in unix seconds.
+T0 = 1_700_002_800
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Set up the recorder before hass, the integration needs it."""
+
+
+def test_reading_within_hour() -> None:
+    """Readings within an hour add up in its bucket."""
+    energy = HourlyEnergy()
+    energy.add(12.5, T0 + 60)
+    energy.add(13.0, T0 + 120)
+    energy.add(14.5, T0 + 3000)
+    assert energy.pop_completed(T0 + 3599) == []
+    assert energy.pop_completed(T0 + HOUR) == [(T0, 14.5, 2.0)]
+    assert energy.sum == 2.0
+
+
+def test_delta_spread_over_hours() -> None:
+    """A delta is spread linearly over the hours since the previous reading."""
+    energy = HourlyEnergy()
+    energy.add(12.5, T0 + HOUR / 2)
+    # 2 kWh from the half of the first to the half of the third hour.
+    energy.add(14.5, T0 + 2.5 * HOUR)
+    assert energy.pop_completed(T0 + 2 * HOUR) == [
+        (T0, 13.0, 0.5),
+        (T0 + HOUR, 14.0, 1.5),
+    ]
+    # The current hour stays open.
+    assert energy.pop_completed(T0 + 2.5 * HOUR) == []
+    assert energy.pop_completed(T0 + 3 * HOUR) == [(T0 + 2 * HOUR, 14.5, 2.0)]
+
+
+def test_reading_at_same_time() -> None:
+    """Readings with the same timestamp land in its hour."""
+    energy = HourlyEnergy()
+    energy.add(12.5, T0 + 10)
+    energy.add(12.75, T0 + 10)
+    assert energy.pop_completed(T0 + HOUR) == [(T0, 12.75, 0.25)]
+
+
+def test_meter_reset() -> None:
+    """A lower total is a meter reset and starts over from it."""
+    energy = HourlyEnergy()
+    energy.add(5.0, T0)
+    energy.add(5.5, T0 + 600)
+    energy.add(0.25, T0 + 1200)
+    energy.add(0.75, T0 + 1800)
+    # The total at the end is the one of the new meter.
+    assert energy.pop_completed(T0 + HOUR) == [(T0, 0.75, 1.0)]
+    energy.add(0.5, T0 + HOUR + 60)
+    energy.add(0.75, T0 + HOUR + 120)
+    assert energy.pop_completed(T0 + 2 * HOUR) == [(T0 + HOUR, 0.75, 1.25)]
+
+
+def test_restore() -> None:
+    """After a restart the energy continues from the last total and sum."""
+    # The last statistic ended at T0 with a total of 12 kWh and 4 kWh sum.
+    energy = HourlyEnergy(12.0, T0, 4.0)
+    # Restarted half an hour into the second hour.
+    energy.add(13.5, T0 + 1.5 * HOUR)
+    assert energy.pop_completed(T0 + 2 * HOUR) == [
+        (T0, 13.0, 5.0),
+        (T0 + HOUR, 13.5, 5.5),
+    ]
+
+
+def test_no_reading_before_first() -> None:
+    """The first reading only sets the total."""
+    energy = HourlyEnergy()
+    energy.add(12.5, T0)
+    assert energy.pop_completed(T0 + 10 * HOUR) == []
+    assert energy.sum == 0
+
+
+async def _async_last_statistic(hass: HomeAssistant, statistic: str) -> Any:
+    """Return the last statistic row once the recorder is done."""
+    await async_wait_recording_done(hass)
+    rows = await get_instance(hass).async_add_executor_job(
+        partial(
+            get_last_statistics,
+            hass,
+            1,
+            statistic,
+            convert_units=False,
+            types={"state", "sum"},
+        )
+    )
+    return rows[statistic][0]
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_statistics_continue_after_restart(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The completed hours are recorded and continued after a reload."""
+    start = datetime(2024, 1, 1, 10, tzinfo=dt_util.UTC)
+    freezer.move_to(start + timedelta(minutes=30))
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_TOPIC: TOPIC})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    total = f"{TOPIC}/loadpoints/1/chargeTotalImport"
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    async_fire_mqtt_message(hass, total, "12.5")
+    await async_advance(hass, freezer, 1)
+
+    # 2 kWh from 10:30 until 12:30.
+    await async_advance(hass, freezer, 2 * HOUR)
+    async_fire_mqtt_message(hass, total, "14.5")
+    await async_advance(hass, freezer, 1)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await async_advance(hass, freezer, 1)
+    statistic = statistic_id(entry.entry_id, 1)
+    row = await _async_last_statistic(hass, statistic)
+    # The readings are taken with the coordinator flush up to a second after
+    # the messages, which the energies allow for.
+    assert dt_util.utc_from_timestamp(row["start"]) == start + timedelta(hours=1)
+    assert row["state"] == pytest.approx(14.0, abs=0.001)
+    assert row["sum"] == pytest.approx(1.5, abs=0.001)
+
+    # Restarted at 13:30, the snapshot restores the total of 14.5 kWh.
+    await async_advance(hass, freezer, HOUR)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    async_fire_mqtt_message(hass, total, "15.5")
+    await async_advance(hass, freezer, 1)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await async_advance(hass, freezer, 1)
+    row = await _async_last_statistic(hass, statistic)
+    # The 0.5 kWh since the last statistic are spread from 12:00 until the
+    # restart, the 1 kWh after it falls into the hour of the restart.
+    assert dt_util.utc_from_timestamp(row["start"]) == start + timedelta(hours=2)
+    assert row["state"] == pytest.approx(14.0 + 0.5 * 2 / 3, abs=0.001)
+    assert row["sum"] == pytest.approx(1.5 + 0.5 * 2 / 3, abs=0.001)
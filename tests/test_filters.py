@@ -0,0 +1,159 @@
+"""Tests for the deadband and rate limiting of state writes."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from custom_components.evcc.filters import (
+    DEADBAND_FLUSH_DELAY,
+    PublishFilter,
+    PublishLimiter,
+)
+
+from .common import async_advance
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+class FakeSensor:
+    """Value source and write target of a PublishLimiter."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.value: Any = None
+        self.writes: list[Any] = []
+
+    def write(self) -> None:
+        """Record a trailing write."""
+        self.writes.append(self.value)
+
+
+def _limiter(
+    hass: HomeAssistant, sensor: FakeSensor, publish_filter: PublishFilter
+) -> PublishLimiter:
+    return PublishLimiter(hass, publish_filter, lambda: sensor.value, sensor.write)
+
+
+def _publish(limiter: PublishLimiter, sensor: FakeSensor, value: Any) -> bool:
+    sensor.value = value
+    return limiter.async_filter()
+
+
+@pytest.mark.usefixtures("freezer")
+async def test_deadband(hass: HomeAssistant) -> None:
+    """Changes within the deadband are held back."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(deadband=5))
+    assert _publish(limiter, sensor, 100)
+    assert not _publish(limiter, sensor, 104)
+    assert not _publish(limiter, sensor, 96)
+    assert _publish(limiter, sensor, 105)
+    # Compared with the last written value, not the last held back one.
+    assert not _publish(limiter, sensor, 101)
+    assert not _publish(limiter, sensor, 109)
+    assert _publish(limiter, sensor, 110)
+    # Other values than numbers are written on every change.
+    assert _publish(limiter, sensor, None)
+    assert not _publish(limiter, sensor, None)
+    limiter.async_cancel()
+
+
+@pytest.mark.usefixtures("freezer")
+async def test_relative_deadband(hass: HomeAssistant) -> None:
+    """A relative deadband is a fraction of the last written value."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(deadband=0.1, relative=True))
+    assert _publish(limiter, sensor, 1000)
+    assert not _publish(limiter, sensor, 1099)
+    assert not _publish(limiter, sensor, 901)
+    assert _publish(limiter, sensor, 1100)
+    assert not _publish(limiter, sensor, 1200)
+    assert _publish(limiter, sensor, 1210)
+    # Nothing is within 10 % of 0.
+    assert _publish(limiter, sensor, 0)
+    assert _publish(limiter, sensor, 1)
+    limiter.async_cancel()
+
+
+async def test_min_interval_trailing_write(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Changes within the minimum interval are written when it has passed."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(min_interval=10))
+    assert _publish(limiter, sensor, 1)
+    await async_advance(hass, freezer, 2)
+    assert not _publish(limiter, sensor, 2)
+    await async_advance(hass, freezer, 3)
+    assert not _publish(limiter, sensor, 3)
+    await async_advance(hass, freezer, 4)
+    assert sensor.writes == []
+    await async_advance(hass, freezer, 1)
+    # Only the latest value, once.
+    assert sensor.writes == [3]
+    await async_advance(hass, freezer, 20)
+    assert sensor.writes == [3]
+    # The trailing write starts the next interval.
+    assert _publish(limiter, sensor, 4)
+
+
+async def test_min_interval_no_write_when_reverted(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """No trailing write when the value returned to the written one."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(min_interval=10))
+    assert _publish(limiter, sensor, 1)
+    assert not _publish(limiter, sensor, 2)
+    sensor.value = 1
+    await async_advance(hass, freezer, 10)
+    assert sensor.writes == []
+
+
+async def test_deadband_flush(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A change within the deadband is written after DEADBAND_FLUSH_DELAY."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(deadband=5, min_interval=10))
+    assert _publish(limiter, sensor, 100)
+    await async_advance(hass, freezer, 1)
+    assert not _publish(limiter, sensor, 102)
+    # Not flushed with the minimum interval, the change is insignificant.
+    await async_advance(hass, freezer, 10)
+    assert sensor.writes == []
+    await async_advance(hass, freezer, DEADBAND_FLUSH_DELAY - 11)
+    assert sensor.writes == []
+    await async_advance(hass, freezer, 1)
+    assert sensor.writes == [102]
+
+
+async def test_significant_change_replaces_flush(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A significant change moves a pending deadband flush earlier."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(deadband=5, min_interval=10))
+    assert _publish(limiter, sensor, 100)
+    assert not _publish(limiter, sensor, 102)
+    await async_advance(hass, freezer, 1)
+    assert not _publish(limiter, sensor, 120)
+    await async_advance(hass, freezer, 9)
+    assert sensor.writes == [120]
+    await async_advance(hass, freezer, DEADBAND_FLUSH_DELAY)
+    assert sensor.writes == [120]
+
+
+async def test_cancel(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """A cancelled trailing write is not written."""
+    sensor = FakeSensor()
+    limiter = _limiter(hass, sensor, PublishFilter(min_interval=10))
+    assert _publish(limiter, sensor, 1)
+    assert not _publish(limiter, sensor, 2)
+    limiter.async_cancel()
+    await async_advance(hass, freezer, 10)
+    assert sensor.writes == []
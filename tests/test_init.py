@@ -0,0 +1,89 @@
+"""Tests for the setup, reload and options of hass_evcc."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc.const import (
+    CONF_COALESCE_WINDOW,
+    CONF_INSTRUMENTATION,
+    CONF_REGISTRY_SIZE,
+    CONF_SITE_INTERVAL,
+    CONF_TOPIC,
+    DOMAIN,
+)
+from custom_components.evcc.subscriptions import async_get_router
+
+from .common import TOPIC
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.evcc.api import EvccApiClient
+
+RELOADS = 6
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_reload_and_options_deliver_once(hass: HomeAssistant) -> None:
+    """Reloads and option changes leave one callback and one delivery."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_TOPIC: TOPIC})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await hass.async_block_till_done()
+    router = async_get_router(hass)
+    clients: list[EvccApiClient] = [entry.runtime_data.client]
+
+    for reload in range(RELOADS):
+        if reload % 3 == 0:
+            assert await hass.config_entries.async_reload(entry.entry_id)
+        elif reload % 3 == 1:
+            # Applied in place.
+            hass.config_entries.async_update_entry(
+                entry,
+                options={
+                    **entry.options,
+                    CONF_COALESCE_WINDOW: 0.1 * reload,
+                    CONF_SITE_INTERVAL: reload % 2,
+                    CONF_REGISTRY_SIZE: 8 + reload,
+                },
+            )
+        else:
+            # Reloads the entry.
+            hass.config_entries.async_update_entry(
+                entry,
+                options={
+                    **entry.options,
+                    CONF_INSTRUMENTATION: not entry.options.get(CONF_INSTRUMENTATION),
+                },
+            )
+        await hass.async_block_till_done()
+        client = entry.runtime_data.client
+        if client not in clients:
+            clients.append(client)
+        assert router.callback_count == 1
+        received = [other.received_messages for other in clients]
+
+        async_fire_mqtt_message(
+            hass, f"{TOPIC}/loadpoints/1/chargePower", str(100 * reload)
+        )
+        await hass.async_block_till_done()
+        assert [other.received_messages for other in clients] == [
+            count + (other is client)
+            for count, other in zip(received, clients, strict=True)
+        ]
+
+    # Every reload made a new client.
+    assert len(clients) == 1 + sum(reload % 3 != 1 for reload in range(RELOADS))
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert router.callback_count == 0
+    assert router.topics == []
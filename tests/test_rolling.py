@@ -0,0 +1,140 @@
+"""Tests for the rolling window statistics."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc.api import EvccApiClient
+from custom_components.evcc.const import CONF_TOPIC, DOMAIN
+from custom_components.evcc.rolling import RollingWindow
+
+from .common import TOPIC, Message
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+def test_window_statistics() -> None:
+    """The mean, minimum and maximum cover the samples in the window."""
+    window = RollingWindow(10)
+    assert window.mean is None
+    assert window.minimum is None
+    assert window.maximum is None
+    window.add(0, 4)
+    window.add(5, 8)
+    window.add(9, 6)
+    assert window.mean == 6
+    assert window.minimum == 4
+    assert window.maximum == 8
+
+
+def test_window_evicts_at_edge() -> None:
+    """Samples older than the duration leave the minimum and maximum."""
+    window = RollingWindow(10)
+    window.add(0, 1)
+    window.add(1, 9)
+    window.add(2, 5)
+    window.evict(10)
+    # The window starts at 0, the first sample is still in.
+    assert (window.minimum, window.maximum) == (1, 9)
+    window.evict(10.5)
+    assert (window.minimum, window.maximum) == (5, 9)
+    assert window.mean == 7
+    window.evict(11.5)
+    assert (window.minimum, window.maximum) == (5, 5)
+    assert window.mean == 5
+
+
+def test_window_keeps_newest_sample() -> None:
+    """The last value stays reported when no newer one arrives."""
+    window = RollingWindow(10)
+    window.add(0, 3)
+    window.add(1, 7)
+    window.evict(1000)
+    assert (window.mean, window.minimum, window.maximum) == (7, 7, 7)
+
+
+def test_window_matches_brute_force() -> None:
+    """Random samples give the statistics of the samples in the window."""
+    rng = random.Random(3)  # noqa: S311
+    window = RollingWindow(10)
+    samples: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(2000):
+        timestamp = now + rng.uniform(0, 3)
+        value = float(rng.randint(0, 20))
+        window.add(timestamp, value)
+        samples.append((timestamp, value))
+        now = timestamp + rng.uniform(0, 5)
+        window.evict(now)
+        inside = [value for time, value in samples if time >= now - 10]
+        inside = inside or [samples[-1][1]]
+        assert window.minimum == min(inside)
+        assert window.maximum == max(inside)
+        assert window.mean is not None
+        assert abs(window.mean - sum(inside) / len(inside)) < 1e-6
+
+
+def test_client_feeds_window() -> None:
+    """The client feeds the windows of an attribute with every message."""
+    client = EvccApiClient(TOPIC)
+    client.apply_message(Message(f"{TOPIC}/loadpoints/1/chargePower", "5"))
+    window = client.rolling_window(1, "chargePower", 60)
+    assert window.mean == 5
+    client.apply_message(Message(f"{TOPIC}/loadpoints/1/chargePower", "11"))
+    assert (window.minimum, window.maximum) == (5, 11)
+
+
+def test_client_releases_window() -> None:
+    """A shared window is dropped with its last user."""
+    client = EvccApiClient(TOPIC)
+    topic = f"{TOPIC}/loadpoints/1/chargePower"
+    client.apply_message(Message(topic, "5"))
+    window = client.rolling_window(1, "chargePower", 60)
+    assert client.rolling_window(1, "chargePower", 60) is window
+    client.release_rolling_window(1, "chargePower", 60)
+    client.apply_message(Message(topic, "7"))
+    assert window.maximum == 7
+    client.release_rolling_window(1, "chargePower", 60)
+    client.apply_message(Message(topic, "9"))
+    assert window.maximum == 7
+    assert client.rolling_window(1, "chargePower", 60) is not window
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_sensor_releases_window(hass: HomeAssistant) -> None:
+    """Removing a rolling window sensor drops its window."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_TOPIC: TOPIC})
+    entry.add_to_hass(hass)
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{entry.entry_id}_lp_1_hass_evcc_charge_power_max_5m",
+        suggested_object_id="charge_power_max",
+        config_entry=entry,
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await hass.async_block_till_done()
+    for value in ("100", "900", "300"):
+        async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/chargePower", value)
+        await hass.async_block_till_done()
+    client = entry.runtime_data.client
+    assert client.rolling_window(1, "chargePower", 300).maximum == 900
+    client.release_rolling_window(1, "chargePower", 300)
+
+    entity_registry.async_remove("sensor.charge_power_max")
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.charge_power_max") is None
+    assert client.rolling_window(1, "chargePower", 300).maximum == 300
+    assert await hass.config_entries.async_unload(entry.entry_id)
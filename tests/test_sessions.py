@@ -0,0 +1,175 @@
+"""Tests for the charging session detection and log."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.evcc.api import LoadPoint
+from custom_components.evcc.sessions import (
+    ChargingSession,
+    SessionDetector,
+    SessionLog,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+# Unix seconds the session ends are counted from.
+EPOCH = 1_700_000_000
+
+
+def _session(loadpoint: int, vehicle: str, end: int) -> ChargingSession:
+    """Return a session ending end seconds after EPOCH."""
+    return ChargingSession(
+        loadpoint=loadpoint,
+        vehicle=vehicle,
+        start=EPOCH + end - 3600,
+        end=EPOCH + end,
+        energy=end * 4,
+        peak_power=11000.0,
+        phases=1.5,
+    )
+
+
+def test_log_append_and_query(tmp_path: Path) -> None:
+    """Appended sessions are returned by the range of their end."""
+    log = SessionLog(str(tmp_path / "sessions"))
+    assert log.load() == {}
+    assert log.query(0, 2**32) == []
+    sessions = [_session(1 + end % 2, f"car {end % 3}", end) for end in range(10)]
+    for session in sessions:
+        log.append(session)
+    assert len(log) == 10
+    # From start until before end.
+    assert log.query(EPOCH + 3, EPOCH + 6) == sessions[3:6]
+    assert log.query(EPOCH + 6, EPOCH + 6) == []
+    assert log.query(0, 2**32) == sessions
+
+
+def test_log_load(tmp_path: Path) -> None:
+    """A loaded log returns the last session of each load point."""
+    path = str(tmp_path / "sessions")
+    log = SessionLog(path)
+    for end in (100, 200, 300):
+        log.append(_session(end // 100 % 2 + 1, "ID.3\nline", end))
+
+    loaded = SessionLog(path)
+    last = loaded.load()
+    assert len(loaded) == 3
+    assert last == {2: _session(2, "ID.3 line", 300), 1: _session(1, "ID.3 line", 200)}
+    # The titles are stored once.
+    assert (tmp_path / "sessions.vehicles").read_text(encoding="utf-8") == (
+        "ID.3 line\n"
+    )
+
+
+def test_log_keeps_end_order(tmp_path: Path) -> None:
+    """A session ending before the last one is logged at the end of the last."""
+    log = SessionLog(str(tmp_path / "sessions"))
+    log.append(_session(1, "", 500))
+    log.append(_session(2, "", 400))
+    assert [session.end - EPOCH for session in log.query(0, 2**32)] == [500, 500]
+
+
+def test_log_truncates_torn_record(tmp_path: Path) -> None:
+    """A record torn while it was appended is dropped."""
+    path = tmp_path / "sessions"
+    log = SessionLog(str(path))
+    for end in (100, 200):
+        log.append(_session(1, "car", end))
+    size = path.stat().st_size
+    with path.open("ab") as file:
+        file.write(b"\x01\x02\x03")
+
+    loaded = SessionLog(str(path))
+    assert loaded.load() == {1: _session(1, "car", 200)}
+    assert path.stat().st_size == size
+    loaded.append(_session(2, "car", 300))
+    assert SessionLog(str(path)).load() == {
+        1: _session(1, "car", 200),
+        2: _session(2, "car", 300),
+    }
+
+
+def test_log_invalid_header(tmp_path: Path) -> None:
+    """A file which is no session log is moved aside."""
+    path = tmp_path / "sessions"
+    path.write_bytes(b"not a session log")
+    log = SessionLog(str(path))
+    assert log.load() == {}
+    assert (tmp_path / "sessions.invalid").exists()
+    log.append(_session(1, "", 100))
+    assert log.query(0, 2**32) == [_session(1, "", 100)]
+
+
+def test_detector_session() -> None:
+    """A session lasts from charging until disconnected, with its pauses."""
+    detector = SessionDetector(1)
+    loadpoint = LoadPoint()
+    loadpoint.connected = True
+    assert detector.update(loadpoint, 0) is None
+    assert detector.start is None
+
+    loadpoint.charging = True
+    loadpoint.phasesActive = 3
+    loadpoint.chargePower = 11000
+    loadpoint.vehicleTitle = "ID.3"
+    assert detector.update(loadpoint, 100) is None
+    loadpoint.chargedEnergy = 1000
+    assert detector.update(loadpoint, 700) is None
+    # Paused, still connected.
+    loadpoint.charging = False
+    loadpoint.chargePower = 0
+    loadpoint.chargedEnergy = 2000
+    assert detector.update(loadpoint, 1300) is None
+    loadpoint.charging = True
+    loadpoint.phasesActive = 1
+    loadpoint.chargePower = 3600
+    assert detector.update(loadpoint, 1900) is None
+    # Disconnected, ends the session.
+    loadpoint.charging = loadpoint.connected = False
+    loadpoint.vehicleTitle = ""
+    loadpoint.chargedEnergy = 2500
+    session = detector.update(loadpoint, 2500)
+
+    # 1200 s with 3 phases and 600 s with 1 phase.
+    assert session == ChargingSession(
+        loadpoint=1,
+        vehicle="ID.3",
+        start=100,
+        end=2500,
+        energy=2500,
+        peak_power=11000,
+        phases=(1200 * 3 + 600 * 1) / 1800,
+    )
+    assert detector.start is None
+    loadpoint.chargedEnergy = 0
+    assert detector.update(loadpoint, 2600) is None
+
+
+def test_detector_connect_without_charging() -> None:
+    """Connecting and disconnecting without charging is no session."""
+    detector = SessionDetector(1)
+    loadpoint = LoadPoint()
+    loadpoint.connected = True
+    assert detector.update(loadpoint, 0) is None
+    loadpoint.connected = False
+    assert detector.update(loadpoint, 100) is None
+
+
+def test_detector_keeps_max_energy() -> None:
+    """The energy is the highest chargedEnergy seen, evcc resets it at the end."""
+    detector = SessionDetector(2)
+    loadpoint = LoadPoint()
+    loadpoint.connected = loadpoint.charging = True
+    loadpoint.phasesActive = 1
+    # Restarted while charging, evcc counted from the actual start.
+    loadpoint.chargedEnergy = 4000
+    assert detector.update(loadpoint, 0) is None
+    loadpoint.connected = loadpoint.charging = False
+    loadpoint.chargedEnergy = 0
+    session = detector.update(loadpoint, 60)
+    assert session is not None
+    assert session.energy == 4000
+    assert session.phases == 1
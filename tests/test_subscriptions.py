@@ -0,0 +1,83 @@
+"""Tests for the MQTT subscriptions shared by the config entries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.evcc.const import CONF_TOPIC, DOMAIN
+from custom_components.evcc.subscriptions import EvccSubscriptions, async_get_router
+
+from .common import TOPIC
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_views_share_topic(hass: HomeAssistant) -> None:
+    """Unsubscribing one view keeps the patterns of another on the same topic."""
+    first = EvccSubscriptions(hass, TOPIC, lambda _: None)
+    second = EvccSubscriptions(hass, TOPIC, lambda _: None)
+    first.async_acquire("loadpoints/+/title")
+    first.async_acquire("loadpoints/+/title")
+    first_release = first.async_acquire("site/pvPower")
+    second_release = second.async_acquire("loadpoints/+/title")
+    second.async_acquire("site/gridPower")
+    await first.async_update()
+    router = async_get_router(hass)
+    assert router.topics == [
+        f"{TOPIC}/loadpoints/+/title",
+        f"{TOPIC}/site/gridPower",
+        f"{TOPIC}/site/pvPower",
+    ]
+
+    first.async_unsubscribe()
+    # Released already, a no-op.
+    first_release()
+    await second.async_update()
+    assert router.topics == [f"{TOPIC}/loadpoints/+/title", f"{TOPIC}/site/gridPower"]
+    assert second.topics == router.topics
+
+    second_release()
+    await second.async_update()
+    assert router.topics == [f"{TOPIC}/site/gridPower"]
+    second.async_unsubscribe()
+    await second.async_update()
+    assert router.topics == []
+    assert router.callback_count == 0
+
+
+@pytest.mark.usefixtures("mqtt_mock")
+async def test_entries_share_topic(hass: HomeAssistant) -> None:
+    """An entry unloads without dropping the subscriptions of another."""
+    entries = [
+        MockConfigEntry(domain=DOMAIN, data={CONF_TOPIC: TOPIC}) for _ in range(2)
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    router = async_get_router(hass)
+    topics = router.topics
+    assert f"{TOPIC}/loadpoints/+/title" in topics
+
+    first, second = entries
+    assert await hass.config_entries.async_unload(first.entry_id)
+    await hass.async_block_till_done()
+    assert router.topics == topics
+    assert router.callback_count == 1
+    async_fire_mqtt_message(hass, f"{TOPIC}/loadpoints/1/title", "Garage")
+    await hass.async_block_till_done()
+    assert second.runtime_data.client.loadpoints[1].title == "Garage"
+
+    # Releasing the patterns of the entities of the second entry.
+    assert await hass.config_entries.async_unload(second.entry_id)
+    await hass.async_block_till_done()
+    assert router.topics == []
+    assert router.callback_count == 0